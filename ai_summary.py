@@ -0,0 +1,282 @@
+"""
+AI-generated match summaries with bounded cost.
+
+The model only sees a compact digest of finished results. Generation is
+skipped while the digest is unchanged since the last summary, runs on a
+background thread instead of the request, and is single-flight: concurrent
+requests, in this process or any other sharing the database, start at most
+one model call.
+"""
+
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_RUNS = REGISTRY.counter(
+    'summary_runs_total', 'Summary requests by outcome (generated, unchanged, busy, failed)',
+    ('result',)
+)
+SUMMARY_SECONDS = REGISTRY.histogram('summary_generation_seconds', 'Model call duration')
+
+# Finished results per competition sent to the model, notable ones first
+MAX_RESULTS_PER_COMPETITION = 10
+
+# A win by this many goals is flagged as a rout
+ROUT_MARGIN = 3
+
+# A win over a side this many places higher in the table is flagged as an upset
+UPSET_PLACES = 6
+
+SYSTEM_PROMPT = (
+    "You are a Sports News Editor for a top-tier football app. Your job is to curate a "
+    "'Daily Briefing' based on recent match results. You write in a professional, "
+    "engaging, and dramatic journalistic tone. You MUST use Markdown formatting."
+)
+
+# Line introducing the digest in the prompt
+RESULTS_HEADING = "Results (home team first; [current table positions] where known):"
+
+USER_PROMPT = """Based on the match results below, generate 3 to 5 short news stories.
+
+Format for each story:
+1. Headline: a punchy, dramatic title in bold (e.g. **City Crushes United in Derby**).
+2. Body: a concise paragraph (2-3 sentences) explaining the result, key stats, or context.
+
+Requirements:
+- Separate stories with a horizontal rule (---).
+- Focus on the most significant results (big wins, upsets, derbies).
+- Do not use bullet points for the stories.
+
+{heading}
+{digest}"""
+
+
+def _result_line(match, positions):
+    """One digest line for a finished match, with notable-result tags."""
+    home, away = match.home_team, match.away_team
+    home_pos, away_pos = positions.get(home.id), positions.get(away.id)
+    line = f"{home.name} {match.home_score}-{match.away_score} {away.name}"
+    if home_pos and away_pos:
+        line += f" [{home_pos} v {away_pos}]"
+
+    tags = []
+    margin = match.home_score - match.away_score
+    if abs(margin) >= ROUT_MARGIN:
+        tags.append('rout')
+    if home_pos and away_pos and margin:
+        winner_pos, loser_pos = (home_pos, away_pos) if margin > 0 else (away_pos, home_pos)
+        if winner_pos - loser_pos >= UPSET_PLACES:
+            tags.append('upset')
+    if tags:
+        line += f" ({', '.join(tags)})"
+    return line, bool(tags)
+
+
+def build_digest(matches, standings=None):
+    """
+    Build the compact, deterministic text the model summarizes.
+
+    Only finished matches are included, notable ones (routs and upsets)
+    first, at most MAX_RESULTS_PER_COMPETITION per competition.
+
+    Args:
+        matches: Competition code -> list of Match objects
+        standings: Competition code -> standings rows, used for table
+            positions (optional)
+
+    Returns:
+        str: Digest text (empty if there are no finished matches)
+    """
+    sections = []
+    for code in sorted(matches):
+        positions = {
+            (row.get('team') or {}).get('id'): row.get('position')
+            for row in (standings or {}).get(code) or []
+        }
+        finished = [
+            m for m in matches[code]
+            if m.status == 'FINISHED' and m.home_score is not None and m.away_score is not None
+        ]
+        if not finished:
+            continue
+        lines = [_result_line(m, positions) for m in finished]
+        # Stable sort keeps the newest-first order within each group
+        lines.sort(key=lambda item: not item[1])
+        name = finished[0].competition_name or code
+        sections.append(
+            f"{name}:\n" + '\n'.join(line for line, _ in lines[:MAX_RESULTS_PER_COMPETITION])
+        )
+    return '\n\n'.join(sections)
+
+
+def digest_hash(digest):
+    """Hex SHA-256 of a digest, stored with the summary it produced."""
+    return hashlib.sha256(digest.encode('utf-8')).hexdigest()
+
+
+class AnthropicSummaryClient:
+    """Generates summaries with the Anthropic Messages API."""
+
+    def __init__(self, api_key, model, timeout=30, max_tokens=800):
+        """
+        Initialize the client.
+
+        Args:
+            api_key: Anthropic API key
+            model: Model name
+            timeout: Request timeout in seconds (default: 30)
+            max_tokens: Longest summary, in tokens (default: 800)
+        """
+        # Imported here so the app runs without the SDK when summaries are off
+        import anthropic
+
+        self.client = anthropic.Anthropic(api_key=api_key, timeout=timeout, max_retries=1)
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def generate(self, system_prompt, user_prompt):
+        """
+        Run one completion.
+
+        Returns:
+            str: Markdown summary
+        """
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            system=system_prompt,
+            messages=[{'role': 'user', 'content': user_prompt}]
+        )
+        return ''.join(block.text for block in message.content if block.type == 'text')
+
+
+class FakeSummaryClient:
+    """
+    Local stand-in for the model: turns each competition in the digest into a story.
+
+    Used when AI_SUMMARY_FAKE is set, so the whole pipeline can be run and
+    tested without an API key or cost.
+    """
+
+    def __init__(self, delay=0.0):
+        """
+        Args:
+            delay: Seconds each call takes, to exercise the single-flight path
+        """
+        self.delay = delay
+        self.calls = []
+
+    def generate(self, system_prompt, user_prompt):
+        """Record the prompt and return one Markdown story per competition."""
+        self.calls.append(user_prompt)
+        if self.delay:
+            time.sleep(self.delay)
+        digest = user_prompt.partition(RESULTS_HEADING)[2].strip()
+        stories = []
+        for section in digest.split('\n\n'):
+            name, _, results = section.partition(':\n')
+            stories.append(f"**{name} Roundup**\n\n" + '\n'.join(results.splitlines()))
+        return '\n\n---\n\n'.join(stories)
+
+
+class SummaryService:
+    """Decides when to call the model and runs the call in the background."""
+
+    # Lease keeping other processes from generating at the same time
+    LEASE_NAME = 'summary'
+
+    def __init__(self, db, client, snapshot_func, lease_seconds=120, clock=time.time):
+        """
+        Initialize the service.
+
+        Args:
+            db: DatabaseManager storing the summary and its digest hash
+            client: Model client with generate(system_prompt, user_prompt)
+            snapshot_func: Callable returning the current data snapshot
+            lease_seconds: Longest a generation may hold the cross-process
+                lock (default: 120)
+            clock: Wall-clock function (injectable for testing)
+        """
+        self.db = db
+        self.client = client
+        self.snapshot_func = snapshot_func
+        self.lease_seconds = lease_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_error = None
+
+    @property
+    def generating(self):
+        """Whether this process is generating a summary right now."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def request(self):
+        """
+        Ask for a summary of the current data, starting generation if needed.
+
+        Returns:
+            str: 'unchanged' if the stored summary already covers the current
+                 results, 'empty' if there are no finished results yet,
+                 'busy' if a generation is already running here or in
+                 another process, or 'started'
+        """
+        snapshot = self.snapshot_func()
+        digest = build_digest(snapshot['matches'], snapshot.get('standings'))
+        if not digest:
+            return 'empty'
+        digest_id = digest_hash(digest)
+        if digest_id == self.db.get_summary_digest() and self.db.get_summary():
+            SUMMARY_RUNS.labels('unchanged').inc()
+            return 'unchanged'
+
+        with self._lock:
+            if self.generating:
+                SUMMARY_RUNS.labels('busy').inc()
+                return 'busy'
+            if not self.db.acquire_lease(
+                self.LEASE_NAME, self.holder, self.lease_seconds, self._clock()
+            ):
+                SUMMARY_RUNS.labels('busy').inc()
+                return 'busy'
+            # Another process may have stored this digest's summary and let
+            # the lease go between the check above and acquiring it
+            if digest_id == self.db.get_summary_digest():
+                self.db.release_lease(self.LEASE_NAME, self.holder)
+                SUMMARY_RUNS.labels('unchanged').inc()
+                return 'unchanged'
+            self._thread = threading.Thread(
+                target=self._generate, args=(digest, digest_id), name='summary', daemon=True
+            )
+            self._thread.start()
+        return 'started'
+
+    def _generate(self, digest, digest_id):
+        """Call the model and store the summary with the digest hash it covers."""
+        user_prompt = USER_PROMPT.format(heading=RESULTS_HEADING, digest=digest)
+        logger.debug("Summary prompt:\n%s", user_prompt)
+        try:
+            with SUMMARY_SECONDS.time():
+                summary = self.client.generate(SYSTEM_PROMPT, user_prompt)
+            logger.debug("Summary response:\n%s", summary)
+            if not summary.strip():
+                raise ValueError("empty response")
+            self.db.save_summary(summary, digest_id)
+            self.last_error = None
+            SUMMARY_RUNS.labels('generated').inc()
+            logger.info("Generated summary for digest %s", digest_id[:12])
+        except Exception as e:
+            self.last_error = str(e)
+            SUMMARY_RUNS.labels('failed').inc()
+            logger.error("Error generating summary: %s", e)
+        finally:
+            self.db.release_lease(self.LEASE_NAME, self.holder)
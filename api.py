@@ -0,0 +1,157 @@
+"""JSON API (v1) served from the in-memory data snapshot."""
+
+import hashlib
+import logging
+from flask import Blueprint, Response, jsonify, request
+
+logger = logging.getLogger(__name__)
+
+# Resources available per competition
+RESOURCES = ('matches', 'standings', 'scorers')
+
+
+def project(item, fields):
+    """
+    Keep only the requested fields of a dict.
+
+    Args:
+        item: Source dict
+        fields: List of field paths; dotted paths (e.g. "home_team.name")
+            select nested values
+
+    Returns:
+        dict: New dict containing only the selected fields
+    """
+    result = {}
+    for path in fields:
+        value = item
+        parts = path.split('.')
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = result
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = value
+    return result
+
+
+def _parse_fields():
+    """Parse the fields= query parameter into a list of paths (or None)."""
+    raw = request.args.get('fields', '').strip()
+    if not raw:
+        return None
+    return [field.strip() for field in raw.split(',') if field.strip()]
+
+
+def _parse_since():
+    """
+    Parse the since= query parameter.
+
+    Accepts a date (YYYY-MM-DD) or an ISO 8601 UTC timestamp, compared as a
+    string prefix against match kickoff times.
+
+    Raises:
+        ValueError: If the value is not a date or timestamp
+    """
+    since = request.args.get('since', '').strip()
+    if not since:
+        return None
+    if len(since) < 10 or since[4] != '-' or since[7] != '-':
+        raise ValueError(f"Invalid since value: {since}")
+    return since
+
+
+def _select(resource, code, snapshot, fields, since):
+    """Build one resource's payload for a competition."""
+    items = (snapshot[resource] or {}).get(code) or []
+    if resource == 'matches':
+        if since:
+            items = [m for m in items if (m.utc_kickoff or '') >= since]
+        items = [m.to_dict() for m in items]
+    if fields:
+        items = [project(item, fields) for item in items]
+    return items
+
+
+def create_api_blueprint(data_service):
+    """
+    Create the /api/v1 blueprint.
+
+    Args:
+        data_service: MatchDataService providing get_snapshot()
+
+    Returns:
+        Blueprint: Flask blueprint with the API routes
+    """
+    api = Blueprint('api', __name__, url_prefix='/api/v1')
+    codes = data_service.COMPETITION_CODES
+
+    def respond(build):
+        """Serve a JSON payload with a strong ETag tied to the snapshot."""
+        snapshot = data_service.get_snapshot()
+        digest = hashlib.sha1(request.full_path.encode('utf-8')).hexdigest()[:12]
+        etag = f"api-{snapshot['key']}-{digest}"
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            try:
+                payload = build(snapshot, _parse_fields(), _parse_since())
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            response = jsonify(payload)
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def unknown(code):
+        return jsonify({"error": f"Unknown competition: {code}"}), 404
+
+    @api.route('/competitions')
+    def competitions():
+        """All competitions with all resources."""
+        return respond(lambda snapshot, fields, since: {
+            'version': snapshot['version'],
+            'competitions': {
+                code: {
+                    resource: _select(resource, code, snapshot, fields, since)
+                    for resource in RESOURCES
+                }
+                for code in codes
+            }
+        })
+
+    @api.route('/competitions/<code>')
+    def competition(code):
+        """One competition with all resources."""
+        code = code.upper()
+        if code not in codes:
+            return unknown(code)
+        return respond(lambda snapshot, fields, since: {
+            'version': snapshot['version'],
+            'competition': code,
+            **{
+                resource: _select(resource, code, snapshot, fields, since)
+                for resource in RESOURCES
+            }
+        })
+
+    @api.route('/competitions/<code>/<resource>')
+    def competition_resource(code, resource):
+        """One resource (matches, standings or scorers) of one competition."""
+        code = code.upper()
+        if code not in codes:
+            return unknown(code)
+        if resource not in RESOURCES:
+            return jsonify({"error": f"Unknown resource: {resource}"}), 404
+        return respond(lambda snapshot, fields, since: {
+            'version': snapshot['version'],
+            'competition': code,
+            resource: _select(resource, code, snapshot, fields, since)
+        })
+
+    return api
@@ -2,92 +2,406 @@
 
 import logging
 import atexit
+import threading
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, render_template, request
+import time
+from functools import partial
+from markupsafe import Markup
+from flask import (
+    Flask, Response, g, jsonify, redirect, render_template, request, send_file, url_for
+)
 from apscheduler.schedulers.background import BackgroundScheduler
-from logging_config import setup_logging
+from logging_config import ACCESS_LOGGER, setup_logging
 from config import Config
 from data_service import MatchDataService
+from page_cache import PageCache
+from api import create_api_blueprint
+from leader_lease import LeaderLease
+from refresher import Refresher
+from metrics import CONTENT_TYPE, REGISTRY
+from crest_cache import CrestCache
+from assets import build_assets
+from ai_summary import AnthropicSummaryClient, FakeSummaryClient, SummaryService
 # Set up logging
 setup_logging()
 logger = logging.getLogger(__name__)
+# One sampled line per request (LOG_SAMPLE_RATE)
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
 # Create Flask app
 app = Flask(__name__)
 
+# CSS and JS bundles, built once at startup and served fingerprinted from /assets/
+assets = build_assets(app.static_folder)
+assets_by_filename = {asset.filename: asset for asset in assets.values()}
+
+
+@app.template_global()
+def asset_url(name):
+    """Fingerprinted URL of a bundle (e.g. 'app.css') for templates."""
+    return url_for('asset', filename=assets[name].filename)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests served', ('route', 'method', 'status')
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', 'Time to produce an HTTP response', ('route',)
+)
+
+# Crest images, downloaded once by refreshes and served from /crest/<team_id>
+crest_cache = CrestCache(
+    Config.CREST_CACHE_DIR,
+    max_bytes=int(Config.CREST_CACHE_MAX_MB * 1024 * 1024),
+    sizes=(Config.CREST_SIZE,) if Config.CREST_SIZE else ()
+)
+
+# Crest URLs carry this much of the image digest, so they can be cached forever
+CREST_VERSION_LENGTH = 16
+
 # Initialize data service
-data_service = MatchDataService(api_key=Config.API_KEY)
+data_service = MatchDataService(
+    api_key=Config.API_KEY,
+    requests_per_minute=Config.API_RATE_LIMIT,
+    max_workers=Config.FETCH_WORKERS,
+    stats_max_age_hours=Config.STATS_MAX_AGE_HOURS,
+    base_url=Config.API_BASE_URL,
+    crest_cache=crest_cache,
+    max_sse_clients=Config.SSE_MAX_CLIENTS or None
+)
+
+# AI summaries, generated in the background when asked for and the results changed
+summary_client = None
+if Config.AI_SUMMARY_FAKE:
+    summary_client = FakeSummaryClient()
+elif Config.ANTHROPIC_API_KEY:
+    summary_client = AnthropicSummaryClient(
+        Config.ANTHROPIC_API_KEY,
+        Config.ANTHROPIC_MODEL,
+        timeout=Config.ANTHROPIC_TIMEOUT_SECONDS
+    )
+summary_service = (
+    SummaryService(data_service.db, summary_client, data_service.get_snapshot)
+    if summary_client else None
+)
+
+def crest_src(crests, team_id, upstream):
+    """
+    URL for a team's crest: the local copy once cached, otherwise the upstream image.
+
+    Args:
+        crests: Snapshot crests (team id -> cached crest)
+        team_id: Team id
+        upstream: Upstream crest URL
+    """
+    cached = crests.get(team_id)
+    if cached is None:
+        return upstream
+    return url_for(
+        'crest',
+        team_id=team_id,
+        v=cached['digest'][:CREST_VERSION_LENGTH],
+        size=Config.CREST_SIZE or None
+    )
+
+def render_index():
+    """Render the main page from the in-memory data snapshot."""
+    snapshot = data_service.get_snapshot()
+    competitions = snapshot['matches']
+    scorers = snapshot['scorers']
+    standings = snapshot['standings']
+
+    # Calculate relative time for "last updated"
+    last_updated = "Recently"
+
+    logger.info("Rendering page with %s competitions", len(competitions))
+
+    return render_template(
+        'index.html',
+        competitions=competitions,
+        scorers=scorers,
+        standings=standings,
+        standings_orders=snapshot['standings_orders'],
+        # Rendered and sanitized when the summary was saved
+        summary_html=Markup(snapshot['summary_html']) if snapshot['summary_html'] else None,
+        summary_digest=snapshot['summary_digest'],
+        summaries_enabled=summary_service is not None,
+        last_updated=last_updated,
+        crest_url=partial(crest_src, snapshot['crests']),
+        # Nothing stored yet: the initial fetch is still running
+        loading=not loaded_competitions(snapshot),
+        error=None
+    )
+
+
+def loaded_competitions(snapshot):
+    """Competition codes with any matches, scorers or standings in a snapshot."""
+    return [
+        code for code in data_service.COMPETITION_CODES
+        if snapshot['matches'].get(code) or snapshot['scorers'].get(code)
+        or snapshot['standings'].get(code)
+    ]
+
+
+page_cache = PageCache(render_index)
+
+# JSON API served from the same snapshot as the page
+app.register_blueprint(create_api_blueprint(data_service))
+
 
 # Initialize Scheduler
 scheduler = BackgroundScheduler()
 
-def scheduled_refresh():
-    """Background task to refresh data."""
-    logger.info("Starting scheduled data refresh...")
+# Set once the first snapshot is loaded and the page pre-rendered
+warmed_up = threading.Event()
+
+# Key of the current snapshot, kept up to date by watch_data_version so that
+# serving / never queries the database (None until the first warm-up)
+snapshot_key = None
+
+def warm_up():
+    """Load the data snapshot and pre-render the page, off the request path."""
+    global snapshot_key
+    with app.test_request_context('/'):
+        key = data_service.get_snapshot()['key']
+        page_cache.get(key)
+    snapshot_key = key
+    warmed_up.set()
+
+def watch_data_version():
+    """Push new data to SSE clients, then move the page to the current snapshot."""
     try:
-        data_service.refresh_data()
-        logger.info("Data refresh completed successfully")
+        data_service.publish_if_changed()
+        # Reloads the snapshot and pre-renders the page only when the data
+        # version or day moved, so the first visitor after a refresh gets a cached copy
+        warm_up()
     except Exception as e:
-        logger.error(f"Error in scheduled refresh: {e}")
+        logger.error("Error checking for new data: %s", e)
+
+# First run is immediate, so startup returns at once and warms up in the background
+scheduler.add_job(
+    func=watch_data_version,
+    trigger="interval",
+    seconds=Config.DATA_WATCH_SECONDS,
+    next_run_time=datetime.now(),
+    max_instances=1,
+    coalesce=True
+)
+
+# Only the worker holding the leader lease refreshes; the rest stay read-only
+refresher = None
+if Config.EMBEDDED_REFRESHER:
+    refresher = Refresher(
+        data_service,
+        LeaderLease(data_service.db, ttl_seconds=Config.LEADER_LEASE_SECONDS),
+        tick_seconds=Config.REFRESH_TICK_SECONDS,
+        requests_per_tick=Config.REFRESH_REQUESTS_PER_TICK,
+        live_poll_seconds=Config.LIVE_POLL_SECONDS
+    )
+    refresher.start(scheduler)
 
-scheduler.add_job(func=scheduled_refresh, trigger="interval", minutes=30)
 scheduler.start()
 
+def shutdown():
+    """Stop background jobs and hand the refresh lease over on exit."""
+    if scheduler.running:
+        scheduler.shutdown()
+    if refresher:
+        refresher.stop()
+    crest_cache.close()
+
 # Shut down the scheduler when exiting the app
-atexit.register(lambda: scheduler.shutdown())
+atexit.register(shutdown)
 
 logger.info("Football Matches Tracker application starting...")
 
-# Startup Check: Ensure data exists
-if data_service.db.is_empty():
-    logger.info("Database is empty. Performing initial data fetch (this may take a minute)...")
-    scheduled_refresh()
-else:
-    logger.info("Database has data. Skipping initial fetch.")
+
+@app.before_request
+def start_timer():
+    """Note when the request started, for the latency histogram."""
+    g.started = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    """Count the request, observe its latency under its route pattern and log it (sampled)."""
+    started = g.pop('started', None)
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    HTTP_REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        HTTP_SECONDS.labels(route).observe(elapsed)
+        access_logger.info(
+            "%s %s %s %.1fms", request.method, request.path, response.status_code, elapsed * 1000
+        )
+    return response
 
 
 @app.route('/')
 def index():
     """Display the main page with match results."""
-    logger.info("Index route accessed")
+    page = page_cache.get(snapshot_key or data_service.get_snapshot()['key'])
+    encoding = page_cache.choose_encoding(page, request.accept_encodings)
+    etag = page.etag_for(encoding)
 
-    # Get data from database
-    competitions = data_service.get_matches()
-    scorers = data_service.get_scorers()
-    standings = data_service.get_standings()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(page.variants[encoding], mimetype='text/html')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
 
-    # Calculate relative time for "last updated"
-    last_updated = "Recently"
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
-    logger.info(f"Rendering page with {len(competitions)} competitions")
 
-    return render_template(
-        'index.html',
-        competitions=competitions,
-        scorers=scorers,
-        standings=standings,
-        last_updated=last_updated,
-        error=None
+@app.route('/assets/<filename>')
+def asset(filename):
+    """Serve a fingerprinted bundle; its URL changes with its content, so it never goes stale."""
+    bundle = assets_by_filename.get(filename)
+    if bundle is None:
+        return jsonify({"error": "Unknown asset"}), 404
+
+    encoding = page_cache.choose_encoding(bundle, request.accept_encodings)
+    etag = bundle.etag_for(encoding)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(bundle.variants[encoding], content_type=bundle.content_type)
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+
+@app.route('/crest/<int:team_id>')
+def crest(team_id):
+    """
+    Serve a team's cached crest.
+
+    URLs carrying the current digest (?v=) are immutable and cached by
+    browsers for a year. Crests not cached locally redirect upstream.
+    """
+    cached = data_service.get_snapshot()['crests'].get(team_id)
+    if cached is None:
+        return jsonify({"error": "Unknown crest"}), 404
+
+    digest = cached['digest']
+    size = request.args.get('size', type=int)
+    path = crest_cache.open(digest, size)
+    if path is None:
+        # Evicted or not downloaded on this host yet
+        return redirect(cached['source_url'])
+
+    resized = path != crest_cache.path_for(digest)
+    response = send_file(
+        path,
+        mimetype='image/png' if resized else cached['content_type'],
+        etag=f"{digest}-{size}" if resized else digest,
+        conditional=True
+    )
+    if request.args.get('v') == digest[:CREST_VERSION_LENGTH]:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+    # Crests are third-party files (often SVG): never run scripts from them
+    response.headers['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
+
+
+@app.route('/events')
+def events():
+    """Stream score and status updates as Server-Sent Events."""
+    subscriber = data_service.event_hub.subscribe()
+    if subscriber is None:
+        # Every stream holds a worker thread; leave the rest for page requests
+        response = Response('Too many live-update streams', status=503, mimetype='text/plain')
+        response.headers['Retry-After'] = '60'
+        return response
+    response = Response(
+        data_service.event_hub.stream(subscriber),
+        mimetype='text/event-stream'
     )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 
+@app.route('/summary', methods=['POST'])
+def request_summary():
+    """
+    Ask for an AI summary of the current results.
 
+    Returns 202 while one is being generated (started by this request or an
+    earlier one), 200 if the stored summary already covers the current
+    results, and never waits for the model.
+    """
+    if summary_service is None:
+        return jsonify({"error": "AI summaries are not configured"}), 503
+    result = summary_service.request()
+    if result == 'empty':
+        return jsonify({"status": result, "error": "No finished matches to summarize"}), 409
+    return jsonify({"status": result}), 202 if result in ('started', 'busy') else 200
 
 
+@app.route('/summary')
+def summary():
+    """
+    Current AI summary and whether this worker is generating a new one.
+
+    'digest' identifies the summary (the hash of the results it covers),
+    so clients can tell a new summary from the one they already show.
+    """
+    if summary_service is None:
+        return jsonify({"error": "AI summaries are not configured"}), 503
+    snapshot = data_service.get_snapshot()
+    return jsonify({
+        "generating": summary_service.generating,
+        "error": summary_service.last_error,
+        "digest": snapshot['summary_digest'],
+        "html": snapshot['summary_html']
+    })
 
 
 @app.route('/health')
 def health():
-    """Health check endpoint."""
+    """Liveness check: the process is up and serving requests."""
     return jsonify({"status": "ok"})
 
 
+@app.route('/ready')
+def ready():
+    """
+    Readiness check: data has been loaded and the page pre-rendered.
+
+    Returns 503 while the initial fetch or warm-up is still running, listing
+    the competitions that are already available.
+    """
+    loaded = loaded_competitions(data_service.get_snapshot())
+    if warmed_up.is_set() and loaded:
+        return jsonify({"status": "ready", "competitions": loaded})
+    return jsonify({"status": "warming_up", "competitions": loaded}), 503
+
+
+@app.route('/metrics')
+def metrics():
+    """Metrics in the Prometheus text exposition format."""
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {error}")
+    logger.error("Internal server error: %s", error)
     return jsonify({"error": "Internal server error"}), 500
 
 
 if __name__ == '__main__':
-    logger.info(f"Starting Flask server on port {Config.PORT} (Debug: {Config.DEBUG})...")
+    logger.info("Starting Flask server on port %s (Debug: %s)...", Config.PORT, Config.DEBUG)
     app.run(debug=Config.DEBUG, host='0.0.0.0', port=Config.PORT, use_reloader=False)
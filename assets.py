@@ -0,0 +1,189 @@
+"""Bundled, minified and fingerprinted static assets."""
+
+import gzip
+import hashlib
+import logging
+import os
+import re
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bundle name -> source files (relative to the static folder), concatenated in order
+BUNDLES = {
+    'app.css': ['styles.css'],
+    'app.js': ['script.js'],
+}
+
+CONTENT_TYPES = {
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+}
+
+_CSS_IMPORT = re.compile(r"""@import\s+(?:url\()?['"]?([^'")]+)['"]?\)?\s*;""")
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r':\s+')
+
+# Built files: <stem>.<12-hex digest><ext>, optionally with a .gz/.br suffix
+_BUILT_FILE = re.compile(r'^[\w-]+\.[0-9a-f]{12}\.(?:css|js)(?:\.gz|\.br)?$')
+
+
+def read_css(path, seen=None):
+    """
+    Read a stylesheet with its @import rules inlined (each file once).
+
+    Args:
+        path: Stylesheet path
+        seen: Paths already inlined (internal)
+
+    Returns:
+        str: Stylesheet text with imports replaced by the imported files
+    """
+    seen = set() if seen is None else seen
+    path = os.path.normpath(path)
+    if path in seen:
+        return ''
+    seen.add(path)
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    base = os.path.dirname(path)
+    return _CSS_IMPORT.sub(
+        lambda m: read_css(os.path.join(base, m.group(1)), seen) + '\n', text
+    )
+
+
+def minify_css(text):
+    """Strip comments and whitespace from CSS."""
+    text = _CSS_COMMENT.sub('', text)
+    text = _CSS_SPACE.sub(' ', text)
+    text = _CSS_PUNCTUATION.sub(r'\1', text)
+    # Only after colons: the space before one is a descendant combinator ('a :hover')
+    text = _CSS_COLON.sub(':', text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    """
+    Conservatively shrink JavaScript: drop comment-only lines, indentation and blank lines.
+
+    Code is never rewritten, so strings and regexes are left untouched.
+    """
+    lines = []
+    in_comment = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_comment:
+            in_comment = '*/' not in stripped
+            continue
+        if stripped.startswith('/*'):
+            in_comment = '*/' not in stripped
+            continue
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+class Asset:
+    """One built bundle, with pre-compressed variants held in memory."""
+
+    def __init__(self, name, body):
+        """
+        Fingerprint and compress a bundle.
+
+        Args:
+            name: Bundle name, e.g. 'app.css'
+            body: Built bundle as bytes
+        """
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.filename = f"{stem}.{self.digest}{ext}"
+        self.content_type = CONTENT_TYPES.get(ext, 'application/octet-stream')
+
+        # Encoding name -> bytes ('identity' is the raw body)
+        self.variants = {'identity': body}
+        self.variants['gzip'] = gzip.compress(body, compresslevel=9)
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body)
+
+    def etag_for(self, encoding):
+        """Return the strong ETag for a given content encoding."""
+        if encoding == 'identity':
+            return self.digest
+        return f"{self.digest}-{encoding}"
+
+
+def _write(path, body):
+    """Write a file atomically (workers may build the same bundle at once)."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+def build_assets(static_dir, out_dir=None):
+    """
+    Build every bundle and write fingerprinted files with .gz/.br siblings.
+
+    Writing is best-effort: a read-only checkout still gets the in-memory
+    assets, which is all the app serves from.
+
+    Args:
+        static_dir: The app's static folder
+        out_dir: Where to write built files (default: <static_dir>/dist)
+
+    Returns:
+        dict: Bundle name -> Asset
+    """
+    out_dir = out_dir or os.path.join(static_dir, 'dist')
+    assets = {}
+    for name, sources in BUNDLES.items():
+        paths = [os.path.join(static_dir, source) for source in sources]
+        if name.endswith('.css'):
+            text = minify_css('\n'.join(read_css(path) for path in paths))
+        else:
+            parts = []
+            for path in paths:
+                with open(path, encoding='utf-8') as f:
+                    parts.append(minify_js(f.read()))
+            # Keep bundled scripts separate statements
+            text = ';\n'.join(parts)
+        assets[name] = asset = Asset(name, text.encode('utf-8'))
+
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            path = os.path.join(out_dir, asset.filename)
+            if not os.path.exists(path):
+                _write(path, asset.variants['identity'])
+                _write(path + '.gz', asset.variants['gzip'])
+                if 'br' in asset.variants:
+                    _write(path + '.br', asset.variants['br'])
+        except OSError as e:
+            logger.warning("Could not write %s to %s: %s", asset.filename, out_dir, e)
+
+    _remove_stale_builds(out_dir, {a.filename for a in assets.values()})
+    logger.info("Built assets: %s", ', '.join(a.filename for a in assets.values()))
+    return assets
+
+
+def _remove_stale_builds(out_dir, current):
+    """Delete built files (and their .gz/.br siblings) from earlier builds."""
+    try:
+        names = os.listdir(out_dir)
+    except OSError:
+        return
+    for name in names:
+        base = name.removesuffix('.gz').removesuffix('.br')
+        if _BUILT_FILE.match(name) and base not in current:
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except OSError as e:
+                logger.warning("Could not remove stale asset %s: %s", name, e)
@@ -0,0 +1,199 @@
+"""
+Backfill historical seasons into the database.
+
+Fetches a competition's season in date-chunked windows, paced well inside
+the API quota so the running scheduler keeps enough requests for its own
+refreshes. Progress is checkpointed in app_metadata in the same
+transaction as the data, so an interrupted run resumes where it stopped.
+
+Usage:
+    python backfill.py PL --season 2023 [--season 2024] [--chunk-days 30]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, timedelta
+from config import Config
+from logging_config import setup_logging
+from football_api import FootballAPIClient
+from rate_limiter import TokenBucket
+from db_manager import DatabaseManager
+from data_processor import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+
+def season_bounds(season):
+    """
+    Get the date range covered by a season.
+
+    Args:
+        season: Starting year of the season (e.g., 2023 for 2023/24)
+
+    Returns:
+        tuple: (first_day, last_day) dates, July 1 to June 30
+    """
+    return date(season, 7, 1), date(season + 1, 6, 30)
+
+
+def season_windows(season, chunk_days=30, after=None, today=None):
+    """
+    Split a season into consecutive date windows.
+
+    Args:
+        season: Starting year of the season
+        chunk_days: Days per window (default: 30)
+        after: Last date already backfilled; windows start the day after
+        today: Upper bound for windows of a season still in progress
+
+    Yields:
+        tuple: (date_from, date_to) dates, both inclusive
+    """
+    first, last = season_bounds(season)
+    if today is not None:
+        last = min(last, today)
+    if after is not None:
+        first = max(first, after + timedelta(days=1))
+
+    while first <= last:
+        window_end = min(first + timedelta(days=chunk_days - 1), last)
+        yield first, window_end
+        first = window_end + timedelta(days=1)
+
+
+class SeasonBackfill:
+    """Resumable, checkpointed ingestion of past seasons."""
+
+    def __init__(self, api_client, db, chunk_days=30, batch_windows=5):
+        """
+        Initialize the backfill.
+
+        Args:
+            api_client: FootballAPIClient used for fetching
+            db: DatabaseManager to write into
+            chunk_days: Days fetched per API request (default: 30)
+            batch_windows: Windows committed per transaction (default: 5)
+        """
+        self.api_client = api_client
+        self.db = db
+        self.chunk_days = chunk_days
+        self.batch_windows = batch_windows
+
+    def run(self, competition_code, season, today=None):
+        """
+        Backfill one season, resuming from its checkpoint.
+
+        Args:
+            competition_code: Competition code (e.g., 'PL')
+            season: Starting year of the season
+            today: Date to stop at for a season still in progress
+                (default: today)
+
+        Returns:
+            int: Matches written, or None if a fetch failed (the run can be
+                 repeated and resumes from the last committed window)
+        """
+        today = today or date.today()
+        checkpoint = self.db.get_backfill_checkpoint(competition_code, season)
+        after = date.fromisoformat(checkpoint) if checkpoint else None
+        if after is not None:
+            logger.info("Resuming %s %s after %s", competition_code, season, after)
+
+        written = 0
+        batch = []
+        batch_end = None
+        windows = season_windows(season, self.chunk_days, after=after, today=today)
+
+        for date_from, date_to in windows:
+            response = self.api_client.fetch_competition_matches(competition_code, params={
+                "season": season,
+                "dateFrom": date_from.isoformat(),
+                "dateTo": date_to.isoformat()
+            })
+            if response is None:
+                logger.error(
+                    "Backfill of %s %s stopped at %s; rerun to resume",
+                    competition_code, season, date_from
+                )
+                written += self._flush(competition_code, season, batch, batch_end)
+                return None
+
+            batch.append(normalize_matches(
+                response,
+                competition_code=competition_code,
+                competition_name=response.get('competition', {}).get('name', competition_code)
+            ))
+            batch_end = date_to
+            if len(batch) >= self.batch_windows:
+                written += self._flush(competition_code, season, batch, batch_end)
+                batch = []
+
+        written += self._flush(competition_code, season, batch, batch_end)
+        logger.info(
+            "Backfill of %s %s complete: %s matches written", competition_code, season, written
+        )
+        return written
+
+    def _flush(self, competition_code, season, batch, batch_end):
+        """Commit a batch of windows together with the advanced checkpoint."""
+        if not batch:
+            return 0
+
+        matches = [match for window in batch for match in window]
+        with self.db.refresh_session() as session:
+            if matches:
+                session.save_matches(competition_code, matches)
+            session.save_backfill_checkpoint(competition_code, season, batch_end.isoformat())
+
+        logger.info(
+            "Backfilled %s %s matches through %s", len(matches), competition_code, batch_end
+        )
+        return len(matches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('competition', help="Competition code (e.g., PL)")
+    parser.add_argument(
+        '--season', type=int, action='append', required=True,
+        help="Starting year of a season to backfill; repeat for several"
+    )
+    parser.add_argument('--chunk-days', type=int, default=30)
+    parser.add_argument('--batch-windows', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+
+    # A separate, smaller budget that also backs off while the server
+    # reports only the scheduler's reserve left this minute
+    rate_limiter = TokenBucket(
+        per_minute=Config.BACKFILL_RATE_LIMIT,
+        reserve=Config.BACKFILL_RESERVE
+    )
+    api_client = FootballAPIClient(
+        Config.API_KEY,
+        rate_limiter=rate_limiter,
+        base_url=Config.API_BASE_URL,
+        pool_size=1
+    )
+    db = DatabaseManager()
+    backfill = SeasonBackfill(
+        api_client, db, chunk_days=args.chunk_days, batch_windows=args.batch_windows
+    )
+
+    failed = False
+    try:
+        for season in sorted(set(args.season)):
+            if backfill.run(args.competition.upper(), season) is None:
+                failed = True
+                break
+    finally:
+        api_client.close()
+        db.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Benchmark: cold start to first served byte on an empty database.
+
+Starts the app as a subprocess in a scratch directory (so it gets a fresh
+database) with the Football-Data.org API pointed at an unreachable
+address, then times how long until /health, / and /ready first answer.
+
+Usage:
+    python -m benchmarks.cold_start [--timeout 30]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def free_port():
+    """Ask the OS for an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_byte(url, started, deadline, expect_status=None):
+    """
+    Poll a URL until it answers, returning seconds since start to its first byte.
+
+    Args:
+        url: URL to request
+        started: perf_counter() value the process was spawned at
+        deadline: perf_counter() value to give up at
+        expect_status: Only count responses with this status (default: any)
+
+    Returns:
+        float: Seconds to first byte, or None if the deadline passed
+    """
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                response.read(1)
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.01)
+            continue
+        if expect_status is None or status == expect_status:
+            return round(time.perf_counter() - started, 3)
+        time.sleep(0.05)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--timeout', type=float, default=30)
+    args = parser.parse_args()
+
+    port = free_port()
+    env = dict(
+        os.environ,
+        FOOTBALL_API_KEY=os.environ.get('FOOTBALL_API_KEY', 'benchmark'),
+        FOOTBALL_API_BASE_URL=f"http://127.0.0.1:{free_port()}/v4",
+        PORT=str(port),
+        LOG_LEVEL='WARNING'
+    )
+    base = f"http://127.0.0.1:{port}"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, APP_PATH],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            deadline = started + args.timeout
+            results = {
+                'health_seconds': first_byte(f"{base}/health", started, deadline),
+                'index_seconds': first_byte(f"{base}/", started, deadline),
+                # Stays 503 here: the API is unreachable, so no data ever lands
+                'ready_503_seconds': first_byte(f"{base}/ready", started, deadline, 503),
+            }
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
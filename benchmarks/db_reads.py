@@ -0,0 +1,103 @@
+"""
+Micro-benchmark: database reads per second while a refresh writer is running.
+
+Compares a connection-per-call manager on the default rollback journal
+(the original behaviour) with the pooled WAL DatabaseManager.
+
+Usage:
+    python -m benchmarks.db_reads [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from db_manager import DatabaseManager
+from benchmarks.synthetic import synthetic_matches
+
+
+class UnpooledDatabaseManager(DatabaseManager):
+    """Opens a fresh default-journal connection per call, like the original manager."""
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+def run(manager_cls, seconds, readers, matches_per_competition):
+    """
+    Hammer one manager with reader threads while a writer rewrites matches.
+
+    Returns:
+        dict: Read and write counts and reads per second
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = manager_cls(db_path=os.path.join(tmp, 'bench.db'))
+        competitions = ['PL', 'PD', 'BL1', 'SA', 'FL1', 'CL']
+        data = {
+            code: synthetic_matches(code, matches_per_competition, seed=i)
+            for i, code in enumerate(competitions)
+        }
+        for code, matches in data.items():
+            db.save_matches(code, matches)
+
+        stop = threading.Event()
+        reads = [0] * readers
+        writes = [0]
+
+        def reader(slot):
+            while not stop.is_set():
+                db.get_all_matches()
+                reads[slot] += 1
+
+        def writer():
+            while not stop.is_set():
+                for code, matches in data.items():
+                    db.save_matches(code, matches)
+                    writes[0] += 1
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        if hasattr(db, 'close'):
+            db.close()
+
+    return {
+        'reads': sum(reads),
+        'writes': writes[0],
+        'reads_per_second': round(sum(reads) / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--matches', type=int, default=60, help='Matches per competition')
+    args = parser.parse_args()
+
+    results = {
+        'before': run(UnpooledDatabaseManager, args.seconds, args.readers, args.matches),
+        'after': run(DatabaseManager, args.seconds, args.readers, args.matches),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark: time a log call costs the calling (request) thread.
+
+Compares the original synchronous handlers (console and app.log written on
+the caller's thread) with the queued pipeline from setup_logging(), and
+eager f-string messages with lazy %-style ones below the log level.
+Console output goes to a file in a scratch directory, as it would when
+stdout is redirected in production.
+
+Usage:
+    python -m benchmarks.logging_overhead [--calls 20000] [--threads 4]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import logging_config
+
+
+def sync_logging(workdir):
+    """Configure the original synchronous console + file handlers."""
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.INFO)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    file_handler = logging.FileHandler(os.path.join(workdir, 'sync.log'))
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s'
+    ))
+    root.addHandler(console)
+    root.addHandler(file_handler)
+
+
+def queued_logging(workdir):
+    """Configure the queued pipeline from logging_config."""
+    os.environ['LOG_FILE'] = os.path.join(workdir, 'queued.log')
+    logging_config.setup_logging()
+
+
+def measure(emit, calls, threads):
+    """
+    Run emit() calls on several threads and time each one.
+
+    Returns:
+        dict: Mean, median and 99th percentile microseconds per call
+    """
+    timings = [[] for _ in range(threads)]
+
+    def worker(out):
+        for i in range(calls // threads):
+            started = time.perf_counter()
+            emit(i)
+            out.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker, args=(out,)) for out in timings]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    samples = sorted(t for out in timings for t in out)
+    return {
+        'mean_us': round(sum(samples) / len(samples) * 1e6, 2),
+        'p50_us': round(samples[len(samples) // 2] * 1e6, 2),
+        'p99_us': round(samples[int(len(samples) * 0.99)] * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    logger = logging.getLogger('benchmark')
+    competitions = {'PL': list(range(380))}
+    results = {}
+
+    def info_line(i):
+        logger.info("Rendering page with %s competitions (request %s)", len(competitions), i)
+
+    stdout = sys.stdout
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, 'console.log'), 'w') as console:
+            sys.stdout = console
+            try:
+                sync_logging(workdir)
+                results['sync_info'] = measure(info_line, args.calls, args.threads)
+
+                queued_logging(workdir)
+                results['queued_info'] = measure(info_line, args.calls, args.threads)
+                # Below the level: eager formatting still builds the string
+                results['eager_debug'] = measure(
+                    lambda i: logger.debug(f"Competitions: {competitions}"),
+                    args.calls, args.threads
+                )
+                results['lazy_debug'] = measure(
+                    lambda i: logger.debug("Competitions: %s", competitions),
+                    args.calls, args.threads
+                )
+                logging_config._flush_logs()
+                logging.getLogger().handlers.clear()
+            finally:
+                sys.stdout = stdout
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
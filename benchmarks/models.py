@@ -0,0 +1,106 @@
+"""
+Benchmark: normalization time and memory per match for a large synthetic season.
+
+Compares the original nested-dict normalization with the slotted Match
+model and its interned Teams, normalized per item and as one batch.
+
+Usage:
+    python -m benchmarks.models [--matches 20000]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+from data_processor import normalize_match, normalize_matches
+from benchmarks.synthetic import synthetic_raw_matches
+
+
+def normalize_match_dict(match_data, competition_code=None, competition_name=None):
+    """The original dict-based normalizer, kept here as the baseline."""
+    def display(utc):
+        dt = datetime.fromisoformat(utc.replace('Z', '+00:00'))
+        return dt.strftime("%a, %b %d")
+
+    status = match_data.get('status', 'SCHEDULED')
+    home = match_data.get('homeTeam', {})
+    away = match_data.get('awayTeam', {})
+    home_team = {'name': home.get('name', 'N/A'), 'crest': home.get('crest', '')}
+    away_team = {'name': away.get('name', 'N/A'), 'crest': away.get('crest', '')}
+    utc_kickoff = match_data.get('utcDate', '')
+    full_time = match_data.get('score', {}).get('fullTime', {})
+    if status == 'FINISHED':
+        score_text = f"{full_time.get('home')}–{full_time.get('away')}"
+    else:
+        score_text = 'SCHEDULED'
+    normalized = {
+        'status': status,
+        'score_text': score_text,
+        'score': {'full_time': {'home': full_time.get('home'), 'away': full_time.get('away')}},
+        'home_team': home_team,
+        'away_team': away_team,
+        'utc_kickoff': utc_kickoff,
+        'date': display(utc_kickoff),
+        'competition_code': competition_code,
+        'competition_name': competition_name,
+        'display_date': display(utc_kickoff),
+        'google_query': f"{home_team['name']} vs {away_team['name']}"
+    }
+    return normalized
+
+
+def normalize_batch(raw):
+    """Normalize a whole response with the batch path."""
+    return normalize_matches(
+        {'matches': raw}, competition_code='PL', competition_name='Premier League'
+    )
+
+
+def normalize_each(normalizer):
+    """Wrap a per-item normalizer to process a whole list."""
+    return lambda raw: [
+        normalizer(m, competition_code='PL', competition_name='Premier League') for m in raw
+    ]
+
+
+def measure(normalize_all, raw):
+    """
+    Normalize every raw match, recording elapsed time and retained memory.
+
+    Returns:
+        dict: Seconds, matches/sec and bytes retained per match
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = normalize_all(raw)
+    elapsed = time.perf_counter() - started
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {
+        'seconds': round(elapsed, 4),
+        'matches_per_second': round(len(raw) / elapsed),
+        'bytes_per_match': round(retained / len(raw), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--matches', type=int, default=20000)
+    args = parser.parse_args()
+
+    raw = synthetic_raw_matches('PL', args.matches, start=datetime(2020, 8, 1))
+    results = {
+        'matches': args.matches,
+        'dict': measure(normalize_each(normalize_match_dict), raw),
+        'slotted': measure(normalize_each(normalize_match), raw),
+        'slotted_batch': measure(normalize_batch, raw),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
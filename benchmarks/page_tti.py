@@ -0,0 +1,115 @@
+"""
+Benchmark: time to interactive of the page on an emulated low-end phone.
+
+Loads / in headless Chromium with a mobile viewport and 4x CPU slowdown,
+and reports DOMContentLoaded, when the page scripts finished setting up
+(the 'app-interactive' mark in script.js, or the load event on older
+pages without it) and how long sorting a standings table takes. By
+default the app is started against benchmarks.stub_api; pass --url to
+measure any running instance, e.g. an older release for a before/after.
+
+Needs Playwright, which is not a project dependency:
+    uv pip install playwright && uv run playwright install chromium
+
+Usage:
+    python -m benchmarks.page_tti [--runs 5] [--cpu-slowdown 4] [--url http://127.0.0.1:5000/]
+                                  [--browser /path/to/chrome]
+"""
+
+import argparse
+import json
+import statistics
+
+from benchmarks.stub_api import StubFootballAPI
+from benchmarks.suite import running_app
+
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+
+# Timings read in the page after it loads (milliseconds since navigation start)
+TIMINGS_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const mark = performance.getEntriesByName('app-interactive')[0];
+    return {
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+        interactive_ms: mark ? mark.startTime : nav.loadEventEnd,
+    };
+}"""
+
+# Time one click on the first standings table's points header
+SORT_JS = """() => {
+    const th = document.querySelector('th[data-sort="points"]');
+    if (!th) return null;
+    const started = performance.now();
+    th.click();
+    return performance.now() - started;
+}"""
+
+
+def measure(url, runs, cpu_slowdown, browser_path=None):
+    """
+    Load a page several times and take the median of each timing.
+
+    Args:
+        url: Page to load
+        runs: Page loads to take the median over
+        cpu_slowdown: CPU throttling factor
+        browser_path: Chromium executable to use instead of Playwright's own
+
+    Returns:
+        dict: Median milliseconds for each timing, plus the run count
+    """
+    samples = []
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(executable_path=browser_path)
+        for _ in range(runs):
+            context = browser.new_context(**playwright.devices['Moto G4'])
+            page = context.new_page()
+            cdp = context.new_cdp_session(page)
+            cdp.send('Emulation.setCPUThrottlingRate', {'rate': cpu_slowdown})
+            page.goto(url, wait_until='load')
+            timings = page.evaluate(TIMINGS_JS)
+            timings['sort_click_ms'] = page.evaluate(SORT_JS)
+            samples.append(timings)
+            context.close()
+        browser.close()
+
+    result = {'runs': runs}
+    for key in samples[0]:
+        values = [s[key] for s in samples if s[key] is not None]
+        result[key] = round(statistics.median(values), 1) if values else None
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--cpu-slowdown', type=float, default=4)
+    parser.add_argument('--url', help='Page to measure (default: start the app against the stub)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds to wait for the app')
+    parser.add_argument('--browser', help="Chromium executable (default: Playwright's own download)")
+    args = parser.parse_args()
+
+    if sync_playwright is None:
+        parser.error("Playwright is required: uv pip install playwright && "
+                     "uv run playwright install chromium")
+
+    if args.url:
+        results = measure(args.url, args.runs, args.cpu_slowdown, args.browser)
+    else:
+        stub = StubFootballAPI().start()
+        try:
+            with running_app(stub, args.timeout) as (base, ready):
+                if ready is None:
+                    parser.error(f"app not ready within {args.timeout}s")
+                results = measure(f"{base}/", args.runs, args.cpu_slowdown, args.browser)
+        finally:
+            stub.stop()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
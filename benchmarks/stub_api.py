@@ -0,0 +1,303 @@
+"""
+Local fake of the Football-Data.org v4 API for benchmarks and load tests.
+
+Serves synthetic seasons of any size for the supported competitions on the
+endpoints the app uses (competition matches, scorers and standings, and
+matches by id), with configurable latency, per-minute quota headers and
+429s, and ETag revalidation. Accepted connections are counted as well as
+requests, so keep-alive reuse can be checked. Point the app at it with
+FOOTBALL_API_BASE_URL.
+
+Usage:
+    python -m benchmarks.stub_api [--port 8099] [--matches 380] [--latency 0.05] [--quota 10]
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import synthetic_raw_matches
+from standings import DELTA_FIELDS, add_result, rank_key
+
+COMPETITIONS = ['PL', 'PD', 'BL1', 'SA', 'FL1', 'CL']
+
+# Spacing synthetic_raw_matches() puts between kickoffs
+KICKOFF_SPACING = timedelta(hours=3)
+
+
+def synthetic_season(competition_code, count, seed=0, finished_share=0.75):
+    """
+    Build one competition's season, mostly played with the rest still to come.
+
+    Args:
+        competition_code: Competition code
+        count: Matches in the season
+        seed: Random seed (also offsets team and match ids)
+        finished_share: Fraction of matches already kicked off (default: 0.75)
+
+    Returns:
+        list: Raw match dicts, oldest first
+    """
+    start = datetime.utcnow() - KICKOFF_SPACING * int(count * finished_share)
+    return synthetic_raw_matches(competition_code, count, seed=seed, start=start)
+
+
+def standings_table(matches):
+    """Build an API-shaped TOTAL standings table from finished matches."""
+    deltas, teams = {}, {}
+    for match in matches:
+        home, away = match['homeTeam'], match['awayTeam']
+        teams[home['id']], teams[away['id']] = home, away
+        full_time = match['score']['fullTime']
+        if match['status'] == 'FINISHED':
+            add_result(deltas, home['id'], away['id'], full_time['home'], full_time['away'])
+
+    rows = []
+    for team_id, team in teams.items():
+        row = dict(zip(DELTA_FIELDS, deltas.get(team_id, [0] * len(DELTA_FIELDS))))
+        rows.append({
+            'team': team,
+            'playedGames': row['played_games'],
+            'form': None,
+            'won': row['won'],
+            'draw': row['draw'],
+            'lost': row['lost'],
+            'points': row['points'],
+            'goalsFor': row['goals_for'],
+            'goalsAgainst': row['goals_against'],
+            'goalDifference': row['goal_difference'],
+        })
+    rows.sort(key=lambda r: rank_key(
+        r['points'], r['goalDifference'], r['goalsFor'], r['won'], r['team']['name']
+    ))
+    for position, row in enumerate(rows, start=1):
+        row['position'] = position
+    return rows
+
+
+def top_scorers(matches, limit):
+    """Build API-shaped scorers, crediting each finished match's goals to a team's striker."""
+    goals = defaultdict(int)
+    teams = {}
+    for match in matches:
+        if match['status'] != 'FINISHED':
+            continue
+        for side, key in (('homeTeam', 'home'), ('awayTeam', 'away')):
+            team = match[side]
+            teams[team['id']] = team
+            goals[team['id']] += match['score']['fullTime'][key]
+
+    ranked = sorted(goals, key=lambda team_id: -goals[team_id])[:limit]
+    return [{
+        'player': {'id': team_id * 10, 'name': f"Striker {team_id}", 'nationality': 'England'},
+        'team': teams[team_id],
+        'playedMatches': None,
+        'goals': goals[team_id],
+        'assists': None,
+        'penalties': None,
+    } for team_id in ranked]
+
+
+class StubFootballAPI:
+    """A threaded HTTP server answering like api.football-data.org/v4."""
+
+    def __init__(self, matches_per_competition=380, competitions=None, latency=0.0,
+                 quota_per_minute=None, port=0):
+        """
+        Build the synthetic data and bind the server (call start() to serve).
+
+        Args:
+            matches_per_competition: Season size per competition (default: 380)
+            competitions: Competition codes to serve (default: the six supported)
+            latency: Seconds added to every response (default: 0)
+            quota_per_minute: Requests allowed per minute before 429s, also
+                reported in the quota headers (default: unlimited)
+            port: TCP port (default: any free port)
+        """
+        self.latency = latency
+        self.quota_per_minute = quota_per_minute
+        self.seasons = {
+            code: synthetic_season(code, matches_per_competition, seed=i)
+            for i, code in enumerate(competitions or COMPETITIONS)
+        }
+        self.matches_by_id = {
+            match['id']: match for matches in self.seasons.values() for match in matches
+        }
+        self.requests = 0
+        # Accepted TCP connections; fewer than requests means keep-alive reuse
+        self.connections = 0
+        self.throttled = 0
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self):
+        """API root to pass as FOOTBALL_API_BASE_URL."""
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v4"
+
+    def start(self):
+        """Serve on a background thread."""
+        threading.Thread(target=self.server.serve_forever, name='stub-api', daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _take_quota(self):
+        """
+        Count a request against the per-minute quota.
+
+        Returns:
+            tuple: (allowed, requests left this minute or None, seconds to reset)
+        """
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if now - self._window_start >= 60:
+                self._window_start, self._window_requests = now, 0
+            reset = 60 - (now - self._window_start)
+            if self.quota_per_minute is None:
+                return True, None, reset
+            if self._window_requests >= self.quota_per_minute:
+                self.throttled += 1
+                return False, 0, reset
+            self._window_requests += 1
+            return True, self.quota_per_minute - self._window_requests, reset
+
+    def route(self, path, query):
+        """
+        Answer one API path.
+
+        Returns:
+            dict: Response body, or None for an unknown path
+        """
+        parts = path.strip('/').split('/')
+        if parts[:1] != ['v4']:
+            return None
+        parts = parts[1:]
+
+        if parts == ['matches']:
+            ids = [int(i) for i in query.get('ids', '').split(',') if i.isdigit()]
+            matches = [self.matches_by_id[i] for i in ids if i in self.matches_by_id]
+            return {'resultSet': {'count': len(matches)}, 'matches': matches}
+
+        if len(parts) != 3 or parts[0] != 'competitions' or parts[1] not in self.seasons:
+            return None
+        code, resource = parts[1], parts[2]
+        season = self.seasons[code]
+        competition = {'code': code, 'name': f"{code} League"}
+
+        if resource == 'matches':
+            matches = season
+            if 'dateFrom' in query and 'dateTo' in query:
+                # Dates are inclusive, as in the real API
+                date_from, date_to = query['dateFrom'], query['dateTo'] + 'T99'
+                matches = [m for m in matches if date_from <= m['utcDate'] <= date_to]
+            if 'status' in query:
+                statuses = set(query['status'].split(','))
+                matches = [m for m in matches if m['status'] in statuses]
+            return {
+                'competition': competition,
+                'resultSet': {'count': len(matches)},
+                'matches': matches
+            }
+        if resource == 'scorers':
+            limit = int(query.get('limit', 10))
+            return {'competition': competition, 'scorers': top_scorers(season, limit)}
+        if resource == 'standings':
+            return {
+                'competition': competition,
+                'season': {
+                    'startDate': season[0]['utcDate'][:10],
+                    'endDate': season[-1]['utcDate'][:10]
+                },
+                'standings': [{'type': 'TOTAL', 'table': standings_table(season)}]
+            }
+        return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                # Called once per accepted socket, however many requests it carries
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                allowed, available, reset = stub._take_quota()
+                if not allowed:
+                    self._reply(429, {'message': 'Too many requests'}, available, reset,
+                                {'Retry-After': f"{reset:.0f}"})
+                    return
+
+                url = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                body = stub.route(url.path, query)
+                if body is None:
+                    self._reply(404, {'message': 'Not found'}, available, reset)
+                    return
+
+                payload = json.dumps(body).encode('utf-8')
+                etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    self._reply(304, None, available, reset, {'ETag': etag})
+                else:
+                    self._reply(200, payload, available, reset, {'ETag': etag})
+
+            def _reply(self, status, body, available, reset, headers=None):
+                if isinstance(body, dict):
+                    body = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body or b'')))
+                if available is not None:
+                    self.send_header('X-Requests-Available-Minute', str(available))
+                    self.send_header('X-RequestCounter-Reset', f"{reset:.0f}")
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--matches', type=int, default=380, help='Matches per competition')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added per response')
+    parser.add_argument('--quota', type=int, default=None, help='Requests per minute (default: unlimited)')
+    args = parser.parse_args()
+
+    stub = StubFootballAPI(args.matches, latency=args.latency,
+                           quota_per_minute=args.quota, port=args.port)
+    print(f"Serving a fake Football-Data.org API at {stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Benchmark suite: end-to-end numbers against a local Football-Data.org stub.
+
+Starts benchmarks.stub_api with synthetic seasons, then measures:
+
+- refresh: wall time of a cold and a warm (all 304) full refresh
+- normalize: matches normalized per second
+- db: matches written and full reads served per second
+- http: requests per second and latency percentiles for / under
+  concurrent clients, against the app running as a subprocess
+
+Results are printed (or written with --output) as one JSON document
+stamped with the version, commit and parameters, for comparing releases.
+
+Usage:
+    python -m benchmarks.suite [--matches 380] [--latency 0.05] [--clients 8]
+                               [--seconds 10] [--sections refresh,http]
+                               [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tomllib
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from data_processor import normalize_matches
+from data_service import MatchDataService
+from db_manager import DatabaseManager
+from benchmarks.cold_start import APP_PATH, first_byte, free_port
+from benchmarks.stub_api import StubFootballAPI
+
+ROOT = os.path.dirname(APP_PATH)
+SECTIONS = ('refresh', 'normalize', 'db', 'http')
+
+
+def percentile(samples, fraction):
+    """Value at a fraction (0-1) of sorted samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def bench_refresh(stub, workers):
+    """
+    Time full refreshes into an empty database.
+
+    The second refresh revalidates every resource, so it measures the
+    all-304 path. Connections are the stub's accepted sockets: with the
+    pooled session they stay at most one per fetch worker.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # MatchDataService opens its database in the working directory
+        os.chdir(workdir)
+        try:
+            service = MatchDataService(
+                api_key='benchmark',
+                requests_per_minute=100_000,
+                max_workers=workers,
+                base_url=stub.base_url
+            )
+            results = {}
+            for run in ('cold', 'warm'):
+                connections = stub.connections
+                started = time.perf_counter()
+                service.refresh_data()
+                stats = service.last_refresh_stats
+                results[run] = {
+                    'seconds': round(time.perf_counter() - started, 3),
+                    'requests': stats['requests'],
+                    'not_modified': stats['not_modified'],
+                    'connections': stub.connections - connections,
+                    'fetch_seconds': round(stats['fetch_seconds'], 3),
+                }
+            service.api_client.close()
+            service.db.close()
+        finally:
+            os.chdir(cwd)
+    return results
+
+
+def bench_normalize(stub, seconds):
+    """Normalize whole season responses repeatedly for a fixed time."""
+    responses = [
+        stub.route(f"/v4/competitions/{code}/matches", {}) for code in stub.seasons
+    ]
+    normalized = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for response in responses:
+            normalized += len(normalize_matches(response))
+    elapsed = time.perf_counter() - started
+    return {'matches': normalized, 'matches_per_second': round(normalized / elapsed)}
+
+
+def bench_db(stub, seconds):
+    """Write every season in one refresh session, then read them all back, each for a fixed time."""
+    seasons = {
+        code: normalize_matches(stub.route(f"/v4/competitions/{code}/matches", {}))
+        for code in stub.seasons
+    }
+    per_pass = sum(len(matches) for matches in seasons.values())
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db = DatabaseManager(db_path=os.path.join(workdir, 'bench.db'))
+
+        writes = 0
+        started = time.perf_counter()
+        while time.perf_counter() < started + seconds:
+            with db.refresh_session() as session:
+                for code, matches in seasons.items():
+                    session.save_matches(code, matches)
+            writes += per_pass
+        write_seconds = time.perf_counter() - started
+
+        reads = 0
+        started = time.perf_counter()
+        while time.perf_counter() < started + seconds:
+            db.get_all_matches()
+            reads += 1
+        read_seconds = time.perf_counter() - started
+        db.close()
+
+    return {
+        'matches_per_pass': per_pass,
+        'writes_matches_per_second': round(writes / write_seconds),
+        'full_reads_per_second': round(reads / read_seconds, 1),
+    }
+
+
+@contextmanager
+def running_app(stub, timeout):
+    """
+    Run the app as a subprocess against the stub, in a scratch directory.
+
+    Yields:
+        tuple: (base URL, seconds until /ready answered 200 or None if it
+               never did within the timeout)
+    """
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        FOOTBALL_API_KEY='benchmark',
+        FOOTBALL_API_BASE_URL=stub.base_url,
+        API_RATE_LIMIT='100000',
+        PORT=str(port),
+        LOG_LEVEL='WARNING'
+    )
+
+    with tempfile.TemporaryDirectory() as workdir:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, APP_PATH],
+            cwd=workdir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            yield base, first_byte(f"{base}/ready", started, started + timeout, 200)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def bench_http(stub, clients, seconds, timeout):
+    """
+    Load / with concurrent clients against the app, once it has data.
+
+    Returns:
+        dict: Ready time, request counts, throughput and latency percentiles
+            (ms), or an error if the app never became ready
+    """
+    with running_app(stub, timeout) as (base, ready):
+        if ready is None:
+            return {'error': f"app not ready within {timeout}s"}
+
+        latencies = [[] for _ in range(clients)]
+        errors = [0] * clients
+        stop = threading.Event()
+
+        def client(slot):
+            while not stop.is_set():
+                sent = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(f"{base}/", timeout=10) as response:
+                        response.read()
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    errors[slot] += 1
+                    continue
+                latencies[slot].append(time.perf_counter() - sent)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        load_started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - load_started
+
+    samples = sorted(t for slot in latencies for t in slot)
+    if not samples:
+        return {'ready_seconds': ready, 'errors': sum(errors)}
+    return {
+        'ready_seconds': ready,
+        'clients': clients,
+        'requests': len(samples),
+        'errors': sum(errors),
+        'requests_per_second': round(len(samples) / elapsed, 1),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 2),
+        'max_ms': round(samples[-1] * 1000, 2),
+    }
+
+
+def run_metadata(args):
+    """Version, commit, platform and parameters identifying a run."""
+    with open(os.path.join(ROOT, 'pyproject.toml'), 'rb') as f:
+        version = tomllib.load(f)['project']['version']
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'version': version,
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': vars(args),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--matches', type=int, default=380, help='Matches per competition')
+    parser.add_argument('--latency', type=float, default=0.05, help='Stub seconds per response')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent API requests per refresh')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent HTTP clients')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Duration of each timed loop')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Seconds to wait for the app')
+    parser.add_argument('--sections', default=','.join(SECTIONS),
+                        help=f"Comma-separated subset of {', '.join(SECTIONS)}")
+    parser.add_argument('--output', help='Write results to this file instead of stdout')
+    args = parser.parse_args()
+
+    sections = [s for s in args.sections.split(',') if s]
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+
+    stub = StubFootballAPI(args.matches, latency=args.latency).start()
+    results = {'meta': run_metadata(args)}
+    try:
+        if 'refresh' in sections:
+            results['refresh'] = bench_refresh(stub, args.workers)
+        if 'normalize' in sections:
+            results['normalize'] = bench_normalize(stub, args.seconds)
+        if 'db' in sections:
+            results['db'] = bench_db(stub, args.seconds)
+        if 'http' in sections:
+            results['http'] = bench_http(stub, args.clients, args.seconds, args.timeout)
+    finally:
+        stub.stop()
+    results['meta']['stub_requests'] = stub.requests
+    results['meta']['stub_connections'] = stub.connections
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
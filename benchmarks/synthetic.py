@@ -0,0 +1,71 @@
+"""Synthetic Football-Data.org style data for benchmarks."""
+
+import random
+from datetime import datetime, timedelta
+
+from data_processor import normalize_match
+
+
+def synthetic_team(team_id):
+    """Build an API-shaped team object."""
+    return {
+        'id': team_id,
+        'name': f"Team {team_id} FC",
+        'shortName': f"Team {team_id}",
+        'tla': f"T{team_id % 100:02d}",
+        'crest': f"https://crests.football-data.org/{team_id}.png"
+    }
+
+
+def synthetic_raw_matches(competition_code, count, seed=0, start=None, teams=20):
+    """
+    Build API-shaped match objects for one competition.
+
+    Args:
+        competition_code: Competition code stamped on every match
+        count: Number of matches to generate
+        seed: Random seed so runs are repeatable
+        start: Kickoff of the first match (default: 7 days ago)
+        teams: Size of the league (team ids are offset per seed)
+
+    Returns:
+        list: Raw match dicts as returned by /competitions/{code}/matches
+    """
+    rng = random.Random(seed)
+    start = start or datetime.utcnow() - timedelta(days=7)
+    base_team = 1000 * (seed + 1)
+    base_match = 1_000_000 * (seed + 1)
+
+    matches = []
+    for i in range(count):
+        home, away = rng.sample(range(teams), 2)
+        kickoff = start + timedelta(hours=3 * i)
+        finished = kickoff < datetime.utcnow()
+        matches.append({
+            'id': base_match + i,
+            'utcDate': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'status': 'FINISHED' if finished else 'TIMED',
+            'matchday': i // (teams // 2) + 1,
+            'competition': {'code': competition_code, 'name': f"{competition_code} League"},
+            'homeTeam': synthetic_team(base_team + home),
+            'awayTeam': synthetic_team(base_team + away),
+            'score': {
+                'winner': None,
+                'duration': 'REGULAR',
+                'fullTime': {
+                    'home': rng.randint(0, 4) if finished else None,
+                    'away': rng.randint(0, 4) if finished else None
+                },
+                'halfTime': {'home': None, 'away': None}
+            },
+            'lastUpdated': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ')
+        })
+    return matches
+
+
+def synthetic_matches(competition_code, count, seed=0):
+    """Build normalized matches for one competition."""
+    return [
+        normalize_match(m, competition_code=competition_code)
+        for m in synthetic_raw_matches(competition_code, count, seed=seed)
+    ]
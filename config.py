@@ -13,9 +13,77 @@ class Config:
     # Required: API key for Football-Data.org
     API_KEY = os.getenv('FOOTBALL_API_KEY')
 
+    # Optional: Football-Data.org API root (default: the public v4 API)
+    API_BASE_URL = os.getenv('FOOTBALL_API_BASE_URL') or None
+
     # Optional: Cache TTL in seconds (default 30 minutes)
     CACHE_TTL = int(os.getenv('CACHE_TTL', '1800'))
 
+    # Optional: Football-Data.org requests allowed per minute (default 10, free tier)
+    API_RATE_LIMIT = int(os.getenv('API_RATE_LIMIT', '10'))
+
+    # Optional: Maximum concurrent API requests during a refresh (default 4)
+    FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', '4'))
+
+    # Optional: Seconds between live-match polls (default 60, 0 disables)
+    LIVE_POLL_SECONDS = int(os.getenv('LIVE_POLL_SECONDS', '60'))
+
+    # Optional: Longest time scorers and official standings go unrefreshed; normally
+    # they are fetched after matches finish (default 24)
+    STATS_MAX_AGE_HOURS = float(os.getenv('STATS_MAX_AGE_HOURS', '24'))
+
+    # Optional: Seconds between checks for resources due a refresh (default 60)
+    REFRESH_TICK_SECONDS = int(os.getenv('REFRESH_TICK_SECONDS', '60'))
+
+    # Optional: Most API requests made per refresh check (default 2)
+    REFRESH_REQUESTS_PER_TICK = int(os.getenv('REFRESH_REQUESTS_PER_TICK', '2'))
+
+    # Optional: Requests per minute the backfill CLI may use (default 4)
+    BACKFILL_RATE_LIMIT = int(os.getenv('BACKFILL_RATE_LIMIT', '4'))
+
+    # Optional: Requests per minute the backfill CLI leaves for the scheduler (default 4)
+    BACKFILL_RESERVE = int(os.getenv('BACKFILL_RESERVE', '4'))
+
+    # Optional: Run the refresh jobs inside the web app (default True); set to false
+    # when a separate `python refresher.py` process does the refreshing
+    EMBEDDED_REFRESHER = os.getenv('EMBEDDED_REFRESHER', 'True').lower() == 'true'
+
+    # Optional: Seconds a refresher keeps the leader lease without a heartbeat (default 90)
+    LEADER_LEASE_SECONDS = int(os.getenv('LEADER_LEASE_SECONDS', '90'))
+
+    # Optional: Seconds between web-side checks for new data to push to browsers (default 5)
+    DATA_WATCH_SECONDS = int(os.getenv('DATA_WATCH_SECONDS', '5'))
+
+    # Optional: Live-score streams each web process holds open; keep below GUNICORN_THREADS
+    # so page requests always find a free thread (default 24, 0 for no limit)
+    SSE_MAX_CLIENTS = int(os.getenv('SSE_MAX_CLIENTS', '24'))
+
+    # Optional: Port for the standalone refresher's /metrics endpoint (default 0, disabled)
+    REFRESHER_METRICS_PORT = int(os.getenv('REFRESHER_METRICS_PORT', '0'))
+
+    # Optional: Directory team crest images are cached in (default crest_cache)
+    CREST_CACHE_DIR = os.getenv('CREST_CACHE_DIR', 'crest_cache')
+
+    # Optional: Size the crest cache is trimmed back to, least recently used first (default 50 MB)
+    CREST_CACHE_MAX_MB = float(os.getenv('CREST_CACHE_MAX_MB', '50'))
+
+    # Optional: Pixel size raster crests are resized to for pages, when Pillow is
+    # installed (default 36, twice the 18px display size; 0 serves originals)
+    CREST_SIZE = int(os.getenv('CREST_SIZE', '36'))
+
+    # Optional: Anthropic API key; AI summaries are disabled without it
+    ANTHROPIC_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+
+    # Optional: Anthropic model used for AI summaries
+    ANTHROPIC_MODEL = os.getenv('ANTHROPIC_MODEL', 'claude-sonnet-4-20250514')
+
+    # Optional: Timeout for Anthropic API calls in seconds (default 30)
+    ANTHROPIC_TIMEOUT_SECONDS = float(os.getenv('ANTHROPIC_TIMEOUT_SECONDS', '30'))
+
+    # Optional: Generate AI summaries with a local fake model instead of Anthropic
+    # (default False), for development and testing without an API key
+    AI_SUMMARY_FAKE = os.getenv('AI_SUMMARY_FAKE', 'False').lower() == 'true'
+
     # Optional: Log level (default INFO)
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
@@ -0,0 +1,208 @@
+"""Content-addressed disk cache of team crest images, served by /crest/<team_id>."""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it crests are served at their original size
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Largest crest accepted from upstream
+MAX_CREST_BYTES = 1024 * 1024
+
+# Raster types Pillow can resize; SVG crests scale natively and are never resized
+RESIZABLE_TYPES = ('image/png', 'image/jpeg', 'image/gif', 'image/webp')
+
+
+class CrestCache:
+    """
+    Crest images stored once on disk under their SHA-256, shared by all workers.
+
+    Files live at ``<cache_dir>/<digest[:2]>/<digest>`` with resized
+    variants next to them as ``<digest>-<size>``. Serving a file refreshes
+    its modification time, so evict() removes the least recently used
+    files first once the cache outgrows ``max_bytes``.
+    """
+
+    # Serving touches a file at most this often (seconds), to keep reads cheap
+    TOUCH_INTERVAL = 3600
+
+    def __init__(self, cache_dir='crest_cache', max_bytes=50 * 1024 * 1024, sizes=(),
+                 timeout=10):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the images (created if missing);
+                relative paths are resolved against the working directory
+            max_bytes: Size the cache is trimmed back to by evict() (default: 50 MB)
+            sizes: Square pixel sizes to pre-render raster crests at (needs
+                Pillow; default: none)
+            timeout: Download timeout in seconds (default: 10)
+        """
+        # Absolute, so paths stay valid for Flask's send_file, which resolves
+        # relative paths against the app's root rather than the working directory
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self.sizes = tuple(sizes) if Image is not None else ()
+        self.timeout = timeout
+        # Plain session: the API session would send the API key to the CDN
+        self.session = requests.Session()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path_for(self, digest, size=None):
+        """Path of an image (or one of its resized variants) in the cache."""
+        name = f"{digest}-{size}" if size else digest
+        return os.path.join(self.cache_dir, digest[:2], name)
+
+    def has(self, digest):
+        """Whether the original image for a digest is on disk."""
+        return os.path.exists(self.path_for(digest))
+
+    def _write(self, path, body):
+        """Write a file atomically, so readers never see a partial image."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _resize(self, body, size):
+        """Render a raster crest to fit a size x size PNG, or None if it cannot be decoded."""
+        try:
+            with Image.open(io.BytesIO(body)) as image:
+                image.thumbnail((size, size))
+                out = io.BytesIO()
+                image.save(out, format='PNG', optimize=True)
+                return out.getvalue()
+        except Exception as e:
+            logger.warning("Error resizing crest to %spx: %s", size, e)
+            return None
+
+    def store(self, body, content_type):
+        """
+        Store an image and its resized variants under its content digest.
+
+        Args:
+            body: Image bytes
+            content_type: MIME type of the image
+
+        Returns:
+            str: Hex SHA-256 digest of the image
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        if not self.has(digest):
+            self._write(self.path_for(digest), body)
+        if content_type in RESIZABLE_TYPES:
+            for size in self.sizes:
+                path = self.path_for(digest, size)
+                if not os.path.exists(path):
+                    resized = self._resize(body, size)
+                    if resized:
+                        self._write(path, resized)
+        return digest
+
+    def download(self, url):
+        """
+        Download a crest and store it.
+
+        Args:
+            url: Upstream image URL
+
+        Returns:
+            dict: 'digest', 'content_type' and 'size', or None if the
+                  download failed or was not an image
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning("Error downloading crest %s: %s", url, e)
+            return None
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        body = response.content
+        if not content_type.startswith('image/') or len(body) > MAX_CREST_BYTES:
+            logger.warning("Skipping crest %s (%s, %s bytes)", url, content_type, len(body))
+            return None
+
+        try:
+            digest = self.store(body, content_type)
+        except OSError as e:
+            logger.error("Error storing crest %s: %s", url, e)
+            return None
+        return {'digest': digest, 'content_type': content_type, 'size': len(body)}
+
+    def open(self, digest, size=None):
+        """
+        Find an image to serve, marking it recently used.
+
+        Args:
+            digest: Content digest of the original image
+            size: Preferred resized variant (falls back to the original)
+
+        Returns:
+            str: Path of the file to serve, or None if it is not cached
+        """
+        for path in ((self.path_for(digest, size),) if size else ()) + (self.path_for(digest),):
+            try:
+                modified = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if time.time() - modified > self.TOUCH_INTERVAL:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+            return path
+        return None
+
+    def evict(self):
+        """
+        Delete least recently used files until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of files deleted
+        """
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        if removed:
+            logger.info("Evicted %s crest files, cache now %s bytes", removed, total)
+        return removed
+
+    def close(self):
+        """Close the download session."""
+        self.session.close()
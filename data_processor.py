@@ -1,7 +1,8 @@
 """Data processing and normalization for match data."""
 
 import logging
-from datetime import datetime
+from operator import attrgetter
+from models import Match, Team
 
 logger = logging.getLogger(__name__)
 
@@ -16,129 +17,116 @@ def normalize_match(match_data, competition_code=None, competition_name=None):
         competition_name: Competition name (optional, extracted from match if not provided)
 
     Returns:
-        dict: Normalized match object with standardized fields
+        Match: Normalized match object with standardized fields
     """
     try:
-        # Extract basic match information
-        status = match_data.get('status', 'SCHEDULED')
-        
-        # Extract rich team data
-        home_team_data = match_data.get('homeTeam', {})
-        away_team_data = match_data.get('awayTeam', {})
-        
-        home_team = {
-            'name': home_team_data.get('name', 'N/A'),
-            'crest': home_team_data.get('crest', '')
-        }
-        away_team = {
-            'name': away_team_data.get('name', 'N/A'),
-            'crest': away_team_data.get('crest', '')
-        }
-        
-        utc_kickoff = match_data.get('utcDate', '')
-
-        # Format score based on match status
-        score_text = _format_score(match_data, status)
-        
+        # Extract rich team data (teams can be null before a knockout draw)
+        home_team_data = match_data.get('homeTeam') or {}
+        away_team_data = match_data.get('awayTeam') or {}
+
         # Extract raw score data
-        score_data = match_data.get('score', {})
-        full_time = score_data.get('fullTime', {})
-        score = {
-            'full_time': {
-                'home': full_time.get('home'),
-                'away': full_time.get('away')
-            }
-        }
-
-        # Build normalized match object
-        normalized = {
-            'status': status,
-            'score_text': score_text,
-            'score': score,
-            'home_team': home_team,
-            'away_team': away_team,
-            'utc_kickoff': utc_kickoff,
-            'date': _format_display_date(utc_kickoff) if utc_kickoff else 'N/A'
-        }
+        score_data = match_data.get('score') or {}
+        full_time = score_data.get('fullTime') or {}
 
         # Add competition info if provided or extract from match data
-        if competition_code:
-            normalized['competition_code'] = competition_code
-        elif 'competition' in match_data:
-            normalized['competition_code'] = match_data['competition'].get('code', 'N/A')
-
-        if competition_name:
-            normalized['competition_name'] = competition_name
-        elif 'competition' in match_data:
-            normalized['competition_name'] = match_data['competition'].get('name', 'N/A')
-
-        # Format display date (e.g., "Sat, Nov 15")
-        if utc_kickoff:
-            normalized['display_date'] = _format_display_date(utc_kickoff)
-        else:
-            normalized['display_date'] = 'N/A'
-
-        # Create Google search query
-        normalized['google_query'] = f"{home_team.get('name')} vs {away_team.get('name')}"
-
-        return normalized
+        competition = match_data.get('competition') or {}
+        if not competition_code and competition:
+            competition_code = competition.get('code', 'N/A')
+        if not competition_name and competition:
+            competition_name = competition.get('name', 'N/A')
+
+        return Match(
+            match_data.get('id'),
+            match_data.get('status', 'SCHEDULED'),
+            _team(home_team_data),
+            _team(away_team_data),
+            full_time.get('home'),
+            full_time.get('away'),
+            match_data.get('utcDate') or '',
+            competition_code,
+            competition_name
+        )
 
     except Exception as e:
-        logger.warning(f"Error normalizing match data: {e}")
+        logger.warning("Error normalizing match data: %s", e)
         return None
 
 
-def _format_score(match_data, status):
-    """
-    Format the score text based on match status.
-
-    Args:
-        match_data: Raw match data from API
-        status: Match status (FINISHED, LIVE, SCHEDULED, etc.)
-
-    Returns:
-        str: Formatted score text (e.g., "2–1", "LIVE", "SCHEDULED")
+def normalize_matches(response, competition_code=None, competition_name=None):
     """
-    if status == 'FINISHED':
-        # Extract full-time score
-        score = match_data.get('score', {})
-        full_time = score.get('fullTime', {})
-        home_score = full_time.get('home')
-        away_score = full_time.get('away')
-
-        if home_score is not None and away_score is not None:
-            # Use en dash (–) for score separator
-            return f"{home_score}–{away_score}"
-        else:
-            logger.warning("Missing score data for finished match")
-            return "N/A"
-
-    elif status == 'LIVE' or status == 'IN_PLAY':
-        return "LIVE"
-
-    else:
-        # For SCHEDULED, TIMED, POSTPONED, etc.
-        return "SCHEDULED"
+    Normalize a whole API matches response in one pass.
 
-
-def _format_display_date(utc_date_str):
-    """
-    Format UTC date string to display format.
+    Produces the same Match objects as calling normalize_match() per item
+    with the same competition arguments, in kickoff order, but resolves each team once per response, skips the per-item logging
+    and error wrapping on the hot path, and sorts the batch once.
 
     Args:
-        utc_date_str: ISO 8601 date string (e.g., "2025-11-15T17:30:00Z")
+        response: Decoded JSON response containing a 'matches' list
+        competition_code: Competition code (optional, taken from the response
+            or each match if not provided)
+        competition_name: Competition name (optional, same fallback)
 
     Returns:
-        str: Formatted date (e.g., "Sat, Nov 15")
+        list: Match objects sorted by kickoff time (most recent first);
+              malformed entries are skipped
     """
-    try:
-        # Parse ISO 8601 date string
-        dt = datetime.fromisoformat(utc_date_str.replace('Z', '+00:00'))
-        # Format as "Weekday, Month Day"
-        return dt.strftime("%a, %b %d")
-    except Exception as e:
-        logger.warning(f"Error formatting date {utc_date_str}: {e}")
-        return "N/A"
+    competition = response.get('competition') or {}
+    default_code = competition_code or competition.get('code')
+    default_name = competition_name or competition.get('name') or default_code
+
+    teams = {}
+    normalized = []
+    append = normalized.append
+
+    for match_data in response.get('matches') or []:
+        try:
+            score = (match_data.get('score') or {}).get('fullTime') or {}
+            home = score.get('home')
+            away = score.get('away')
+
+            code, name = default_code, default_name
+            if not code:
+                match_competition = match_data.get('competition') or {}
+                code = match_competition.get('code', 'N/A')
+                name = match_competition.get('name', 'N/A')
+
+            append(Match(
+                match_data.get('id'),
+                match_data.get('status', 'SCHEDULED'),
+                _cached_team(teams, match_data.get('homeTeam') or {}),
+                _cached_team(teams, match_data.get('awayTeam') or {}),
+                None if home is None else int(home),
+                None if away is None else int(away),
+                match_data.get('utcDate') or '',
+                code,
+                name
+            ))
+        except Exception as e:
+            logger.warning("Error normalizing match data: %s", e)
+
+    # ISO 8601 UTC strings sort chronologically, so a C-level key is enough
+    normalized.sort(key=attrgetter('utc_kickoff'), reverse=True)
+    return normalized
+
+
+def _cached_team(teams, team_data):
+    """Get the shared Team for an API team object, memoized per response by id."""
+    key = team_data.get('id')
+    team = teams.get(key) if key is not None else None
+    if team is None:
+        team = _team(team_data)
+        if key is not None:
+            teams[key] = team
+    return team
+
+
+def _team(team_data):
+    """Get the shared Team for an API team object."""
+    return Team.get(
+        team_data.get('id'),
+        team_data.get('name') or 'N/A',
+        team_data.get('crest') or ''
+    )
 
 
 def group_by_competition(matches):
@@ -158,7 +146,7 @@ def group_by_competition(matches):
         if not match:
             continue
 
-        comp_code = match.get('competition_code')
+        comp_code = match.competition_code
         if not comp_code:
             logger.warning("Match missing competition_code, skipping")
             continue
@@ -171,10 +159,8 @@ def group_by_competition(matches):
     # Sort matches within each competition
     # Priority: 
     # 1. Kickoff time (Newest first)
+    # ISO 8601 UTC strings sort chronologically, so a C-level key is enough
     for comp_code in grouped:
-        grouped[comp_code].sort(
-            key=lambda m: m.get('utc_kickoff', ''),
-            reverse=True
-        )
+        grouped[comp_code].sort(key=attrgetter('utc_kickoff'), reverse=True)
 
     return grouped
@@ -1,14 +1,30 @@
 """Data service orchestrating API calls and database storage."""
 
+import hashlib
+import json
 import logging
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from football_api import FootballAPIClient
+from rate_limiter import TokenBucket
+from event_hub import EventHub
 from db_manager import DatabaseManager
-from data_processor import normalize_match
+from data_processor import normalize_matches
+from refresh_plan import parse_utc, plan_refreshes
+from standings import sort_orders
+from metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+REFRESH_SECONDS = REGISTRY.histogram(
+    'refresh_phase_seconds', 'Duration of refresh phases (fetch, store, publish, total)', ('phase',)
+)
+REFRESH_RUNS = REGISTRY.counter('refresh_runs_total', 'Refresh runs by outcome', ('result',))
+DATA_VERSION = REGISTRY.gauge('data_version', 'Current data generation')
+SSE_SUBSCRIBERS = REGISTRY.gauge('sse_subscribers', 'Connected Server-Sent Events clients')
+
 
 class MatchDataService:
     """Service layer that coordinates API client, data processing, and database storage."""
@@ -16,110 +32,511 @@ class MatchDataService:
     # Competition codes for the 6 supported competitions
     COMPETITION_CODES = ["PL", "PD", "BL1", "SA", "FL1", "CL"]
 
-    def __init__(self, api_key):
+    # Look-back window for recent matches (7 days)
+    RECENT_HOURS = 168
+
+    # Upcoming fixtures fetched along with recent matches; they drive the refresh plan
+    AHEAD_HOURS = 72
+
+    # Resources fetched per competition
+    RESOURCES = ('matches', 'scorers', 'standings')
+
+    # Wait before retrying a resource whose fetch failed
+    RETRY_AFTER = timedelta(minutes=5)
+
+    def __init__(self, api_key, requests_per_minute=10, max_workers=4,
+                 stats_max_age_hours=24, base_url=None, crest_cache=None,
+                 max_sse_clients=None):
         """
         Initialize the data service.
 
         Args:
             api_key: API key for Football-Data.org
+            requests_per_minute: API quota used to size the rate limiter (default: 10)
+            max_workers: Maximum concurrent API requests (default: 4)
+            stats_max_age_hours: Longest time scorers and official standings
+                go unrefreshed; normally they are fetched after matches
+                finish (default: 24)
+            base_url: Football-Data.org API root (default: the public API)
+            crest_cache: CrestCache that refreshes download team crests into
+                (default: none, pages link crests upstream)
+            max_sse_clients: Most live-update streams held open at once
+                (default: no limit)
         """
-        self.api_client = FootballAPIClient(api_key)
+        self.rate_limiter = TokenBucket(per_minute=requests_per_minute)
+        self.api_client = FootballAPIClient(
+            api_key,
+            rate_limiter=self.rate_limiter,
+            base_url=base_url,
+            pool_size=max_workers
+        )
         self.db = DatabaseManager()
+        self.crest_cache = crest_cache
+        self.max_workers = max_workers
+        self.stats_max_age = timedelta(hours=stats_max_age_hours)
+        # (resource, competition_code) -> UTC datetime of the last failed fetch
+        self._failed_at = {}
+        # (resource, competition_code) -> hash of the last stored payload
+        self._payload_hashes = {}
+        # Hashes staged in the current refresh session, applied after commit
+        self._pending_hashes = {}
+        # Pushes score/status diffs to connected browsers
+        self.event_hub = EventHub(max_subscribers=max_sse_clients)
+        # match id -> last published {status, score_text}; diffs are computed against it
+        self._published_states = self._match_states()
+        self._publish_lock = threading.Lock()
+        # Data version the published states were last compared at
+        self._seen_version = self.data_version
+        # In-memory copy of everything the page and JSON API serve
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        # Timing of the most recent refresh (wall, throttled and fetching seconds)
+        self.last_refresh_stats = None
+        DATA_VERSION.set_function(lambda: self.data_version)
+        SSE_SUBSCRIBERS.set_function(lambda: self.event_hub.subscriber_count)
         logger.info("MatchDataService initialized with SQLite storage")
 
-    def refresh_data(self):
+    @property
+    def data_version(self):
+        """Data generation, bumped by every refresh that changed something."""
+        return self.db.get_data_version()
+
+    def refresh_data(self, targets=None, progressive=False):
         """
         Fetch fresh data from API and update the database.
         
-        This method fetches matches, scorers, and standings for all competitions
-        and stores them in the SQLite database.
+        This method fetches matches, scorers and standings (all of them, or
+        just the given targets) and stores them in the SQLite database.
+        Between official standings fetches, each table is updated from the
+        stored results that changed. Requests are dispatched
+        concurrently and paced by the shared token bucket, so the cycle only
+        waits when the per-minute quota is spent. All writes are committed
+        together once every fetch has finished, so readers never see a mix
+        of old and new data.
+
+        Args:
+            targets: Optional list of (resource, competition_code) pairs to
+                fetch (default: every resource of every competition)
+            progressive: Commit each response as soon as it arrives instead
+                (used for the initial fetch into an empty database, so the
+                page fills in competition by competition)
         
         Returns:
             bool: True if refresh was successful (at least partially), False otherwise
         """
         logger.info("Starting data refresh cycle...")
-        
+        started = time.monotonic()
+        self.api_client.reset_stats()
+
+        fetchers = {
+            'matches': lambda code: self.api_client.fetch_recent_matches(
+                code, hours=self.RECENT_HOURS, ahead_hours=self.AHEAD_HOURS
+            ),
+            'scorers': self.api_client.fetch_top_scorers,
+            'standings': self.api_client.fetch_standings,
+        }
+        if targets is None:
+            # Matches first so they land first when the quota is tight
+            targets = [
+                (resource, comp_code)
+                for resource in self.RESOURCES
+                for comp_code in self.COMPETITION_CODES
+            ]
+
         successful_fetches = 0
+        changed = 0
+        responses = []
 
-        # 1. Fetch Matches
-        for comp_code in self.COMPETITION_CODES:
-            try:
-                # Fetch recent matches (last 7 days = 168 hours)
-                response = self.api_client.fetch_recent_matches(comp_code, hours=168)
-                time.sleep(7) # Rate limit
-
-                if response:
-                    matches = response.get('matches', [])
-                    normalized_matches = []
-                    
-                    for match_data in matches:
-                        normalized = normalize_match(
-                            match_data,
-                            competition_code=comp_code,
-                            competition_name=response.get('competition', {}).get('name', comp_code)
-                        )
-                        if normalized:
-                            normalized_matches.append(normalized)
-                    
-                    self.db.save_matches(comp_code, normalized_matches)
+        fetch_timer = REFRESH_SECONDS.labels('fetch').time()
+        with fetch_timer, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(fetchers[resource], comp_code): (resource, comp_code)
+                for resource, comp_code in targets
+            }
+
+            for future in as_completed(futures) if progressive else futures:
+                resource, comp_code = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.error("Error fetching %s for %s: %s", resource, comp_code, e)
+                    response = None
+                if not response:
+                    self._failed_at[(resource, comp_code)] = datetime.utcnow()
+                    continue
+                self._failed_at.pop((resource, comp_code), None)
+                if progressive:
+                    stored, stored_changed = self._store_responses([(resource, comp_code, response)])
+                    successful_fetches += stored
+                    changed += stored_changed
+                else:
+                    responses.append((resource, comp_code, response))
+
+        if not progressive:
+            with REFRESH_SECONDS.labels('store').time():
+                successful_fetches, changed = self._store_responses(responses)
+
+        stats = self.api_client.reset_stats()
+        stats['wall_seconds'] = time.monotonic() - started
+        self.last_refresh_stats = stats
+        REFRESH_SECONDS.labels('total').observe(stats['wall_seconds'])
+        logger.info(
+            "Refresh took %.1fs for %s requests (throttled %.1fs, fetching %.1fs), "
+            "%s datasets changed",
+            stats['wall_seconds'], stats['requests'], stats['throttled_seconds'],
+            stats['fetch_seconds'], changed
+        )
+
+        if successful_fetches == 0:
+            logger.error("Failed to fetch any data")
+            REFRESH_RUNS.labels('failed').inc()
+            return False
+
+        REFRESH_RUNS.labels('ok').inc()
+        if changed:
+            with REFRESH_SECONDS.labels('publish').time():
+                self.publish_changes()
+        self.sync_crests()
+        logger.info("Data refresh cycle completed (data version %s)", self.data_version)
+        return True
+
+    def sync_crests(self):
+        """
+        Download the crests of teams not cached yet, or whose crest URL changed.
+
+        Each image is downloaded once; pages then link the local copy. Failed
+        downloads are retried after RETRY_AFTER.
+
+        Returns:
+            int: Number of crests stored
+        """
+        if self.crest_cache is None:
+            return 0
+
+        now = datetime.utcnow()
+        cached = self.db.get_crests()
+        pending = []
+        for team_id, url in self.db.get_team_crest_urls().items():
+            crest = cached.get(team_id)
+            if crest and crest['source_url'] == url and self.crest_cache.has(crest['digest']):
+                continue
+            failed_at = self._failed_at.get(('crest', team_id))
+            if failed_at and now - failed_at < self.RETRY_AFTER:
+                continue
+            pending.append((team_id, url))
+        if not pending:
+            return 0
+
+        logger.info("Downloading %s team crests", len(pending))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            downloads = list(zip(pending, executor.map(
+                lambda item: self.crest_cache.download(item[1]), pending
+            )))
+
+        stored = 0
+        try:
+            with self.db.refresh_session() as session:
+                for (team_id, url), crest in downloads:
+                    if crest is None:
+                        self._failed_at[('crest', team_id)] = now
+                        continue
+                    self._failed_at.pop(('crest', team_id), None)
+                    session.save_crest(team_id, url, crest)
+                    stored += 1
+        except Exception as e:
+            logger.error("Error saving crests: %s", e)
+            return 0
+
+        self.crest_cache.evict()
+        return stored
+
+    def _store_responses(self, responses):
+        """
+        Store fetched responses, in order, in one transaction.
+
+        A response that fails to store is rolled back on its own and the
+        others are still committed.
+
+        Args:
+            responses: List of (resource, competition_code, response) tuples
+
+        Returns:
+            tuple: (responses stored, datasets changed); both 0 if the
+                   commit failed
+        """
+        savers = {
+            'matches': self._save_matches_response,
+            'scorers': self._save_scorers_response,
+            'standings': self._save_standings_response,
+        }
+        successful_fetches = 0
+        changed = 0
+        fetched_at = f"{datetime.utcnow():%Y-%m-%dT%H:%M:%SZ}"
+
+        self._pending_hashes = {}
+        try:
+            with self.db.refresh_session() as session:
+                for resource, comp_code, response in responses:
+                    try:
+                        # A failed dataset is rolled back on its own, not committed half-written
+                        with session.savepoint():
+                            dataset_changed = savers[resource](session, comp_code, response)
+                            session.save_fetch_time(resource, comp_code, fetched_at)
+                    except Exception as e:
+                        self._pending_hashes.pop((resource, comp_code), None)
+                        logger.error("Error updating %s for %s: %s", resource, comp_code, e)
+                        continue
+                    changed += bool(dataset_changed)
                     successful_fetches += 1
-                    logger.info(f"Updated matches for {comp_code}: {len(normalized_matches)} matches")
-                
-            except Exception as e:
-                logger.error(f"Error updating matches for {comp_code}: {e}")
+                changed += self._update_standings(session)
+            self._payload_hashes.update(self._pending_hashes)
+        except Exception as e:
+            logger.error("Error committing refresh: %s", e)
+            return 0, 0
+        return successful_fetches, changed
 
-        # 2. Fetch Top Scorers
-        for comp_code in self.COMPETITION_CODES:
-            try:
-                scorers_data = self.api_client.fetch_top_scorers(comp_code)
-                if scorers_data:
-                    scorers = scorers_data.get('scorers', [])
-                    self.db.save_scorers(comp_code, scorers)
-                    logger.info(f"Updated scorers for {comp_code}")
-                time.sleep(7) # Rate limit
-            except Exception as e:
-                logger.error(f"Error updating scorers for {comp_code}: {e}")
+    def poll_live_matches(self):
+        """
+        Refresh only the matches that are live or about to kick off.
+
+        Costs a single API request when something is active and none at all
+        otherwise, so it can run on a short interval between full refreshes.
+
+        Returns:
+            int: Number of matches whose status or score changed
+        """
+        match_ids = self.db.get_active_match_ids(datetime.utcnow())
+        if not match_ids:
+            logger.debug("No live or imminent matches, skipping live poll")
+            return 0
+
+        response = self.api_client.fetch_matches_by_id(match_ids)
+        if not response:
+            return 0
+
+        with self.db.refresh_session() as session:
+            updated = session.update_match_states(normalize_matches(response))
+            if updated:
+                self._update_standings(session)
+
+        logger.info("Live poll of %s matches: %s updated", len(match_ids), updated)
+        if updated:
+            self.publish_changes()
+        return updated
+
+    def refresh_due(self, max_requests=2, now=None):
+        """
+        Fetch the resources that the fixture calendar says are due.
 
-        # 3. Fetch Standings
+        Matches are refetched every few minutes around kickoffs, hourly on
+        matchdays and rarely otherwise; scorers and standings once after
+        matches finish. At most max_requests are made per call, most overdue
+        first, so calling this on a short interval spreads requests evenly
+        instead of bursting.
+
+        Args:
+            max_requests: Most API requests to make in this call (default: 2)
+            now: Current UTC datetime (default: now)
+
+        Returns:
+            bool: True if anything was fetched and stored
+        """
+        now = now or datetime.utcnow()
+        due = [
+            (resource, comp_code)
+            for due_at, resource, comp_code in self.plan_refreshes(now)
+            if due_at <= now
+            and now - self._failed_at.get((resource, comp_code), datetime.min) >= self.RETRY_AFTER
+        ][:max_requests]
+        if not due:
+            return False
+
+        logger.info("Refreshing due resources: %s", ', '.join(f'{r}/{c}' for r, c in due))
+        return self.refresh_data(targets=due)
+
+    def plan_refreshes(self, now):
+        """
+        Get when each resource of each competition is next due.
+
+        Returns:
+            list: (due_at, resource, competition_code) tuples, soonest first
+        """
+        calendar = {
+            code: {
+                'live': fixtures['live'],
+                'next_kickoff': parse_utc(fixtures['next_kickoff']),
+                'last_kickoff': parse_utc(fixtures['last_kickoff']),
+                'last_finished_kickoff': parse_utc(fixtures['last_finished_kickoff'])
+            }
+            for code, fixtures in self.db.get_fixture_calendar(now).items()
+        }
+        fetched = {
+            key: parse_utc(value)
+            for key, value in self.db.get_fetch_times().items()
+        }
+        return plan_refreshes(
+            self.COMPETITION_CODES, self.RESOURCES, calendar, fetched, now, self.stats_max_age
+        )
+
+    def _update_standings(self, session):
+        """
+        Stage standings updates from results that changed since the last update.
+
+        Returns:
+            int: Number of tables that changed
+        """
+        updated = 0
         for comp_code in self.COMPETITION_CODES:
             try:
-                standings_data = self.api_client.fetch_standings(comp_code)
-                if standings_data:
-                    standings_list = standings_data.get('standings', [])
-                    total_table = next((s for s in standings_list if s.get('type') == 'TOTAL'), None)
-                    if total_table:
-                        table_data = total_table.get('table', [])
-                        self.db.save_standings(comp_code, table_data)
-                        logger.info(f"Updated standings for {comp_code}")
-                time.sleep(7) # Rate limit
+                applied = session.update_standings(comp_code)
             except Exception as e:
-                logger.error(f"Error updating standings for {comp_code}: {e}")
+                logger.error("Error updating standings for %s: %s", comp_code, e)
+                continue
+            if applied:
+                logger.info("Applied %s results to %s standings", applied, comp_code)
+                updated += 1
+        return updated
 
-        if successful_fetches == 0:
-            logger.error("Failed to fetch match data from any competition")
+    def _match_states(self):
+        """Map each recent match id to the fields browsers patch in place."""
+        return {
+            match.id: {
+                'id': match.id,
+                'status': match.status,
+                'score_text': match.score_text
+            }
+            for matches in self.get_matches().values()
+            for match in matches
+        }
+
+    def publish_changes(self):
+        """
+        Push per-match score/status diffs since the last publish to SSE clients.
+
+        The diff is computed once here and the same message is fanned out to
+        every connected client.
+        """
+        with self._publish_lock:
+            states = self._match_states()
+            changed = [
+                state for match_id, state in states.items()
+                if self._published_states.get(match_id) != state
+            ]
+            self._published_states = states
+
+        if changed:
+            logger.info(
+                "Publishing %s match updates to %s clients",
+                len(changed), self.event_hub.subscriber_count
+            )
+            version = self.data_version
+            self.event_hub.publish('scores', {'version': version, 'matches': changed}, event_id=version)
+
+    def publish_if_changed(self):
+        """
+        Publish diffs if the data version moved since the last check.
+
+        Lets web workers that do not refresh themselves notice commits made
+        by the refresher process and push them to their own SSE clients.
+
+        Returns:
+            bool: True if the data version changed
+        """
+        version = self.data_version
+        if version == self._seen_version:
+            return False
+        self._seen_version = version
+        self.publish_changes()
+        return True
+
+    @staticmethod
+    def _hash_payload(payload):
+        """Return a stable content hash for a decoded JSON payload."""
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _is_unchanged(self, resource, comp_code, payload_hash):
+        """Check a payload hash against the last one stored for this resource."""
+        key = (resource, comp_code)
+        if key not in self._payload_hashes:
+            self._payload_hashes[key] = self.db.get_payload_hash(resource, comp_code)
+        if self._payload_hashes[key] == payload_hash:
+            logger.info("%s for %s unchanged, skipping update", resource.capitalize(), comp_code)
+            return True
+        return False
+
+    def _remember_hash(self, session, resource, comp_code, payload_hash):
+        """Stage the hash of a payload that has just been written."""
+        self._pending_hashes[(resource, comp_code)] = payload_hash
+        session.save_payload_hash(resource, comp_code, payload_hash)
+
+    def _save_matches_response(self, session, comp_code, response):
+        """Normalize and stage a matches response. Returns True if data changed."""
+        matches = response.get('matches', [])
+        payload_hash = self._hash_payload(matches)
+        if self._is_unchanged('matches', comp_code, payload_hash):
             return False
 
-        logger.info("Data refresh cycle completed")
+        normalized_matches = normalize_matches(
+            response,
+            competition_code=comp_code,
+            competition_name=response.get('competition', {}).get('name', comp_code)
+        )
+
+        session.save_matches(comp_code, normalized_matches)
+        self._remember_hash(session, 'matches', comp_code, payload_hash)
+        logger.info("Updated matches for %s: %s matches", comp_code, len(normalized_matches))
+        return True
+
+    def _save_scorers_response(self, session, comp_code, response):
+        """Stage a top scorers response. Returns True if data changed."""
+        scorers = response.get('scorers', [])
+        payload_hash = self._hash_payload(scorers)
+        if self._is_unchanged('scorers', comp_code, payload_hash):
+            return False
+
+        session.save_scorers(comp_code, scorers)
+        self._remember_hash(session, 'scorers', comp_code, payload_hash)
+        logger.info("Updated scorers for %s", comp_code)
+        return True
+
+    def _save_standings_response(self, session, comp_code, response):
+        """Stage the TOTAL table from a standings response. Returns True if data changed."""
+        standings_list = response.get('standings', [])
+        total_table = next((s for s in standings_list if s.get('type') == 'TOTAL'), None)
+        if not total_table:
+            return False
+        table_data = total_table.get('table', [])
+        payload_hash = self._hash_payload(table_data)
+        if self._is_unchanged('standings', comp_code, payload_hash):
+            return False
+
+        season = response.get('season') or {}
+        bounds = None
+        if season.get('startDate') and season.get('endDate'):
+            bounds = (season['startDate'], season['endDate'])
+        session.save_standings(comp_code, table_data, season=bounds)
+        self._remember_hash(session, 'standings', comp_code, payload_hash)
+        logger.info("Updated standings for %s", comp_code)
         return True
 
     def get_matches(self):
         """
-        Get match data from database.
+        Get recent match data from database.
+
+        Only matches inside the same window that refresh_data() fetches are
+        returned, so older history stored in the table does not leak onto the page.
 
         Returns:
-            dict: Matches grouped by competition code
+            dict: Matches grouped by competition code, newest first
         """
-        matches_by_comp = self.db.get_all_matches()
-        
-        # Sort matches for each competition by utc_kickoff descending (newest first)
-        for comp_code, matches in matches_by_comp.items():
-            if matches:
-                matches.sort(
-                    key=lambda m: m.get('utc_kickoff', ''),
-                    reverse=True
-                )
-            
-        return matches_by_comp
+        now = datetime.utcnow()
+        since = (now - timedelta(hours=self.RECENT_HOURS)).strftime("%Y-%m-%d")
+        until = (now + timedelta(days=1)).strftime("%Y-%m-%d")
+        matches_by_comp = self.db.get_all_matches(since=since, until=until)
+
+        # Every competition gets an entry so its tab, scorers and table still render
+        return {code: matches_by_comp.get(code, []) for code in self.COMPETITION_CODES}
 
     def get_scorers(self):
         """
@@ -138,3 +555,49 @@ class MatchDataService:
             dict: Standings grouped by competition code
         """
         return self.db.get_all_standings()
+
+    def get_snapshot(self):
+        """
+        Get an in-memory snapshot of matches, scorers, standings and crests.
+
+        The snapshot is loaded from the database once per data version (and
+        once per day, so the recent-matches window keeps sliding) and shared
+        by every reader until the next change.
+
+        Returns:
+            dict: 'key', 'version', 'matches', 'scorers', 'standings',
+                  'standings_orders' (competition code -> column sort orders,
+                  see standings.sort_orders), 'crests' (team id -> cached
+                  crest, see DatabaseManager.get_crests), 'summary_html'
+                  (rendered AI summary or None) and 'summary_digest' (hash
+                  of the results digest the summary covers, or None)
+        """
+        day = f"{datetime.utcnow():%Y%m%d}"
+        key = f"{self.data_version}.{day}"
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot['key'] == key:
+            return snapshot
+
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot['key'] != key:
+                # One read transaction, so a refresh committing meanwhile cannot
+                # mix old and new data under the new version's key
+                with self.db.read_session():
+                    version = self.data_version
+                    standings = self.get_standings()
+                    snapshot = {
+                        'key': f"{version}.{day}",
+                        'version': version,
+                        'matches': self.get_matches(),
+                        'scorers': self.get_scorers(),
+                        'standings': standings,
+                        'standings_orders': {
+                            code: sort_orders(table) for code, table in standings.items()
+                        },
+                        'crests': self.db.get_crests(),
+                        'summary_html': self.db.get_summary_html(),
+                        'summary_digest': self.db.get_summary_digest()
+                    }
+                self._snapshot = snapshot
+        return snapshot
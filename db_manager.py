@@ -1,67 +1,365 @@
 import sqlite3
 import json
+import hashlib
 import logging
-from datetime import datetime
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from models import Match
+from standings import DELTA_FIELDS, add_result, rank_key
+from markdown_render import RENDERER_VERSION, render_markdown
+from refresh_plan import FULL_TIME
+from metrics import REGISTRY, timed
 
 logger = logging.getLogger(__name__)
 
+DB_SECONDS = REGISTRY.histogram(
+    'db_operation_seconds', 'Time spent in database helpers', ('operation',)
+)
+DB_CONNECTIONS_OPENED = REGISTRY.counter(
+    'db_connections_opened_total', 'SQLite connections opened because the pool was empty'
+)
+
+# Statuses that mean a match is currently being played
+LIVE_STATUSES = ('IN_PLAY', 'PAUSED', 'LIVE')
+
+# Statuses whose score counts towards derived standings ("as it stands" while live)
+COUNTED_STATUSES = ('FINISHED',) + LIVE_STATUSES
+
+# Columns selected for every match query (teams joined in for name/crest)
+MATCH_SELECT = """
+    SELECT m.id, m.competition_code, m.competition_name, m.status, m.utc_kickoff,
+           m.home_team_id, ht.name, ht.crest,
+           m.away_team_id, at.name, at.crest,
+           m.home_score, m.away_score
+    FROM matches m
+    LEFT JOIN teams ht ON ht.id = m.home_team_id
+    LEFT JOIN teams at ON at.id = m.away_team_id
+"""
+
+
 class DatabaseManager:
     """Manages SQLite database connections and operations."""
 
-    def __init__(self, db_path="football_data.db"):
+    # Blob tables from the original one-row-per-competition schema
+    LEGACY_TABLES = ('matches', 'scorers', 'standings')
+
+    # Milliseconds a connection waits for another writer before failing
+    BUSY_TIMEOUT_PRAGMA = "PRAGMA busy_timeout=5000"
+
+    # Pragmas applied to every pooled connection
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",      # readers never block on the refresh writer
+        "PRAGMA synchronous=NORMAL",    # durable at checkpoints, safe with WAL
+        "PRAGMA cache_size=-8000",      # 8 MB page cache per connection
+        "PRAGMA mmap_size=67108864",    # 64 MB memory-mapped reads
+        "PRAGMA temp_store=MEMORY",
+        BUSY_TIMEOUT_PRAGMA,
+    )
+
+    # Prepared statements kept per connection
+    STATEMENT_CACHE_SIZE = 256
+
+    # How long init_db waits for another process's schema setup or migration (ms)
+    INIT_BUSY_TIMEOUT_MS = 120000
+
+    def __init__(self, db_path="football_data.db", pool_size=8):
         self.db_path = db_path
+        # Idle connections; more are opened under bursts but only pool_size are kept
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        # Connection pinned to the current thread by read_session()
+        self._local = threading.local()
         self.init_db()
 
+    def _connect(self):
+        """Open a new tuned connection that may be shared between threads."""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
     def get_connection(self):
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path)
+        """
+        Borrow a pooled database connection.
+
+        The transaction is committed when the block exits normally and
+        rolled back on error; the connection then goes back to the pool.
+        Inside read_session() the session's connection is handed out instead,
+        so every read sees the same transaction.
+        """
+        pinned = getattr(self._local, 'conn', None)
+        if pinned is not None:
+            yield pinned
+            return
+
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+            DB_CONNECTIONS_OPENED.inc()
+
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def read_session(self):
+        """
+        Run every read in the block inside one read transaction.
+
+        All get_* calls made by this thread in the block use one connection
+        and see the database as of the first read, so a refresh committing
+        meanwhile cannot produce a mix of old and new data.
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield
+            return
+        with self.get_connection() as conn:
+            conn.execute("BEGIN")
+            self._local.conn = conn
+            try:
+                yield
+            finally:
+                self._local.conn = None
+
+    def close(self):
+        """Close all idle pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
 
     def init_db(self):
-        """Initialize database tables if they don't exist."""
+        """
+        Initialize database tables if they don't exist, migrating legacy blob tables.
+
+        Schema changes and the migration run in one write transaction, so a
+        failed migration leaves the database untouched and is retried on the
+        next start, and concurrent workers starting together run it once.
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                
-                # Matches table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS matches (
-                        competition_code TEXT PRIMARY KEY,
-                        data_json TEXT,
-                        updated_at TIMESTAMP
-                    )
-                """)
+                cursor.execute(f"PRAGMA busy_timeout={self.INIT_BUSY_TIMEOUT_MS}")
+                try:
+                    # DDL does not open a transaction by itself: take the write lock up front
+                    cursor.execute("BEGIN IMMEDIATE")
 
-                # Scorers table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS scorers (
-                        competition_code TEXT PRIMARY KEY,
-                        data_json TEXT,
-                        updated_at TIMESTAMP
-                    )
-                """)
+                    legacy = self._rename_legacy_tables(cursor)
 
-                # Standings table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS standings (
-                        competition_code TEXT PRIMARY KEY,
-                        data_json TEXT,
-                        updated_at TIMESTAMP
-                    )
-                """)
+                    # Teams table (shared by matches, standings and scorers)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS teams (
+                            id INTEGER PRIMARY KEY,
+                            name TEXT,
+                            short_name TEXT,
+                            tla TEXT,
+                            crest TEXT,
+                            updated_at TIMESTAMP
+                        )
+                    """)
 
-                # App Metadata table (for AI summary, etc.)
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS app_metadata (
-                        key TEXT PRIMARY KEY,
-                        value TEXT,
-                        updated_at TIMESTAMP
-                    )
-                """)
-                
-                conn.commit()
+                    # Matches table, one row per API match
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS matches (
+                            id INTEGER PRIMARY KEY,
+                            competition_code TEXT NOT NULL,
+                            competition_name TEXT,
+                            status TEXT,
+                            utc_kickoff TEXT,
+                            home_team_id INTEGER REFERENCES teams(id),
+                            away_team_id INTEGER REFERENCES teams(id),
+                            home_score INTEGER,
+                            away_score INTEGER,
+                            updated_at TIMESTAMP
+                        )
+                    """)
+                    cursor.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_matches_competition_kickoff
+                        ON matches (competition_code, utc_kickoff)
+                    """)
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_kickoff ON matches (utc_kickoff)")
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_status ON matches (status)")
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_home_team ON matches (home_team_id)")
+                    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_away_team ON matches (away_team_id)")
+
+                    # Scorers table, one row per player per competition
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS scorers (
+                            competition_code TEXT NOT NULL,
+                            player_id INTEGER NOT NULL,
+                            rank INTEGER,
+                            player_name TEXT,
+                            nationality TEXT,
+                            team_id INTEGER REFERENCES teams(id),
+                            played_matches INTEGER,
+                            goals INTEGER,
+                            assists INTEGER,
+                            penalties INTEGER,
+                            updated_at TIMESTAMP,
+                            PRIMARY KEY (competition_code, player_id)
+                        )
+                    """)
+
+                    # Standings table, one row per team per competition (TOTAL table)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS standings (
+                            competition_code TEXT NOT NULL,
+                            team_id INTEGER NOT NULL REFERENCES teams(id),
+                            position INTEGER,
+                            played_games INTEGER,
+                            form TEXT,
+                            won INTEGER,
+                            draw INTEGER,
+                            lost INTEGER,
+                            points INTEGER,
+                            goals_for INTEGER,
+                            goals_against INTEGER,
+                            goal_difference INTEGER,
+                            updated_at TIMESTAMP,
+                            PRIMARY KEY (competition_code, team_id)
+                        )
+                    """)
+
+                    # Match results already reflected in each standings table
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS standings_results (
+                            match_id INTEGER PRIMARY KEY,
+                            competition_code TEXT NOT NULL,
+                            home_team_id INTEGER,
+                            away_team_id INTEGER,
+                            home_score INTEGER,
+                            away_score INTEGER
+                        )
+                    """)
+                    cursor.execute("""
+                        CREATE INDEX IF NOT EXISTS idx_standings_results_competition
+                        ON standings_results (competition_code)
+                    """)
+
+                    # Named leases (e.g. which process runs the refresh jobs)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS leases (
+                            name TEXT PRIMARY KEY,
+                            holder TEXT NOT NULL,
+                            expires_at REAL NOT NULL
+                        )
+                    """)
+
+                    # Cached crest images by team (files live in the CrestCache directory)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS crests (
+                            team_id INTEGER PRIMARY KEY REFERENCES teams(id),
+                            source_url TEXT NOT NULL,
+                            digest TEXT NOT NULL,
+                            content_type TEXT NOT NULL,
+                            size INTEGER,
+                            fetched_at TIMESTAMP
+                        )
+                    """)
+
+                    # App Metadata table (for AI summary, etc.)
+                    cursor.execute("""
+                        CREATE TABLE IF NOT EXISTS app_metadata (
+                            key TEXT PRIMARY KEY,
+                            value TEXT,
+                            updated_at TIMESTAMP
+                        )
+                    """)
+
+                    if legacy:
+                        self._migrate_legacy_tables(cursor, legacy)
+
+                    conn.commit()
+                finally:
+                    # Back to the normal busy timeout for the pooled connection
+                    cursor.execute(self.BUSY_TIMEOUT_PRAGMA)
                 logger.info("Database initialized successfully")
         except Exception as e:
-            logger.error(f"Error initializing database: {e}")
+            logger.error("Error initializing database: %s", e)
+
+    def _rename_legacy_tables(self, cursor):
+        """
+        Move blob-per-competition tables out of the way.
+
+        legacy_* tables left behind by an interrupted migration (made before
+        the migration ran in one transaction) are picked up again.
+
+        Returns:
+            list: Names of the legacy tables to migrate
+        """
+        renamed = []
+        for table in self.LEGACY_TABLES:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (f"legacy_{table}",)
+            )
+            if cursor.fetchone():
+                renamed.append(table)
+                continue
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'data_json' in columns:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO legacy_{table}")
+                renamed.append(table)
+        return renamed
+
+    def _migrate_legacy_tables(self, cursor, legacy):
+        """Copy rows from renamed blob tables into the relational schema, then drop them."""
+        logger.info("Migrating legacy blob tables: %s", ', '.join(legacy))
+
+        # Standings and scorers first: they carry team ids that matches lack
+        for table, write in (('standings', self._write_standings), ('scorers', self._write_scorers)):
+            if table in legacy:
+                cursor.execute(f"SELECT competition_code, data_json FROM legacy_{table}")
+                for code, data_json in cursor.fetchall():
+                    write(cursor, code, json.loads(data_json or '[]'))
+
+        if 'matches' in legacy:
+            cursor.execute("SELECT competition_code, data_json FROM legacy_matches")
+            for code, data_json in cursor.fetchall():
+                matches = json.loads(data_json or '[]')
+                for match in matches:
+                    self._fill_legacy_ids(cursor, match)
+                self._write_matches(cursor, code, [Match.from_dict(m) for m in matches])
+                # Migrated standings already include these results
+                self._reset_standings_baseline(cursor, code)
+
+        for table in legacy:
+            cursor.execute(f"DROP TABLE legacy_{table}")
+
+        # Force the next refresh to rewrite everything with real API ids
+        cursor.execute("DELETE FROM app_metadata WHERE key LIKE 'payload_hash:%'")
+        logger.info("Legacy migration complete")
+
+    def _fill_legacy_ids(self, cursor, match):
+        """Assign team and match ids to a legacy match that was stored without them."""
+        for side in ('home_team', 'away_team'):
+            team = match.setdefault(side, {})
+            if team.get('id') is None:
+                cursor.execute("SELECT id FROM teams WHERE name = ?", (team.get('name'),))
+                row = cursor.fetchone()
+                team['id'] = row[0] if row else _legacy_id(team.get('name'))
+        if match.get('id') is None:
+            # Negative ids never collide with API ids and are replaced on the next refresh
+            match['id'] = _legacy_id(
+                match.get('competition_code'),
+                match.get('utc_kickoff'),
+                match['home_team'].get('name'),
+                match['away_team'].get('name')
+            )
 
     def is_empty(self):
         """Check if the database has any match data."""
@@ -72,108 +370,725 @@ class DatabaseManager:
                 count = cursor.fetchone()[0]
                 return count == 0
         except Exception as e:
-            logger.error(f"Error checking if DB is empty: {e}")
+            logger.error("Error checking if DB is empty: %s", e)
             return True
 
     def save_matches(self, competition_code, data):
         """Save match data for a competition."""
-        self._save_data('matches', competition_code, data)
+        self._write('matches', competition_code, self._write_matches, data)
 
     def get_matches(self, competition_code):
         """Get match data for a competition."""
-        return self._get_data('matches', competition_code)
+        return self._query_matches("WHERE m.competition_code = ?", (competition_code,))
+
+    def get_all_matches(self, since=None, until=None):
+        """
+        Get all matches grouped by competition, newest first.
 
-    def get_all_matches(self):
-        """Get all matches grouped by competition."""
-        return self._get_all_data('matches')
+        Args:
+            since: Optional ISO 8601 lower bound on kickoff (inclusive)
+            until: Optional ISO 8601 upper bound on kickoff (exclusive)
+        """
+        clauses, params = [], []
+        if since:
+            clauses.append("m.utc_kickoff >= ?")
+            params.append(since)
+        if until:
+            clauses.append("m.utc_kickoff < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        result = {}
+        for match in self._query_matches(where, params):
+            result.setdefault(match.competition_code, []).append(match)
+        return result
+
+    def get_team_matches(self, team_id):
+        """Get all matches involving a team, newest first."""
+        return self._query_matches(
+            "WHERE m.home_team_id = ? OR m.away_team_id = ?", (team_id, team_id)
+        )
+
+    def get_live_matches(self):
+        """Get matches that are currently in play."""
+        placeholders = ', '.join('?' for _ in LIVE_STATUSES)
+        return self._query_matches(f"WHERE m.status IN ({placeholders})", LIVE_STATUSES)
+
+    def get_active_match_ids(self, now, lookahead_minutes=15, window_hours=3):
+        """
+        Get ids of matches that are live or about to be.
+
+        Args:
+            now: Current UTC datetime
+            lookahead_minutes: Include scheduled matches kicking off this soon
+            window_hours: Include scheduled matches that kicked off this long ago
+                but have not been marked live or finished yet
+
+        Returns:
+            list: Match ids worth polling
+        """
+        fmt = '%Y-%m-%dT%H:%M:%SZ'
+        soon = (now + timedelta(minutes=lookahead_minutes)).strftime(fmt)
+        started = (now - timedelta(hours=window_hours)).strftime(fmt)
+        placeholders = ', '.join('?' for _ in LIVE_STATUSES)
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT id FROM matches
+                    WHERE id > 0 AND (
+                        status IN ({placeholders})
+                        OR (status IN ('SCHEDULED', 'TIMED') AND utc_kickoff BETWEEN ? AND ?)
+                    )
+                """, (*LIVE_STATUSES, started, soon))
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error("Error getting active matches: %s", e)
+            return []
+
+    @timed(DB_SECONDS, 'fixture_calendar')
+    def get_fixture_calendar(self, now, window_hours=24):
+        """
+        Summarize each competition's fixtures around now, for refresh planning.
+
+        Args:
+            now: Current UTC datetime
+            window_hours: Ignore matches that kicked off longer ago than this
+
+        Returns:
+            dict: Competition code -> {'live', 'next_kickoff', 'last_kickoff',
+                  'last_finished_kickoff'} (kickoffs as ISO 8601 strings or None)
+        """
+        fmt = '%Y-%m-%dT%H:%M:%SZ'
+        current = now.strftime(fmt)
+        since = (now - timedelta(hours=window_hours)).strftime(fmt)
+        placeholders = ', '.join('?' for _ in LIVE_STATUSES)
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT competition_code,
+                           SUM(status IN ({placeholders})),
+                           MIN(CASE WHEN utc_kickoff > ? AND status IN ('SCHEDULED', 'TIMED')
+                                    THEN utc_kickoff END),
+                           MAX(CASE WHEN utc_kickoff <= ? THEN utc_kickoff END),
+                           MAX(CASE WHEN status = 'FINISHED' THEN utc_kickoff END)
+                    FROM matches
+                    WHERE utc_kickoff >= ?
+                    GROUP BY competition_code
+                """, (*LIVE_STATUSES, current, current, since))
+                return {
+                    code: {
+                        'live': live or 0,
+                        'next_kickoff': next_kickoff,
+                        'last_kickoff': last_kickoff,
+                        'last_finished_kickoff': last_finished
+                    }
+                    for code, live, next_kickoff, last_kickoff, last_finished in cursor.fetchall()
+                }
+        except Exception as e:
+            logger.error("Error getting fixture calendar: %s", e)
+            return {}
+
+    def get_fetch_times(self):
+        """
+        Get when each resource was last fetched from the API.
+
+        Returns:
+            dict: (resource, competition_code) -> ISO 8601 UTC timestamp string
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT key, value FROM app_metadata WHERE key LIKE 'fetched_at:%'")
+                result = {}
+                for key, value in cursor.fetchall():
+                    _, resource, code = key.split(':', 2)
+                    result[(resource, code)] = value
+                return result
+        except Exception as e:
+            logger.error("Error getting fetch times: %s", e)
+            return {}
+
+    def get_team_crest_urls(self):
+        """
+        Get the upstream crest URL of every team that has one.
+
+        Returns:
+            dict: team id -> crest URL
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id, crest FROM teams WHERE crest IS NOT NULL AND crest != ''")
+                return dict(cursor.fetchall())
+        except Exception as e:
+            logger.error("Error getting team crests: %s", e)
+            return {}
+
+    def get_crests(self):
+        """
+        Get the cached crest image of every team that has one.
+
+        Returns:
+            dict: team id -> {'source_url', 'digest', 'content_type'}
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT team_id, source_url, digest, content_type FROM crests")
+                return {
+                    team_id: {'source_url': url, 'digest': digest, 'content_type': content_type}
+                    for team_id, url, digest, content_type in cursor.fetchall()
+                }
+        except Exception as e:
+            logger.error("Error getting crests: %s", e)
+            return {}
 
     def save_scorers(self, competition_code, data):
         """Save scorer data for a competition."""
-        self._save_data('scorers', competition_code, data)
+        self._write('scorers', competition_code, self._write_scorers, data)
 
     def get_scorers(self, competition_code):
         """Get scorer data for a competition."""
-        return self._get_data('scorers', competition_code)
+        return self._get_all_scorers("WHERE s.competition_code = ?", (competition_code,)).get(competition_code)
 
     def get_all_scorers(self):
         """Get all scorers grouped by competition."""
-        return self._get_all_data('scorers')
+        return self._get_all_scorers()
 
     def save_standings(self, competition_code, data):
         """Save standings data for a competition."""
-        self._save_data('standings', competition_code, data)
+        self._write('standings', competition_code, self._write_standings, data)
 
     def get_standings(self, competition_code):
         """Get standings data for a competition."""
-        return self._get_data('standings', competition_code)
+        return self._get_all_standings("WHERE s.competition_code = ?", (competition_code,)).get(competition_code)
 
     def get_all_standings(self):
         """Get all standings grouped by competition."""
-        return self._get_all_data('standings')
+        return self._get_all_standings()
+
+    def save_summary(self, summary_text, digest_hash=None):
+        """
+        Save the AI summary with its rendered HTML.
 
-    def save_summary(self, summary_text):
-        """Save the AI summary."""
-        self._save_metadata('ai_summary', summary_text)
+        The data version is bumped, so pages are re-rendered with the new
+        summary embedded.
+
+        Args:
+            summary_text: Markdown summary
+            digest_hash: Hash of the results digest the summary was
+                generated from (optional)
+        """
+        try:
+            with self.refresh_session() as session:
+                session.save_summary(summary_text, digest_hash)
+        except Exception as e:
+            logger.error("Error saving summary: %s", e)
 
     def get_summary(self):
         """Get the AI summary."""
         return self._get_metadata('ai_summary')
 
-    def _save_data(self, table, competition_code, data):
-        """Helper to save data to a table."""
+    def get_summary_digest(self):
+        """Get the hash of the results digest the AI summary was generated from."""
+        return self._get_metadata('ai_summary_digest')
+
+    def get_summary_html(self):
+        """
+        Get the AI summary rendered to sanitized HTML.
+
+        Only reads: HTML is rendered and stored by save_summary(). HTML
+        stored by an older renderer version is rendered again in memory
+        from the Markdown source, without writing it back, until the next
+        summary replaces it.
+
+        Returns:
+            str: HTML fragment, or None if there is no summary
+        """
+        if self._get_metadata('ai_summary_html_version') == RENDERER_VERSION:
+            return self._get_metadata('ai_summary_html')
+        summary_text = self.get_summary()
+        if summary_text is None:
+            return None
+        return render_markdown(summary_text)
+
+    def save_payload_hash(self, resource, competition_code, payload_hash):
+        """Save the hash of the last stored API payload for a resource."""
+        self._save_metadata(f'payload_hash:{resource}:{competition_code}', payload_hash)
+
+    def get_payload_hash(self, resource, competition_code):
+        """Get the hash of the last stored API payload for a resource."""
+        return self._get_metadata(f'payload_hash:{resource}:{competition_code}')
+
+    def get_backfill_checkpoint(self, competition_code, season):
+        """Get the last backfilled date (YYYY-MM-DD) for a season, or None."""
+        return self._get_metadata(f'backfill:{competition_code}:{season}')
+
+    def acquire_lease(self, name, holder, ttl_seconds, now):
+        """
+        Take or renew a named lease.
+
+        The lease is granted when it is free, expired, or already held by
+        this holder, atomically with respect to other processes sharing the
+        database file.
+
+        Args:
+            name: Lease name
+            holder: Unique id of the caller
+            ttl_seconds: Seconds until the lease expires unless renewed
+            now: Current wall-clock time (epoch seconds)
+
+        Returns:
+            bool: True if the caller holds the lease
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"""
-                    INSERT OR REPLACE INTO {table} (competition_code, data_json, updated_at)
+                cursor.execute("""
+                    INSERT INTO leases (name, holder, expires_at)
                     VALUES (?, ?, ?)
-                """, (competition_code, json.dumps(data), datetime.utcnow()))
+                    ON CONFLICT (name) DO UPDATE
+                    SET holder = excluded.holder, expires_at = excluded.expires_at
+                    WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+                """, (name, holder, now + ttl_seconds, now))
+                cursor.execute("SELECT holder FROM leases WHERE name = ?", (name,))
+                row = cursor.fetchone()
                 conn.commit()
+                return row is not None and row[0] == holder
         except Exception as e:
-            logger.error(f"Error saving to {table} for {competition_code}: {e}")
+            logger.error("Error acquiring lease %s: %s", name, e)
+            return False
 
-    def _get_data(self, table, competition_code):
-        """Helper to get data from a table."""
+    def release_lease(self, name, holder):
+        """Give up a lease if it is held by this holder."""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(f"SELECT data_json FROM {table} WHERE competition_code = ?", (competition_code,))
-                row = cursor.fetchone()
-                if row:
-                    return json.loads(row[0])
-                return None
+                conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+                conn.commit()
         except Exception as e:
-            logger.error(f"Error getting from {table} for {competition_code}: {e}")
+            logger.error("Error releasing lease %s: %s", name, e)
+
+    def get_data_version(self):
+        """Get the data generation, bumped by every refresh session that changed data."""
+        value = self._get_metadata('data_version')
+        return int(value) if value else 0
+
+    @contextmanager
+    def refresh_session(self):
+        """
+        Stage a whole refresh cycle's writes in one transaction.
+
+        Everything saved through the yielded RefreshSession becomes visible
+        to readers at once with a single commit, together with the bumped
+        data version. If the block raises, nothing is written.
+
+        Yields:
+            RefreshSession: Writer bound to the open transaction
+        """
+        with DB_SECONDS.labels('refresh_session').time(), self.get_connection() as conn:
+            session = RefreshSession(self, conn.cursor())
+            yield session
+            if session.changed:
+                version = session.cursor.execute(
+                    "SELECT value FROM app_metadata WHERE key = 'data_version'"
+                ).fetchone()
+                session.put_metadata('data_version', str(int(version[0]) + 1 if version else 1))
+
+    def _write(self, table, competition_code, writer, data):
+        """Helper to run a row writer in its own transaction."""
+        try:
+            with self.get_connection() as conn:
+                writer(conn.cursor(), competition_code, data)
+                conn.commit()
+        except Exception as e:
+            logger.error("Error saving to %s for %s: %s", table, competition_code, e)
+
+    def _upsert_team(self, cursor, team, now):
+        """Insert or refresh a team row, keeping known fields the new data lacks."""
+        if not team or team.get('id') is None:
             return None
+        cursor.execute("""
+            INSERT INTO teams (id, name, short_name, tla, crest, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                name = COALESCE(excluded.name, name),
+                short_name = COALESCE(excluded.short_name, short_name),
+                tla = COALESCE(excluded.tla, tla),
+                crest = COALESCE(NULLIF(excluded.crest, ''), crest),
+                updated_at = excluded.updated_at
+        """, (team['id'], team.get('name'), team.get('shortName'), team.get('tla'),
+              team.get('crest'), now))
+        return team['id']
+
+    def _write_matches(self, cursor, competition_code, matches):
+        """Upsert normalized matches for a competition."""
+        now = datetime.utcnow()
+        matches = [m for m in matches if m.id is not None]
+        if any(m.id > 0 for m in matches):
+            # Real API rows supersede placeholders carried over from the legacy schema
+            cursor.execute(
+                "DELETE FROM matches WHERE competition_code = ? AND id < 0", (competition_code,)
+            )
+
+        # Interned teams make de-duplication an identity check
+        teams = {id(t): t for m in matches for t in (m.home_team, m.away_team)}
+        for team in teams.values():
+            self._upsert_team(cursor, team.to_dict(), now)
+
+        cursor.executemany("""
+            INSERT OR REPLACE INTO matches (
+                id, competition_code, competition_name, status, utc_kickoff,
+                home_team_id, away_team_id, home_score, away_score, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(*m.to_row(), now) for m in matches])
+        self._mark_counted_results(cursor, competition_code, now)
+
+    def _mark_counted_results(self, cursor, competition_code, written_at):
+        """
+        Mark results written just now that the official table already counts.
+
+        Finished matches that were already over when the table was fetched
+        but are stored after it (backfilled, or fetched after the standings in
+        a cycle where the matches fetch was late or failed) would otherwise be
+        added on top of a table that already includes them. A match still in
+        play at the fetch is left for the table to take on.
+        """
+        row = cursor.execute(
+            "SELECT value FROM app_metadata WHERE key = ?",
+            (f'standings_as_of:{competition_code}',)
+        ).fetchone()
+        if not row:
+            return
+        as_of = datetime.strptime(row[0], '%Y-%m-%dT%H:%M:%SZ')
+        # Kicked off at least a full match before the table was fetched
+        settled_by = f"{as_of - FULL_TIME:%Y-%m-%dT%H:%M:%SZ}"
+        season_clause, season_params = self._standings_season_clause(cursor, competition_code)
+        cursor.execute(f"""
+            INSERT OR IGNORE INTO standings_results (
+                match_id, competition_code, home_team_id, away_team_id, home_score, away_score
+            )
+            SELECT m.id, m.competition_code, m.home_team_id, m.away_team_id,
+                   m.home_score, m.away_score
+            FROM matches m
+            WHERE m.competition_code = ? AND m.updated_at = ? AND m.status = 'FINISHED'
+              AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+              AND m.utc_kickoff <= ?
+              {season_clause}
+        """, (competition_code, written_at, settled_by, *season_params))
+
+    def _update_match_states(self, cursor, matches):
+        """Update status, kickoff and score of known matches, skipping unchanged rows."""
+        now = datetime.utcnow()
+        updated = 0
+        for match in matches:
+            values = (match.status, match.utc_kickoff, match.home_score, match.away_score)
+            cursor.execute("""
+                UPDATE matches
+                SET status = ?, utc_kickoff = ?, home_score = ?, away_score = ?, updated_at = ?
+                WHERE id = ? AND (
+                    status IS NOT ? OR utc_kickoff IS NOT ?
+                    OR home_score IS NOT ? OR away_score IS NOT ?
+                )
+            """, (*values, now, match.id, *values))
+            updated += cursor.rowcount
+        return updated
+
+    def _write_scorers(self, cursor, competition_code, scorers):
+        """Replace the scorers list for a competition."""
+        now = datetime.utcnow()
+        cursor.execute("DELETE FROM scorers WHERE competition_code = ?", (competition_code,))
+        for rank, entry in enumerate(scorers, start=1):
+            player = entry.get('player') or {}
+            player_id = player.get('id')
+            if player_id is None:
+                player_id = _legacy_id(competition_code, player.get('name'))
+            cursor.execute("""
+                INSERT OR REPLACE INTO scorers (
+                    competition_code, player_id, rank, player_name, nationality, team_id,
+                    played_matches, goals, assists, penalties, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                competition_code,
+                player_id,
+                rank,
+                player.get('name'),
+                player.get('nationality'),
+                self._upsert_team(cursor, entry.get('team'), now),
+                entry.get('playedMatches'),
+                entry.get('goals'),
+                entry.get('assists'),
+                entry.get('penalties'),
+                now
+            ))
+
+    def _write_standings(self, cursor, competition_code, table):
+        """Replace the standings table for a competition."""
+        now = datetime.utcnow()
+        cursor.execute("DELETE FROM standings WHERE competition_code = ?", (competition_code,))
+        for row in table:
+            team_id = self._upsert_team(cursor, row.get('team'), now)
+            if team_id is None:
+                continue
+            cursor.execute("""
+                INSERT OR REPLACE INTO standings (
+                    competition_code, team_id, position, played_games, form, won, draw, lost,
+                    points, goals_for, goals_against, goal_difference, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                competition_code,
+                team_id,
+                row.get('position'),
+                row.get('playedGames'),
+                row.get('form'),
+                row.get('won'),
+                row.get('draw'),
+                row.get('lost'),
+                row.get('points'),
+                row.get('goalsFor'),
+                row.get('goalsAgainst'),
+                row.get('goalDifference'),
+                now
+            ))
+
+        self._put_metadata(cursor, f'standings_as_of:{competition_code}', f"{now:%Y-%m-%dT%H:%M:%SZ}")
+        self._reset_standings_baseline(cursor, competition_code)
+
+    def _reset_standings_baseline(self, cursor, competition_code):
+        """Mark every stored finished result as already counted in the standings table."""
+        # The official table already counts every finished result, so those
+        # become the baseline that later results are applied against
+        season_clause, season_params = self._standings_season_clause(cursor, competition_code)
+        cursor.execute(
+            "DELETE FROM standings_results WHERE competition_code = ?", (competition_code,)
+        )
+        cursor.execute(f"""
+            INSERT INTO standings_results (
+                match_id, competition_code, home_team_id, away_team_id, home_score, away_score
+            )
+            SELECT m.id, m.competition_code, m.home_team_id, m.away_team_id,
+                   m.home_score, m.away_score
+            FROM matches m
+            WHERE m.competition_code = ? AND m.status = 'FINISHED'
+              AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+              {season_clause}
+        """, (competition_code, *season_params))
+
+    def _standings_season_clause(self, cursor, competition_code):
+        """SQL filter limiting matches to the season of the stored standings table."""
+        row = cursor.execute(
+            "SELECT value FROM app_metadata WHERE key = ?",
+            (f'standings_season:{competition_code}',)
+        ).fetchone()
+        if not row or '/' not in row[0]:
+            return "", ()
+        start, end = row[0].split('/', 1)
+        return "AND m.utc_kickoff >= ? AND m.utc_kickoff <= ?", (start, f"{end}T23:59:59Z")
+
+    def _update_standings(self, cursor, competition_code):
+        """
+        Apply results that changed since the table was last updated.
+
+        Only matches whose counted result differs from the one already
+        applied are read; each is taken back and re-added for the two teams
+        involved, then positions are re-ranked.
+
+        Returns:
+            int: Number of match results applied
+        """
+        has_table = cursor.execute(
+            "SELECT 1 FROM standings WHERE competition_code = ? LIMIT 1", (competition_code,)
+        ).fetchone()
+        if not has_table:
+            # Nothing to apply results to until the official table is stored
+            return 0
+
+        season_clause, season_params = self._standings_season_clause(cursor, competition_code)
+        placeholders = ', '.join('?' for _ in COUNTED_STATUSES)
+        changes = cursor.execute(f"""
+            WITH counted AS (
+                SELECT m.id, m.home_team_id, m.away_team_id, m.home_score, m.away_score
+                FROM matches m
+                WHERE m.competition_code = ? AND m.status IN ({placeholders})
+                  AND m.home_score IS NOT NULL AND m.away_score IS NOT NULL
+                  {season_clause}
+            )
+            SELECT c.id, r.home_team_id, r.away_team_id, r.home_score, r.away_score,
+                   c.home_team_id, c.away_team_id, c.home_score, c.away_score
+            FROM counted c
+            LEFT JOIN standings_results r ON r.match_id = c.id
+            WHERE r.match_id IS NULL
+               OR r.home_score IS NOT c.home_score OR r.away_score IS NOT c.away_score
+               OR r.home_team_id IS NOT c.home_team_id OR r.away_team_id IS NOT c.away_team_id
+            UNION ALL
+            SELECT r.match_id, r.home_team_id, r.away_team_id, r.home_score, r.away_score,
+                   NULL, NULL, NULL, NULL
+            FROM standings_results r
+            WHERE r.competition_code = ? AND r.match_id NOT IN (SELECT id FROM counted)
+        """, (competition_code, *COUNTED_STATUSES, *season_params, competition_code)).fetchall()
+        if not changes:
+            return 0
+
+        deltas = {}
+        applied, removed = [], []
+        for match_id, *old_and_new in changes:
+            old, new = old_and_new[:4], old_and_new[4:]
+            if old[2] is not None:
+                add_result(deltas, *old, sign=-1)
+            if new[2] is not None:
+                add_result(deltas, *new)
+                applied.append((match_id, competition_code, *new))
+            else:
+                removed.append((match_id,))
+
+        now = datetime.utcnow()
+        assignments = ', '.join(f"{field} = {field} + ?" for field in DELTA_FIELDS)
+        cursor.executemany(f"""
+            UPDATE standings SET {assignments}, updated_at = ?
+            WHERE competition_code = ? AND team_id = ?
+        """, [(*counters, now, competition_code, team_id) for team_id, counters in deltas.items()])
 
-    def _get_all_data(self, table):
-        """Helper to get all data from a table as a dict."""
+        cursor.executemany("DELETE FROM standings_results WHERE match_id = ?", removed)
+        cursor.executemany("""
+            INSERT OR REPLACE INTO standings_results (
+                match_id, competition_code, home_team_id, away_team_id, home_score, away_score
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, applied)
+
+        self._rank_standings(cursor, competition_code)
+        return len(changes)
+
+    def _rank_standings(self, cursor, competition_code):
+        """Reassign table positions after results were applied."""
+        rows = cursor.execute("""
+            SELECT s.team_id, s.position, s.points, s.goal_difference, s.goals_for, s.won, t.name
+            FROM standings s
+            LEFT JOIN teams t ON t.id = s.team_id
+            WHERE s.competition_code = ?
+        """, (competition_code,)).fetchall()
+        ranked = sorted(rows, key=lambda row: rank_key(*row[2:]))
+        cursor.executemany(
+            "UPDATE standings SET position = ? WHERE competition_code = ? AND team_id = ?",
+            [
+                (position, competition_code, row[0])
+                for position, row in enumerate(ranked, start=1)
+                if row[1] != position
+            ]
+        )
+
+    @timed(DB_SECONDS, 'query_matches')
+    def _query_matches(self, where="", params=()):
+        """Helper to run a match query and build normalized match dicts."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"{MATCH_SELECT} {where} ORDER BY m.utc_kickoff DESC", params)
+                return [Match.from_row(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error("Error querying matches: %s", e)
+            return []
+
+    @timed(DB_SECONDS, 'get_scorers')
+    def _get_all_scorers(self, where="", params=()):
+        """Helper to load scorers grouped by competition, in rank order."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT s.competition_code, s.player_id, s.player_name, s.nationality,
+                           s.team_id, t.name, t.short_name, t.tla, t.crest,
+                           s.played_matches, s.goals, s.assists, s.penalties
+                    FROM scorers s
+                    LEFT JOIN teams t ON t.id = s.team_id
+                    {where}
+                    ORDER BY s.competition_code, s.rank
+                """, params)
+                result = {}
+                for (code, player_id, player_name, nationality, team_id, team_name, short_name,
+                     tla, crest, played, goals, assists, penalties) in cursor.fetchall():
+                    result.setdefault(code, []).append({
+                        'player': {'id': player_id, 'name': player_name, 'nationality': nationality},
+                        'team': {'id': team_id, 'name': team_name, 'shortName': short_name,
+                                 'tla': tla, 'crest': crest},
+                        'playedMatches': played,
+                        'goals': goals,
+                        'assists': assists,
+                        'penalties': penalties
+                    })
+                return result
+        except Exception as e:
+            logger.error("Error getting scorers: %s", e)
+            return {}
+
+    @timed(DB_SECONDS, 'get_standings')
+    def _get_all_standings(self, where="", params=()):
+        """Helper to load standings grouped by competition, in table order."""
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute(f"SELECT competition_code, data_json FROM {table}")
-                rows = cursor.fetchall()
+                cursor.execute(f"""
+                    SELECT s.competition_code, s.position, s.team_id, t.name, t.short_name,
+                           t.tla, t.crest, s.played_games, s.form, s.won, s.draw, s.lost,
+                           s.points, s.goals_for, s.goals_against, s.goal_difference
+                    FROM standings s
+                    LEFT JOIN teams t ON t.id = s.team_id
+                    {where}
+                    ORDER BY s.competition_code, s.position
+                """, params)
                 result = {}
-                for code, data_json in rows:
-                    result[code] = json.loads(data_json)
+                for (code, position, team_id, name, short_name, tla, crest, played, form,
+                     won, draw, lost, points, gf, ga, gd) in cursor.fetchall():
+                    result.setdefault(code, []).append({
+                        'position': position,
+                        'team': {'id': team_id, 'name': name, 'shortName': short_name,
+                                 'tla': tla, 'crest': crest},
+                        'playedGames': played,
+                        'form': form,
+                        'won': won,
+                        'draw': draw,
+                        'lost': lost,
+                        'points': points,
+                        'goalsFor': gf,
+                        'goalsAgainst': ga,
+                        'goalDifference': gd
+                    })
                 return result
         except Exception as e:
-            logger.error(f"Error getting all from {table}: {e}")
+            logger.error("Error getting standings: %s", e)
             return {}
 
+    def _write_crest(self, cursor, team_id, source_url, crest):
+        """Record where a team's crest is cached."""
+        cursor.execute("""
+            INSERT OR REPLACE INTO crests (
+                team_id, source_url, digest, content_type, size, fetched_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (team_id, source_url, crest['digest'], crest['content_type'], crest['size'],
+              datetime.utcnow()))
+
+    def _put_metadata(self, cursor, key, value):
+        """Write a metadata value on an existing cursor."""
+        cursor.execute("""
+            INSERT OR REPLACE INTO app_metadata (key, value, updated_at)
+            VALUES (?, ?, ?)
+        """, (key, value, datetime.utcnow()))
+
     def _save_metadata(self, key, value):
         """Helper to save metadata."""
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO app_metadata (key, value, updated_at)
-                    VALUES (?, ?, ?)
-                """, (key, value, datetime.utcnow()))
+                self._put_metadata(conn.cursor(), key, value)
                 conn.commit()
         except Exception as e:
-            logger.error(f"Error saving metadata {key}: {e}")
+            logger.error("Error saving metadata %s: %s", key, e)
 
+    @timed(DB_SECONDS, 'get_metadata')
     def _get_metadata(self, key):
         """Helper to get metadata."""
         try:
@@ -185,5 +1100,123 @@ class DatabaseManager:
                     return row[0]
                 return None
         except Exception as e:
-            logger.error(f"Error getting metadata {key}: {e}")
+            logger.error("Error getting metadata %s: %s", key, e)
             return None
+
+
+class RefreshSession:
+    """Writes staged on a single open transaction; see DatabaseManager.refresh_session()."""
+
+    def __init__(self, db, cursor):
+        self.db = db
+        self.cursor = cursor
+        # True once any dataset has been written in this session
+        self.changed = False
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Undo the block's writes if it raises, keeping the rest of the session.
+
+        Lets one dataset fail without committing its partial writes (say, old
+        rows deleted but the new ones never inserted) alongside the others.
+        The exception is re-raised.
+        """
+        # A SAVEPOINT outside a transaction would start one its RELEASE commits
+        if not self.cursor.connection.in_transaction:
+            self.cursor.execute("BEGIN")
+        changed = self.changed
+        self.cursor.execute("SAVEPOINT dataset")
+        try:
+            yield
+        except Exception:
+            self.cursor.execute("ROLLBACK TO dataset")
+            self.cursor.execute("RELEASE dataset")
+            self.changed = changed
+            raise
+        self.cursor.execute("RELEASE dataset")
+
+    def save_matches(self, competition_code, data):
+        """Stage match data for a competition."""
+        self.db._write_matches(self.cursor, competition_code, data)
+        self.changed = True
+
+    def save_scorers(self, competition_code, data):
+        """Stage scorer data for a competition."""
+        self.db._write_scorers(self.cursor, competition_code, data)
+        self.changed = True
+
+    def save_standings(self, competition_code, data, season=None):
+        """
+        Stage the official standings table for a competition.
+
+        Args:
+            competition_code: Competition code
+            data: TOTAL table rows from the API
+            season: Optional (start_date, end_date) of the table's season;
+                only matches inside it are applied to the table afterwards
+        """
+        if season:
+            self.put_metadata(f'standings_season:{competition_code}', '/'.join(season))
+        self.db._write_standings(self.cursor, competition_code, data)
+        self.changed = True
+
+    def update_standings(self, competition_code):
+        """
+        Stage results that changed since the standings were last updated.
+
+        Returns:
+            int: Number of match results applied
+        """
+        applied = self.db._update_standings(self.cursor, competition_code)
+        if applied:
+            self.changed = True
+        return applied
+
+    def update_match_states(self, matches):
+        """
+        Stage status and score changes for matches that are already stored.
+
+        Returns:
+            int: Number of rows that actually changed
+        """
+        updated = self.db._update_match_states(self.cursor, matches)
+        if updated:
+            self.changed = True
+        return updated
+
+    def save_payload_hash(self, resource, competition_code, payload_hash):
+        """Stage the payload hash for a resource."""
+        self.put_metadata(f'payload_hash:{resource}:{competition_code}', payload_hash)
+
+    def save_fetch_time(self, resource, competition_code, fetched_at):
+        """Stage when a resource was last fetched (ISO 8601 UTC string)."""
+        self.put_metadata(f'fetched_at:{resource}:{competition_code}', fetched_at)
+
+    def save_summary(self, summary_text, digest_hash=None):
+        """Stage the AI summary with its HTML, rendered once here rather than per page view."""
+        self.put_metadata('ai_summary', summary_text)
+        self.put_metadata('ai_summary_html', render_markdown(summary_text))
+        self.put_metadata('ai_summary_html_version', RENDERER_VERSION)
+        if digest_hash is not None:
+            self.put_metadata('ai_summary_digest', digest_hash)
+        self.changed = True
+
+    def save_crest(self, team_id, source_url, crest):
+        """Stage the cached image of a team's crest (as returned by CrestCache.download)."""
+        self.db._write_crest(self.cursor, team_id, source_url, crest)
+        self.changed = True
+
+    def save_backfill_checkpoint(self, competition_code, season, last_date):
+        """Stage the last backfilled date for a season."""
+        self.put_metadata(f'backfill:{competition_code}:{season}', last_date)
+
+    def put_metadata(self, key, value):
+        """Stage a metadata value."""
+        self.db._put_metadata(self.cursor, key, value)
+
+
+def _legacy_id(*parts):
+    """Derive a stable negative id for legacy rows stored without an API id."""
+    digest = hashlib.sha1('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return -int(digest[:12], 16)
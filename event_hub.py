@@ -0,0 +1,117 @@
+"""Fan-out hub for Server-Sent Events."""
+
+import json
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    """One connected SSE client and its pending messages."""
+
+    def __init__(self, max_queue):
+        self.queue = queue.Queue(maxsize=max_queue)
+        # Set when the client falls too far behind and should reconnect
+        self.closed = False
+
+
+class EventHub:
+    """
+    Broadcasts events to every connected client.
+
+    Each event is serialized once, then the same bytes are queued for all
+    subscribers. Clients that stop draining their queue are disconnected
+    rather than allowed to grow memory without bound, and the number of
+    clients is capped because every open stream holds a server thread.
+    """
+
+    def __init__(self, max_queue=32, keepalive_seconds=15, max_subscribers=None):
+        """
+        Initialize the hub.
+
+        Args:
+            max_queue: Pending messages allowed per client before it is dropped
+            keepalive_seconds: Idle time after which a comment line is sent
+            max_subscribers: Most clients connected at once (default: no limit)
+        """
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.keepalive_seconds = keepalive_seconds
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self):
+        """Number of connected clients."""
+        return len(self._subscribers)
+
+    def subscribe(self):
+        """
+        Register a new client.
+
+        Returns:
+            Subscriber, or None if max_subscribers clients are already connected
+        """
+        subscriber = Subscriber(self.max_queue)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                logger.warning("Refusing SSE client: %s already connected", len(self._subscribers))
+                return None
+            self._subscribers.add(subscriber)
+        logger.debug("SSE client connected (%s total)", self.subscriber_count)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a client."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+        logger.debug("SSE client disconnected (%s total)", self.subscriber_count)
+
+    def publish(self, event, data, event_id=None):
+        """
+        Send an event to all clients.
+
+        Args:
+            event: SSE event name
+            data: JSON-serializable payload
+            event_id: Optional SSE id (e.g. the data version)
+        """
+        lines = [f"event: {event}"]
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+        message = ("\n".join(lines) + "\n\n").encode('utf-8')
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(message)
+            except queue.Full:
+                logger.warning("Dropping slow SSE client")
+                subscriber.closed = True
+                self.unsubscribe(subscriber)
+
+    def stream(self, subscriber):
+        """
+        Generate the SSE byte stream for one client.
+
+        Args:
+            subscriber: Subscriber returned by subscribe()
+
+        Yields:
+            bytes: SSE messages and keepalive comments
+        """
+        try:
+            # Ask browsers to wait a few seconds before reconnecting
+            yield b"retry: 5000\n\n"
+            while not subscriber.closed:
+                try:
+                    yield subscriber.queue.get(timeout=self.keepalive_seconds)
+                except queue.Empty:
+                    yield b": keepalive\n\n"
+        finally:
+            self.unsubscribe(subscriber)
@@ -1,11 +1,33 @@
 """API client for Football-Data.org API."""
 
 import logging
+import random
+import threading
+import time
 from datetime import datetime, timedelta
 import requests
+from requests.adapters import HTTPAdapter
+from metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+API_REQUESTS = REGISTRY.counter(
+    'football_api_requests_total', 'Football-Data.org HTTP attempts', ('endpoint', 'status')
+)
+API_SECONDS = REGISTRY.histogram(
+    'football_api_request_seconds', 'Football-Data.org request latency', ('endpoint',)
+)
+API_RETRIES = REGISTRY.counter('football_api_retries_total', 'Retried Football-Data.org requests')
+API_THROTTLED = REGISTRY.counter(
+    'football_api_throttled_seconds_total', 'Seconds spent waiting for rate-limit tokens'
+)
+API_QUOTA = REGISTRY.gauge(
+    'football_api_quota_remaining', 'Requests left this minute, as reported by the API'
+)
+JSON_DECODE_SECONDS = REGISTRY.histogram(
+    'football_api_json_decode_seconds', 'Time decoding Football-Data.org JSON bodies', ('endpoint',)
+)
+
 
 class FootballAPIClient:
     """Client for interacting with the Football-Data.org API."""
@@ -16,78 +38,278 @@ class FootballAPIClient:
     # Competition codes for the 6 supported competitions (Free tier)
     COMPETITION_CODES = ["PL", "PD", "BL1", "SA", "FL1", "CL"]
 
-    def __init__(self, api_key):
+    # Status codes worth retrying: rate limited or transient upstream failure
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, api_key, rate_limiter=None, base_url=None, max_retries=3,
+                 backoff_base=1.0, pool_size=10, sleep=time.sleep):
         """
         Initialize the API client.
 
         Args:
             api_key: API key for Football-Data.org (X-Auth-Token header)
+            rate_limiter: Optional TokenBucket shared by all requests
+            base_url: Override for BASE_URL (e.g. a local stub server)
+            max_retries: Retries after the first attempt (default: 3)
+            backoff_base: Base delay in seconds for exponential backoff (default: 1.0)
+            pool_size: Connections kept alive per host (default: 10)
+            sleep: Sleep function used between retries (injectable for testing)
         """
         self.api_key = api_key
+        self.base_url = base_url or self.BASE_URL
         self.headers = {
-            "X-Auth-Token": api_key
+            "X-Auth-Token": api_key,
+            "Accept-Encoding": "gzip"
         }
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._sleep = sleep
+
+        # One pooled session so every call reuses the same keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Endpoint URL -> query, validators and decoded body of its last 200
+        # response. Only the latest query per URL is kept: date windows and
+        # live-match id sets change all the time, so older ones never revalidate.
+        self._conditional = {}
+        self._stats_lock = threading.Lock()
+        self.stats = self._empty_stats()
+        # Endpoint name (matches/scorers/standings) -> cumulative counters
+        self.endpoint_stats = {}
+
+    @staticmethod
+    def _empty_stats():
+        """Return a zeroed request statistics dict."""
+        return {
+            'requests': 0,
+            'retries': 0,
+            'not_modified': 0,
+            'throttled_seconds': 0.0,
+            'fetch_seconds': 0.0
+        }
+
+    def reset_stats(self):
+        """
+        Reset request statistics.
+
+        Returns:
+            dict: Statistics accumulated since the previous reset
+        """
+        with self._stats_lock:
+            stats = self.stats
+            self.stats = self._empty_stats()
+        return stats
+
+    def close(self):
+        """Close the pooled HTTP session."""
+        self.session.close()
+
+    def _record(self, endpoint, waited, elapsed, response):
+        """Accumulate timing and size counters for one attempt."""
+        if response is not None:
+            size = int(response.headers.get('Content-Length') or len(response.content))
+        else:
+            size = 0
+
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['throttled_seconds'] += waited
+            self.stats['fetch_seconds'] += elapsed
+
+            counters = self.endpoint_stats.setdefault(
+                endpoint, {'requests': 0, 'errors': 0, 'seconds': 0.0, 'bytes': 0}
+            )
+            counters['requests'] += 1
+            counters['seconds'] += elapsed
+            counters['bytes'] += size
+            if response is None or response.status_code >= 400:
+                counters['errors'] += 1
+
+        status = str(response.status_code) if response is not None else 'error'
+        API_REQUESTS.labels(endpoint, status).inc()
+        API_SECONDS.labels(endpoint).observe(elapsed)
+        if waited:
+            API_THROTTLED.inc(waited)
+
+    def _retry_delay(self, attempt, response=None):
+        """
+        Work out how long to wait before the next attempt.
+
+        Honors Retry-After on 429 responses, otherwise uses exponential
+        backoff with full jitter.
+        """
+        if response is not None and response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def _send(self, url, params=None, headers=None):
+        """
+        Issue a GET request through the rate limiter, retrying transient failures.
 
-    def fetch_competition_matches(self, competition_code, params=None, retry=True):
+        Connection errors, timeouts, 429 and 5xx responses are retried up to
+        ``max_retries`` times with exponential backoff.
+
+        Args:
+            url: Endpoint URL
+            params: Optional query parameters
+            headers: Optional extra request headers
+
+        Returns:
+            requests.Response: Final response (status not checked)
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt failed to connect
+        """
+        endpoint = url.rstrip('/').rsplit('/', 1)[-1]
+
+        for attempt in range(self.max_retries + 1):
+            waited = self.rate_limiter.acquire() if self.rate_limiter else 0.0
+            started = time.monotonic()
+            response = None
+            try:
+                response = self.session.get(
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=10  # 10 second timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning("Network error fetching %s: %s", url, e)
+            finally:
+                self._record(endpoint, waited, time.monotonic() - started, response)
+
+            if response is not None:
+                if self.rate_limiter:
+                    self.rate_limiter.update_from_headers(response.headers)
+                available = response.headers.get('X-Requests-Available-Minute')
+                if available is not None and available.isdigit():
+                    API_QUOTA.set(int(available))
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt == self.max_retries:
+                    return response
+
+            delay = self._retry_delay(attempt, response)
+            status = response.status_code if response is not None else 'network error'
+            logger.info(
+                "Retrying %s in %.1fs after %s (attempt %s of %s)",
+                url, delay, status, attempt + 1, self.max_retries
+            )
+            with self._stats_lock:
+                self.stats['retries'] += 1
+            API_RETRIES.inc()
+            self._sleep(delay)
+
+    def _get_json(self, url, params=None):
+        """
+        GET a JSON endpoint, revalidating against the previous response.
+
+        When the endpoint previously returned an ETag or Last-Modified header
+        for the same query, the request is made conditional and a 304 reuses
+        the cached body.
+
+        Args:
+            url: Endpoint URL
+            params: Optional query parameters
+
+        Returns:
+            dict: Decoded JSON response
+
+        Raises:
+            requests.exceptions.HTTPError: On an error status code
+        """
+        query = tuple(sorted((params or {}).items()))
+        cached = self._conditional.get(url)
+        if cached and cached['query'] != query:
+            cached = None
+
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self._send(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            logger.info("Not modified since last fetch: %s", url)
+            with self._stats_lock:
+                self.stats['not_modified'] += 1
+            return cached['body']
+
+        response.raise_for_status()
+        with JSON_DECODE_SECONDS.labels(url.rstrip('/').rsplit('/', 1)[-1]).time():
+            body = response.json()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._conditional[url] = {
+                'query': query,
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': body
+            }
+        else:
+            self._conditional.pop(url, None)
+        return body
+
+    def fetch_competition_matches(self, competition_code, params=None):
         """
         Fetch matches for a specific competition.
 
         Args:
             competition_code: Competition code (e.g., 'PL', 'PD', 'BL1', 'SA', 'FL1')
             params: Optional query parameters (e.g., dateFrom, dateTo)
-            retry: Whether to retry on failure (default: True)
 
         Returns:
             dict: JSON response from API, or None on failure
         """
-        url = f"{self.BASE_URL}/competitions/{competition_code}/matches"
+        url = f"{self.base_url}/competitions/{competition_code}/matches"
 
         try:
-            logger.info(f"Fetching matches for competition: {competition_code}")
+            logger.info("Fetching matches for competition: %s", competition_code)
             if params:
-                logger.debug(f"Query parameters: {params}")
+                logger.debug("Query parameters: %s", params)
 
-            response = requests.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=10  # 10 second timeout
-            )
-            response.raise_for_status()
+            data = self._get_json(url, params=params)
 
-            logger.info(
-                f"Successfully fetched matches for {competition_code} "
-                f"(status: {response.status_code})"
-            )
-            return response.json()
+            logger.info("Successfully fetched matches for %s", competition_code)
+            return data
 
         except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-            logger.warning(f"Network error fetching {competition_code}: {e}")
-            if retry:
-                logger.info(f"Retrying {competition_code} after 2 seconds...")
-                import time
-                time.sleep(2)
-                return self.fetch_competition_matches(competition_code, params, retry=False)
+            logger.warning("Network error fetching %s: %s", competition_code, e)
             return None
         except requests.exceptions.HTTPError as e:
             logger.error(
-                f"HTTP error fetching {competition_code}: {e.response.status_code} - {e}"
+                "HTTP error fetching %s: %s - %s", competition_code, e.response.status_code, e
             )
             return None
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching {competition_code}: {e}")
+            logger.error("Error fetching %s: %s", competition_code, e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error fetching {competition_code}: {e}")
+            logger.error("Unexpected error fetching %s: %s", competition_code, e)
             return None
 
-    def fetch_recent_matches(self, competition_code, hours=168):
+    def fetch_recent_matches(self, competition_code, hours=168, ahead_hours=0):
         """
         Fetch recent matches for a competition within a time range.
 
         Args:
             competition_code: Competition code (e.g., 'PL', 'PD', 'BL1', 'SA', 'FL1')
             hours: Number of hours to look back from now (default: 168 = 7 days)
+            ahead_hours: Number of hours of upcoming fixtures to include (default: 0)
 
         Returns:
             dict: JSON response from API, or None on failure
@@ -95,14 +317,14 @@ class FootballAPIClient:
         # Calculate date range in UTC
         now = datetime.utcnow()
         date_from = now - timedelta(hours=hours)
+        date_to = now + timedelta(hours=ahead_hours)
 
         # Format dates as YYYY-MM-DD (API expects date only, not timestamp)
         date_from_str = date_from.strftime("%Y-%m-%d")
-        date_to_str = now.strftime("%Y-%m-%d")
+        date_to_str = date_to.strftime("%Y-%m-%d")
 
         logger.info(
-            f"Fetching recent matches for {competition_code} "
-            f"from {date_from_str} to {date_to_str}"
+            "Fetching recent matches for %s from %s to %s", competition_code, date_from_str, date_to_str
         )
 
         # Build query parameters
@@ -125,24 +347,18 @@ class FootballAPIClient:
         Returns:
             dict: JSON response from API, or None on failure
         """
-        url = f"{self.BASE_URL}/competitions/{competition_code}/scorers"
+        url = f"{self.base_url}/competitions/{competition_code}/scorers"
         params = {"limit": limit}
 
         try:
-            logger.info(f"Fetching top {limit} scorers for {competition_code}")
-            response = requests.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            logger.info(f"Successfully fetched scorers for {competition_code}")
-            return response.json()
+            logger.info("Fetching top %s scorers for %s", limit, competition_code)
+            data = self._get_json(url, params=params)
+
+            logger.info("Successfully fetched scorers for %s", competition_code)
+            return data
 
         except Exception as e:
-            logger.error(f"Error fetching scorers for {competition_code}: {e}")
+            logger.error("Error fetching scorers for %s: %s", competition_code, e)
             return None
 
     def fetch_standings(self, competition_code):
@@ -155,20 +371,39 @@ class FootballAPIClient:
         Returns:
             dict: JSON response from API, or None on failure
         """
-        url = f"{self.BASE_URL}/competitions/{competition_code}/standings"
+        url = f"{self.base_url}/competitions/{competition_code}/standings"
 
         try:
-            logger.info(f"Fetching standings for {competition_code}")
-            response = requests.get(
-                url,
-                headers=self.headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            
-            logger.info(f"Successfully fetched standings for {competition_code}")
-            return response.json()
+            logger.info("Fetching standings for %s", competition_code)
+            data = self._get_json(url)
+
+            logger.info("Successfully fetched standings for %s", competition_code)
+            return data
+
+        except Exception as e:
+            logger.error("Error fetching standings for %s: %s", competition_code, e)
+            return None
+
+    def fetch_matches_by_id(self, match_ids):
+        """
+        Fetch specific matches across all competitions in one request.
+
+        Args:
+            match_ids: Iterable of API match ids
+
+        Returns:
+            dict: JSON response from API, or None on failure
+        """
+        url = f"{self.base_url}/matches"
+        params = {"ids": ",".join(str(match_id) for match_id in match_ids)}
+
+        try:
+            logger.info("Fetching %s tracked matches", len(params['ids'].split(',')))
+            data = self._get_json(url, params=params)
+
+            logger.info("Successfully fetched tracked matches")
+            return data
 
         except Exception as e:
-            logger.error(f"Error fetching standings for {competition_code}: {e}")
+            logger.error("Error fetching tracked matches: %s", e)
             return None
@@ -0,0 +1,22 @@
+"""
+Gunicorn settings, read automatically when gunicorn starts from this directory.
+
+Every open page holds a Server-Sent Events stream (/events) for its whole
+lifetime. Sync workers serve one request at a time and are killed when a
+request outlives the worker timeout, so a few open tabs would take every
+worker and get them restarted every 30 seconds. Threaded workers give each
+stream its own thread and heartbeat from the main thread, so long-lived
+streams neither block other requests nor trip the timeout.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Worker processes (gunicorn's WEB_CONCURRENCY or -w override this)
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+
+worker_class = 'gthread'
+
+# Concurrent requests per worker, open event streams included
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
@@ -0,0 +1,65 @@
+"""Leader election through a lease row in the shared SQLite database."""
+
+import logging
+import os
+import socket
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLease:
+    """
+    A renewable lease that at most one process holds at a time.
+
+    The holder must renew it (heartbeat) well within the TTL. If it stops,
+    because the process died or hung, the lease expires and the next
+    process to renew it takes over.
+    """
+
+    def __init__(self, db, name='refresher', ttl_seconds=90, clock=time.time):
+        """
+        Initialize the lease.
+
+        Args:
+            db: DatabaseManager whose file is shared by all candidates
+            name: Lease name (default: 'refresher')
+            ttl_seconds: Seconds the lease stays valid without a heartbeat (default: 90)
+            clock: Wall-clock function (injectable for testing)
+        """
+        self.db = db
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._clock = clock
+
+    @property
+    def heartbeat_seconds(self):
+        """Renewal interval, leaving room for two missed heartbeats before expiry."""
+        return max(1, self.ttl_seconds / 3)
+
+    def renew(self):
+        """
+        Acquire or renew the lease.
+
+        Returns:
+            bool: True if this process is the leader
+        """
+        was_leader = self.is_leader
+        self.is_leader = self.db.acquire_lease(
+            self.name, self.holder, self.ttl_seconds, self._clock()
+        )
+        if self.is_leader and not was_leader:
+            logger.info("Acquired %s lease as %s", self.name, self.holder)
+        elif was_leader and not self.is_leader:
+            logger.warning("Lost %s lease held by %s", self.name, self.holder)
+        return self.is_leader
+
+    def release(self):
+        """Give up the lease so another process can take over immediately."""
+        if self.is_leader:
+            self.db.release_lease(self.name, self.holder)
+            self.is_leader = False
+            logger.info("Released %s lease", self.name)
@@ -1,20 +1,77 @@
 """Logging configuration for the Football Matches Tracker application."""
 
+import atexit
+import json
 import logging
 import os
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Logger for one-line-per-request access logs; sampled (see SamplingFilter)
+ACCESS_LOGGER = 'access'
+
+# Listener draining the log queue, kept so setup_logging() can be called again
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate):
+        """
+        Args:
+            rate: Fraction of records to keep, 0.0 to 1.0
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
 
 
 def setup_logging():
     """
     Configure logging for the application.
 
-    Sets up both console and file logging with appropriate formatters.
-    Log level can be controlled via LOG_LEVEL environment variable.
+    Log calls only put records on an in-memory queue; a background listener
+    thread formats them and writes to the console and a size-capped,
+    rotating log file, so request threads never wait on I/O. Per-request
+    access lines are sampled.
+
+    Environment variables:
+        LOG_LEVEL: Log level (default INFO)
+        LOG_FORMAT: 'text' or 'json' (default text)
+        LOG_FILE: Log file path (default app.log)
+        LOG_MAX_BYTES: Size at which the log file rotates (default 10 MB)
+        LOG_BACKUP_COUNT: Rotated files kept (default 5)
+        LOG_SAMPLE_RATE: Fraction of access log lines kept (default 0.1)
     """
+    global _listener
+
     # Get log level from environment or default to INFO
     log_level_name = os.getenv('LOG_LEVEL', 'INFO').upper()
     log_level = getattr(logging, log_level_name, logging.INFO)
+    use_json = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
 
     # Create root logger
     root_logger = logging.getLogger()
@@ -22,6 +79,7 @@ def setup_logging():
 
     # Clear any existing handlers
     root_logger.handlers.clear()
+    _flush_logs()
 
     # Console handler - more concise for development
     console_handler = logging.StreamHandler(sys.stdout)
@@ -30,18 +88,43 @@ def setup_logging():
         '%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(JsonFormatter() if use_json else console_formatter)
 
-    # File handler - more detailed for debugging
-    file_handler = logging.FileHandler('app.log')
+    # File handler - more detailed for debugging, rotated by size
+    file_handler = RotatingFileHandler(
+        os.getenv('LOG_FILE', 'app.log'),
+        maxBytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv('LOG_BACKUP_COUNT', '5')),
+        encoding='utf-8'
+    )
     file_handler.setLevel(log_level)
     file_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    file_handler.setFormatter(file_formatter)
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(JsonFormatter() if use_json else file_formatter)
+
+    # Callers only enqueue; formatting and writing happen on the listener thread
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    # Sample per-request access lines
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    access_logger.filters.clear()
+    access_logger.addFilter(SamplingFilter(float(os.getenv('LOG_SAMPLE_RATE', '0.1'))))
 
     # Log the setup completion
-    root_logger.info(f"Logging configured with level: {log_level_name}")
+    root_logger.info("Logging configured with level: %s", log_level_name)
+
+
+@atexit.register
+def _flush_logs():
+    """Write out queued records and stop the listener thread (runs on exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,114 @@
+"""
+Minimal Markdown to HTML renderer for AI summaries.
+
+Supports the subset summaries use: headings, paragraphs, bold, italics,
+inline code, bulleted and numbered lists, horizontal rules and http(s)
+links. All input is HTML-escaped before any markup is added, so the output
+is safe to embed in the page whatever the model returned.
+"""
+
+import html
+import re
+
+# Bump when the output changes, so stored HTML is re-rendered from its source
+RENDERER_VERSION = '2'
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_BULLET = re.compile(r'^\s*[-*+]\s+(.*)$')
+_NUMBERED = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+_RULE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+
+_CODE = re.compile(r'`([^`]+)`')
+_LINK = re.compile(r'\[([^\]]+)\]\((https?://[^\s)]+)\)')
+_BOLD = re.compile(r'(\*\*|__)(?=\S)(.+?)(?<=\S)\1')
+_ITALIC = re.compile(r'(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])')
+
+
+def _emphasis(text):
+    """Render bold and italic markup."""
+    text = _BOLD.sub(r'<strong>\2</strong>', text)
+    return _ITALIC.sub(r'<em>\2</em>', text)
+
+
+def render_inline(text):
+    """Render inline markup in one line of escaped text."""
+    text = html.escape(text, quote=True)
+    # Code spans and links are set aside as finished HTML, so code is not
+    # formatted and emphasis cannot pair with characters inside a tag
+    # (such as the underscore in target="_blank")
+    fragments = []
+
+    def stash(fragment):
+        fragments.append(fragment)
+        return f"\x00{len(fragments) - 1}\x00"
+
+    def restore(text):
+        return re.sub(r'\x00(\d+)\x00', lambda m: restore(fragments[int(m.group(1))]), text)
+
+    text = _CODE.sub(lambda m: stash(f"<code>{m.group(1)}</code>"), text)
+    text = _LINK.sub(lambda m: stash(
+        f'<a href="{m.group(2)}" rel="nofollow noopener" target="_blank">{_emphasis(m.group(1))}</a>'
+    ), text)
+    return restore(_emphasis(text))
+
+
+def render_markdown(text):
+    """
+    Render Markdown to HTML.
+
+    Args:
+        text: Markdown source
+
+    Returns:
+        str: HTML fragment (empty string for empty input)
+    """
+    blocks = []
+    paragraph = []
+    list_tag, items = None, []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(f"<p>{'<br>'.join(render_inline(line) for line in paragraph)}</p>")
+            paragraph.clear()
+
+    def flush_list():
+        nonlocal list_tag
+        if items:
+            rendered = ''.join(f"<li>{render_inline(item)}</li>" for item in items)
+            blocks.append(f"<{list_tag}>{rendered}</{list_tag}>")
+            items.clear()
+        list_tag = None
+
+    for line in (text or '').replace('\r\n', '\n').split('\n'):
+        if not line.strip():
+            flush_paragraph()
+            flush_list()
+            continue
+
+        heading = _HEADING.match(line)
+        bullet = _BULLET.match(line)
+        numbered = _NUMBERED.match(line)
+        if heading or _RULE.match(line):
+            flush_paragraph()
+            flush_list()
+            if heading:
+                level = len(heading.group(1))
+                blocks.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            else:
+                blocks.append('<hr>')
+        elif bullet or numbered:
+            flush_paragraph()
+            tag = 'ul' if bullet else 'ol'
+            if list_tag != tag:
+                flush_list()
+                list_tag = tag
+            items.append((bullet or numbered).group(1))
+        elif items:
+            # Continuation of the previous list item
+            items[-1] += ' ' + line.strip()
+        else:
+            paragraph.append(line.strip())
+
+    flush_paragraph()
+    flush_list()
+    return '\n'.join(blocks)
@@ -0,0 +1,325 @@
+"""
+Lightweight in-process metrics (counters, gauges, histograms).
+
+Metrics are rendered in the Prometheus text exposition format by
+REGISTRY.render(), which the /metrics route serves. Recording a value
+costs a dict lookup and a short lock, so it is safe on the request path.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow API calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    """Escape a label value for the text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    """Render a {name="value",...} label set (empty string when there are none)."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    """Render a sample value, keeping integers free of a trailing .0."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Shared behaviour: a name, help text, and one child per label-value tuple."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Get the child for a set of label values, creating it on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """Yield (suffix, label values, extra labels, value) for every child."""
+        raise NotImplementedError
+
+    def render(self):
+        """Render this metric's HELP, TYPE and sample lines."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, values, extra, value in self.samples():
+            labels = _format_labels(self.labelnames, values, extra)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """Add a non-negative amount."""
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """A monotonically increasing count (e.g. requests served); name it *_total."""
+
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield '', values, (), child.value
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0
+        self.function = None
+
+    def set(self, value):
+        """Set the current value."""
+        self.value = value
+
+    def set_function(self, function):
+        """Read the value from a callable at render time instead."""
+        self.function = function
+
+    def get(self):
+        return self.function() if self.function else self.value
+
+
+class Gauge(_Metric):
+    """A value that goes up and down (e.g. quota remaining)."""
+
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+    def set_function(self, function):
+        """Compute the unlabelled gauge from a callable at render time."""
+        self.labels().set_function(function)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            try:
+                value = child.get()
+            except Exception:
+                continue
+            yield '', values, (), value
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a histogram child."""
+
+    __slots__ = ('child', 'started')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """Time a block: ``with histogram.labels(...).time(): ...``."""
+        return _Timer(self)
+
+
+class Histogram(_Metric):
+    """A distribution of observations (e.g. latencies) in cumulative buckets."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        """Record one observation on the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def time(self):
+        """Time a block on the unlabelled histogram."""
+        return self.labels().time()
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield '_bucket', values, (('le', _format_value(float(bound))),), cumulative
+            yield '_bucket', values, (('le', '+Inf'),), count
+            yield '_sum', values, (), total
+            yield '_count', values, (), count
+
+
+class Registry:
+    """The set of metrics exposed together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        """Create a metric, or return the existing one with the same name."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Get or create a Counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Get or create a Gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Get or create a Histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """
+        Render every metric in the text exposition format.
+
+        Returns:
+            str: Exposition text, newline-terminated
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+# Process-wide registry used by the app, refresher and their components
+REGISTRY = Registry()
+
+# Content type of the text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def timed(histogram, *labelvalues):
+    """
+    Decorator observing a function's run time into a histogram.
+
+    Args:
+        histogram: Histogram to observe into
+        *labelvalues: Label values selecting the child
+    """
+    child = histogram.labels(*labelvalues)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def serve_metrics(port, registry=None):
+    """
+    Serve /metrics on a background thread, for processes without a web app.
+
+    Args:
+        port: TCP port to listen on (all interfaces)
+        registry: Registry to expose (default: REGISTRY)
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it)
+    """
+    registry = registry or REGISTRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes are too frequent to log
+            pass
+
+    server = ThreadingHTTPServer(('', port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
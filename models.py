@@ -0,0 +1,203 @@
+"""Compact in-memory models for match data."""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class Team:
+    """A team as shown on a match. Instances are interned via Team.get()."""
+
+    id: int | None
+    name: str
+    crest: str
+
+    @staticmethod
+    def get(team_id, name, crest):
+        """
+        Get the shared Team instance for these values.
+
+        Every match involving the same team points at one object, so names
+        and crest URLs are stored once rather than per match.
+        """
+        key = (team_id, name, crest)
+        team = _TEAMS.get(key)
+        if team is None:
+            team = _TEAMS.setdefault(key, Team(team_id, name, crest))
+        return team
+
+    def to_dict(self):
+        """Convert to the plain dict shape used by the JSON API."""
+        return {'id': self.id, 'name': self.name, 'crest': self.crest}
+
+
+# (id, name, crest) -> shared Team
+_TEAMS = {}
+
+
+@dataclass(slots=True)
+class Match:
+    """
+    A normalized match.
+
+    Only the raw fields are stored; display strings (score text, dates,
+    search query) are derived on access.
+    """
+
+    id: int | None
+    status: str
+    home_team: Team
+    away_team: Team
+    home_score: int | None
+    away_score: int | None
+    utc_kickoff: str
+    competition_code: str | None = None
+    competition_name: str | None = None
+
+    @property
+    def score_text(self):
+        """Formatted score text (e.g., "2–1", "LIVE", "SCHEDULED")."""
+        return format_score_text(self.status, self.home_score, self.away_score)
+
+    @property
+    def date(self):
+        """Display date (e.g., "Sat, Nov 15")."""
+        return format_display_date(self.utc_kickoff) if self.utc_kickoff else 'N/A'
+
+    # Kept for templates and API consumers that use the older name
+    display_date = date
+
+    @property
+    def google_query(self):
+        """Google search query for the fixture."""
+        return f"{self.home_team.name} vs {self.away_team.name}"
+
+    @property
+    def score(self):
+        """Full-time score in the nested shape of the API."""
+        return {'full_time': {'home': self.home_score, 'away': self.away_score}}
+
+    def to_row(self):
+        """Values for an INSERT into the matches table (see DatabaseManager._write_matches)."""
+        return (
+            self.id,
+            self.competition_code,
+            self.competition_name,
+            self.status,
+            self.utc_kickoff,
+            self.home_team.id,
+            self.away_team.id,
+            self.home_score,
+            self.away_score
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a Match from a MATCH_SELECT row (see db_manager)."""
+        (match_id, code, name, status, kickoff, home_id, home_name, home_crest,
+         away_id, away_name, away_crest, home_score, away_score) = row
+        return cls(
+            match_id,
+            status,
+            Team.get(home_id, home_name or 'N/A', home_crest or ''),
+            Team.get(away_id, away_name or 'N/A', away_crest or ''),
+            home_score,
+            away_score,
+            kickoff,
+            code,
+            name
+        )
+
+    def to_dict(self):
+        """Convert to the plain dict shape used by the JSON API."""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'score_text': self.score_text,
+            'score': self.score,
+            'home_team': self.home_team.to_dict(),
+            'away_team': self.away_team.to_dict(),
+            'utc_kickoff': self.utc_kickoff,
+            'date': self.date,
+            'competition_code': self.competition_code,
+            'competition_name': self.competition_name,
+            'display_date': self.display_date,
+            'google_query': self.google_query
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Match from a dict in the to_dict() shape."""
+        home = data.get('home_team') or {}
+        away = data.get('away_team') or {}
+        full_time = (data.get('score') or {}).get('full_time') or {}
+        return cls(
+            data.get('id'),
+            data.get('status', 'SCHEDULED'),
+            Team.get(home.get('id'), home.get('name') or 'N/A', home.get('crest') or ''),
+            Team.get(away.get('id'), away.get('name') or 'N/A', away.get('crest') or ''),
+            full_time.get('home'),
+            full_time.get('away'),
+            data.get('utc_kickoff', ''),
+            data.get('competition_code'),
+            data.get('competition_name')
+        )
+
+
+def format_score_text(status, home_score, away_score):
+    """
+    Format the score text based on match status.
+
+    Args:
+        status: Match status (FINISHED, LIVE, SCHEDULED, etc.)
+        home_score: Full-time home goals (or None)
+        away_score: Full-time away goals (or None)
+
+    Returns:
+        str: Formatted score text (e.g., "2–1", "LIVE", "SCHEDULED")
+    """
+    if status == 'FINISHED':
+        if home_score is not None and away_score is not None:
+            # Use en dash (–) for score separator
+            return f"{home_score}–{away_score}"
+        else:
+            logger.warning("Missing score data for finished match")
+            return "N/A"
+
+    elif status in ('LIVE', 'IN_PLAY', 'PAUSED'):
+        # Live polling keeps the running score current, so show it when known
+        if home_score is not None and away_score is not None:
+            return f"{home_score}–{away_score}"
+        return "LIVE"
+
+    else:
+        # For SCHEDULED, TIMED, POSTPONED, etc.
+        return "SCHEDULED"
+
+
+@lru_cache(maxsize=4096)
+def format_display_date(utc_date_str):
+    """
+    Format UTC date string to display format.
+
+    Cached because many matches share a kickoff time, so each distinct
+    timestamp is parsed only once.
+
+    Args:
+        utc_date_str: ISO 8601 date string (e.g., "2025-11-15T17:30:00Z")
+
+    Returns:
+        str: Formatted date (e.g., "Sat, Nov 15")
+    """
+    try:
+        # Parse ISO 8601 date string
+        dt = datetime.fromisoformat(utc_date_str.replace('Z', '+00:00'))
+        # Format as "Weekday, Month Day"
+        return dt.strftime("%a, %b %d")
+    except Exception as e:
+        logger.warning("Error formatting date %s: %s", utc_date_str, e)
+        return "N/A"
@@ -0,0 +1,108 @@
+"""In-memory cache of the rendered index page, keyed by data version."""
+
+import gzip
+import hashlib
+import logging
+import threading
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class RenderedPage:
+    """A rendered page body plus its pre-compressed variants."""
+
+    def __init__(self, version, body):
+        """
+        Build the page variants.
+
+        Args:
+            version: Snapshot key the page was rendered from
+            body: Rendered HTML as a string
+        """
+        self.version = version
+        self.body = body.encode('utf-8')
+        digest = hashlib.sha256(self.body).hexdigest()[:16]
+        self.etag = f"v{version}-{digest}"
+
+        # Encoding name -> compressed bytes ('identity' is the raw body)
+        self.variants = {'identity': self.body}
+        self.variants['gzip'] = gzip.compress(self.body, compresslevel=6)
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(self.body)
+
+    def etag_for(self, encoding):
+        """Return the strong ETag for a given content encoding."""
+        if encoding == 'identity':
+            return self.etag
+        return f"{self.etag}-{encoding}"
+
+
+class PageCache:
+    """
+    Holds the latest rendered page and rebuilds it only when the data version changes.
+
+    The render callable is invoked at most once per data version, even when
+    many requests arrive concurrently after a refresh.
+    """
+
+    # Preferred encodings, best first
+    ENCODINGS = ('br', 'gzip')
+
+    def __init__(self, render_func):
+        """
+        Initialize the cache.
+
+        Args:
+            render_func: Callable returning the rendered HTML string
+        """
+        self.render_func = render_func
+        self._page = None
+        self._lock = threading.Lock()
+
+    def get(self, version):
+        """
+        Get the rendered page for a data version, rendering it if needed.
+
+        Args:
+            version: Current data version (or snapshot key)
+
+        Returns:
+            RenderedPage: Cached page for this version
+        """
+        page = self._page
+        if page is not None and page.version == version:
+            return page
+
+        with self._lock:
+            page = self._page
+            if page is None or page.version != version:
+                logger.info("Rendering page cache for data version %s", version)
+                page = RenderedPage(version, self.render_func())
+                self._page = page
+        return page
+
+    def invalidate(self):
+        """Drop the cached page so the next request re-renders."""
+        with self._lock:
+            self._page = None
+
+    def choose_encoding(self, page, accept_encodings):
+        """
+        Pick the best available encoding the client accepts.
+
+        Args:
+            page: RenderedPage (or anything with encoding variants) to serve
+            accept_encodings: Werkzeug Accept object from the request
+
+        Returns:
+            str: Encoding name ('br', 'gzip' or 'identity')
+        """
+        for encoding in self.ENCODINGS:
+            if encoding in page.variants and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return 'identity'
@@ -0,0 +1,108 @@
+"""Token-bucket rate limiter that tracks the Football-Data.org per-minute quota."""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket sized to the API's per-minute request quota.
+
+    Tokens refill continuously at ``per_minute / 60`` per second. The bucket
+    is also corrected from the API's own quota headers, so when the server
+    reports that the minute's budget is spent we hold off until its counter
+    resets instead of guessing.
+    """
+
+    # Response headers sent by Football-Data.org
+    AVAILABLE_HEADER = 'X-Requests-Available-Minute'
+    RESET_HEADER = 'X-RequestCounter-Reset'
+
+    def __init__(self, per_minute=10, reserve=0, clock=time.monotonic, sleep=time.sleep):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Requests allowed per minute (default: 10, free tier)
+            reserve: Server-reported requests to leave unused each minute, so
+                another process sharing the API key is never starved (default: 0)
+            clock: Monotonic clock function (injectable for testing)
+            sleep: Sleep function (injectable for testing)
+        """
+        self.capacity = per_minute
+        self.refill_rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.reserve = reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        """Add tokens accrued since the last update. Caller must hold the lock."""
+        if now < self._blocked_until:
+            self._updated_at = now
+            return
+        if self._blocked_until:
+            # Server-side counter has reset: the full minute budget is back
+            self.tokens = float(self.capacity)
+            self._blocked_until = 0.0
+        else:
+            elapsed = now - self._updated_at
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self._updated_at = now
+
+    def acquire(self):
+        """
+        Take one token, blocking until one is available.
+
+        Returns:
+            float: Seconds spent waiting for a token
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now >= self._blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    delay = (1 - self.tokens) / self.refill_rate
+
+            logger.debug("Rate limit reached, waiting %.2fs", delay)
+            self._sleep(delay)
+            waited += delay
+
+    def update_from_headers(self, headers):
+        """
+        Sync the bucket with the quota reported by the API.
+
+        Args:
+            headers: Response headers mapping
+        """
+        available = headers.get(self.AVAILABLE_HEADER)
+        reset = headers.get(self.RESET_HEADER)
+        if available is None:
+            return
+
+        try:
+            available = int(available)
+            reset = float(reset) if reset is not None else None
+        except ValueError:
+            logger.warning("Unparseable quota headers: available=%s, reset=%s", available, reset)
+            return
+
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.tokens = min(self.tokens, float(available))
+            if available <= self.reserve and reset is not None:
+                self._blocked_until = max(self._blocked_until, now + reset)
+                logger.info("API quota down to %s, next request in %.0fs", available, reset)
@@ -0,0 +1,108 @@
+"""Fixture-driven refresh planning: when each competition's resources are next due."""
+
+from datetime import datetime, timedelta
+
+# How often to refetch a competition's matches
+HOT_INTERVAL = timedelta(minutes=10)        # a match is live, about to start or just played
+MATCHDAY_INTERVAL = timedelta(hours=1)      # a kickoff within MATCHDAY_WINDOW
+IDLE_INTERVAL = timedelta(hours=6)          # nothing scheduled nearby
+
+# Around a kickoff: from shortly before it until full time (with stoppages and extra time)
+HOT_BEFORE = timedelta(minutes=30)
+HOT_AFTER = timedelta(hours=3)
+MATCHDAY_WINDOW = timedelta(hours=12)
+
+# A match is normally over this long after kickoff
+FULL_TIME = timedelta(minutes=110)
+
+# Resources refreshed after matches finish rather than on an interval
+RESULT_DRIVEN = ('scorers', 'standings')
+
+
+def parse_utc(utc_date_str):
+    """Parse a stored ISO 8601 UTC timestamp into a naive UTC datetime (None if missing)."""
+    if not utc_date_str:
+        return None
+    return datetime.fromisoformat(utc_date_str.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+def matches_interval(fixtures, now):
+    """
+    Refresh interval for a competition's matches.
+
+    Args:
+        fixtures: Dict with 'live' (count), 'next_kickoff' and 'last_kickoff'
+            datetimes (or None), as from DatabaseManager.get_fixture_calendar()
+        now: Current UTC datetime
+
+    Returns:
+        timedelta: Interval between fetches
+    """
+    next_kickoff = fixtures.get('next_kickoff')
+    last_kickoff = fixtures.get('last_kickoff')
+
+    if (fixtures.get('live')
+            or (next_kickoff and next_kickoff - now <= HOT_BEFORE)
+            or (last_kickoff and now - last_kickoff <= HOT_AFTER)):
+        return HOT_INTERVAL
+    if ((next_kickoff and next_kickoff - now <= MATCHDAY_WINDOW)
+            or (last_kickoff and now - last_kickoff <= MATCHDAY_WINDOW)):
+        return MATCHDAY_INTERVAL
+    return IDLE_INTERVAL
+
+
+def result_driven_due(fixtures, fetched_at, max_age):
+    """
+    When scorers or standings are next due.
+
+    They only change when a match finishes, so they are due once after
+    the latest finished match's full time, provided none of the
+    competition's matches is still live (its result would make the fetch
+    stale straight away). max_age caps how long they can go unrefreshed.
+
+    Args:
+        fixtures: Fixture summary (see matches_interval), plus
+            'last_finished_kickoff'
+        fetched_at: Datetime of the last fetch
+        max_age: Longest time between fetches (timedelta)
+
+    Returns:
+        datetime: When the resource is due
+    """
+    due_at = fetched_at + max_age
+    last_finished = fixtures.get('last_finished_kickoff')
+    if last_finished and not fixtures.get('live') and fetched_at < last_finished + FULL_TIME:
+        due_at = min(due_at, last_finished + FULL_TIME)
+    return due_at
+
+
+def plan_refreshes(competition_codes, resources, calendar, fetched, now, max_age):
+    """
+    Work out when every (resource, competition) pair is next due.
+
+    Args:
+        competition_codes: Competitions to plan for
+        resources: Resource names (e.g. 'matches', 'scorers', 'standings')
+        calendar: Competition code -> fixture summary
+        fetched: (resource, competition code) -> datetime of the last fetch
+        now: Current UTC datetime
+        max_age: Longest time scorers and standings may go unrefreshed
+
+    Returns:
+        list: (due_at, resource, competition_code) tuples, soonest first;
+              never-fetched pairs are due at datetime.min
+    """
+    plan = []
+    for code in competition_codes:
+        fixtures = calendar.get(code, {})
+        for resource in resources:
+            fetched_at = fetched.get((resource, code))
+            if fetched_at is None:
+                due_at = datetime.min
+            elif resource in RESULT_DRIVEN:
+                due_at = result_driven_due(fixtures, fetched_at, max_age)
+            else:
+                due_at = fetched_at + matches_interval(fixtures, now)
+            plan.append((due_at, resource, code))
+    plan.sort()
+    return plan
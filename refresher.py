@@ -0,0 +1,178 @@
+"""
+Background refresh jobs, run by whichever process holds the leader lease.
+
+The web app runs these jobs itself by default (every worker competes for
+the lease and only the leader refreshes). Set EMBEDDED_REFRESHER=false to
+keep web workers read-only and run them here instead:
+
+Usage:
+    python refresher.py
+"""
+
+import logging
+import signal
+import threading
+from datetime import datetime
+from apscheduler.schedulers.blocking import BlockingScheduler
+from config import Config
+from logging_config import setup_logging
+from data_service import MatchDataService
+from leader_lease import LeaderLease
+from metrics import serve_metrics
+from crest_cache import CrestCache
+
+logger = logging.getLogger(__name__)
+
+
+class Refresher:
+    """Schedules the refresh and live-poll jobs, gated on the leader lease."""
+
+    def __init__(self, data_service, lease, tick_seconds=60, requests_per_tick=2,
+                 live_poll_seconds=60):
+        """
+        Initialize the refresher.
+
+        Args:
+            data_service: MatchDataService doing the work
+            lease: LeaderLease deciding whether this process runs the jobs
+            tick_seconds: Seconds between checks for resources due a refresh (default: 60)
+            requests_per_tick: Most API requests per check (default: 2)
+            live_poll_seconds: Seconds between live-match polls (default: 60, 0 disables)
+        """
+        self.data_service = data_service
+        self.lease = lease
+        self.tick_seconds = tick_seconds
+        self.requests_per_tick = requests_per_tick
+        self.live_poll_seconds = live_poll_seconds
+        self.scheduler = None
+        # Set while a full refresh runs, which covers everything refresh_due would fetch
+        self._full_refresh = threading.Event()
+
+    def start(self, scheduler):
+        """
+        Add the jobs to a scheduler.
+
+        The first heartbeat runs immediately, so a leader elected at startup
+        performs the initial fetch straight away if the database is empty.
+
+        Args:
+            scheduler: APScheduler scheduler (not yet started)
+        """
+        self.scheduler = scheduler
+        scheduler.add_job(
+            func=self.heartbeat,
+            trigger="interval",
+            seconds=self.lease.heartbeat_seconds,
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.add_job(
+            func=self.refresh_due,
+            trigger="interval",
+            seconds=self.tick_seconds,
+            max_instances=1,
+            coalesce=True
+        )
+        if self.live_poll_seconds > 0:
+            scheduler.add_job(
+                func=self.live_poll,
+                trigger="interval",
+                seconds=self.live_poll_seconds,
+                max_instances=1,
+                coalesce=True
+            )
+
+    def heartbeat(self):
+        """Renew the lease, doing the initial fetch when newly elected onto an empty database."""
+        was_leader = self.lease.is_leader
+        if self.lease.renew() and not was_leader and self.data_service.db.is_empty():
+            logger.info("Database is empty. Performing initial data fetch (this may take a minute)...")
+            # Run it as its own job so heartbeats keep renewing the lease meanwhile,
+            # committing each competition as it lands so pages fill in progressively
+            self.scheduler.add_job(func=self.refresh, kwargs={'progressive': True})
+
+    def refresh(self, progressive=False):
+        """Background task to refresh everything (the initial fetch)."""
+        if not self.lease.is_leader:
+            logger.debug("Not the refresh leader, skipping scheduled refresh")
+            return
+        logger.info("Starting scheduled data refresh...")
+        self._full_refresh.set()
+        try:
+            self.data_service.refresh_data(progressive=progressive)
+            logger.info("Data refresh completed successfully")
+        except Exception as e:
+            logger.error("Error in scheduled refresh: %s", e)
+        finally:
+            self._full_refresh.clear()
+
+    def refresh_due(self):
+        """Background task to refresh the resources the fixture calendar says are due."""
+        if not self.lease.is_leader or self._full_refresh.is_set():
+            return
+        try:
+            self.data_service.refresh_due(max_requests=self.requests_per_tick)
+        except Exception as e:
+            logger.error("Error in scheduled refresh: %s", e)
+
+    def live_poll(self):
+        """Background task to poll scores of live matches between full refreshes."""
+        if not self.lease.is_leader:
+            return
+        try:
+            self.data_service.poll_live_matches()
+        except Exception as e:
+            logger.error("Error in live poll: %s", e)
+
+    def stop(self):
+        """Release the lease so a standby process takes over without waiting for expiry."""
+        self.lease.release()
+
+
+def main():
+    setup_logging()
+    data_service = MatchDataService(
+        api_key=Config.API_KEY,
+        requests_per_minute=Config.API_RATE_LIMIT,
+        max_workers=Config.FETCH_WORKERS,
+        stats_max_age_hours=Config.STATS_MAX_AGE_HOURS,
+        base_url=Config.API_BASE_URL,
+        crest_cache=CrestCache(
+            Config.CREST_CACHE_DIR,
+            max_bytes=int(Config.CREST_CACHE_MAX_MB * 1024 * 1024),
+            sizes=(Config.CREST_SIZE,) if Config.CREST_SIZE else ()
+        )
+    )
+    lease = LeaderLease(data_service.db, ttl_seconds=Config.LEADER_LEASE_SECONDS)
+    refresher = Refresher(
+        data_service,
+        lease,
+        tick_seconds=Config.REFRESH_TICK_SECONDS,
+        requests_per_tick=Config.REFRESH_REQUESTS_PER_TICK,
+        live_poll_seconds=Config.LIVE_POLL_SECONDS
+    )
+
+    scheduler = BlockingScheduler()
+    refresher.start(scheduler)
+
+    if Config.REFRESHER_METRICS_PORT:
+        serve_metrics(Config.REFRESHER_METRICS_PORT)
+        logger.info("Serving refresher metrics on port %s", Config.REFRESHER_METRICS_PORT)
+
+    def shutdown(signum, frame):
+        logger.info("Stopping refresher...")
+        scheduler.shutdown(wait=False)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    logger.info("Refresher starting as %s", lease.holder)
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        refresher.stop()
+
+
+if __name__ == '__main__':
+    main()
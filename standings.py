@@ -0,0 +1,95 @@
+"""Standings arithmetic: applying match results to table rows and ranking them."""
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+
+# Order of the per-team delta counters built by add_result()
+DELTA_FIELDS = (
+    'played_games', 'won', 'draw', 'lost',
+    'goals_for', 'goals_against', 'goal_difference', 'points'
+)
+
+
+def add_result(deltas, home_team_id, away_team_id, home_score, away_score, sign=1):
+    """
+    Add (or, with sign=-1, remove) one match result to per-team deltas.
+
+    Args:
+        deltas: Dict of team id -> list of counters in DELTA_FIELDS order,
+            updated in place
+        home_team_id: Home team id
+        away_team_id: Away team id
+        home_score: Home goals
+        away_score: Away goals
+        sign: 1 to add the result, -1 to take it back
+    """
+    for team_id, scored, conceded in (
+        (home_team_id, home_score, away_score),
+        (away_team_id, away_score, home_score)
+    ):
+        if team_id is None:
+            continue
+        won = scored > conceded
+        draw = scored == conceded
+        points = POINTS_FOR_WIN if won else POINTS_FOR_DRAW if draw else 0
+
+        counters = deltas.setdefault(team_id, [0] * len(DELTA_FIELDS))
+        for i, value in enumerate((
+            1, int(won), int(draw), int(scored < conceded),
+            scored, conceded, scored - conceded, points
+        )):
+            counters[i] += sign * value
+
+
+def rank_key(points, goal_difference, goals_for, won, name):
+    """
+    Sort key for a table row, best first.
+
+    Ties on points are broken by goal difference, goals scored, wins and
+    finally name. Competition-specific rules such as head-to-head records
+    are left to the official table, which periodically replaces the
+    derived one.
+    """
+    return (-(points or 0), -(goal_difference or 0), -(goals_for or 0), -(won or 0), name or '')
+
+
+# Columns the standings table can be sorted by, in the page's data-sort names:
+# column -> (row field, whether the first click sorts highest first)
+SORT_COLUMNS = {
+    'rank': ('position', False),
+    'team': ('team', False),
+    'played': ('playedGames', True),
+    'won': ('won', True),
+    'draw': ('draw', True),
+    'lost': ('lost', False),
+    'gf': ('goalsFor', True),
+    'ga': ('goalsAgainst', False),
+    'gd': ('goalDifference', True),
+    'points': ('points', True),
+}
+
+
+def sort_orders(table):
+    """
+    Precompute every column's sort order for a standings table.
+
+    The page reorders rows by these indexes instead of parsing cell text.
+    Ties keep table position order.
+
+    Args:
+        table: Standings rows (API-shaped dicts), in position order
+
+    Returns:
+        dict: column -> list of row indexes in that column's first-click order
+    """
+    orders = {}
+    for column, (field, descending) in SORT_COLUMNS.items():
+        if field == 'team':
+            def key(i):
+                return ((table[i].get('team') or {}).get('name') or '').casefold()
+        else:
+            def key(i, field=field, sign=-1 if descending else 1):
+                return sign * (table[i].get(field) or 0)
+        # sorted() is stable, so equal values stay in position order
+        orders[column] = sorted(range(len(table)), key=key)
+    return orders
@@ -22,27 +22,133 @@ window.openTab = function (tabId) {
     });
 };
 
-document.addEventListener('DOMContentLoaded', () => {
-
-    // 2. Initialize List.js for each competition
-    const competitions = ['PL', 'PD', 'BL1', 'SA', 'FL1', 'CL'];
-    competitions.forEach(code => {
-        const containerId = `standings-${code}`;
-        if (document.getElementById(containerId)) {
-            new List(containerId, {
-                valueNames: ['rank', 'team', 'played', 'won', 'draw', 'lost', 'gf', 'ga', 'gd', 'points']
+// Patch one match's score and status in place (desktop row and mobile card)
+function applyMatchUpdate(update) {
+    document.querySelectorAll(`[data-match-id="${update.id}"]`).forEach(el => {
+        el.querySelectorAll('.match-score').forEach(scoreEl => {
+            scoreEl.textContent = update.score_text;
+        });
+        el.querySelectorAll('.match-status').forEach(statusEl => {
+            statusEl.textContent = update.status;
+        });
+        el.querySelectorAll('.js-status').forEach(statusEl => {
+            statusEl.classList.forEach(cls => {
+                if (cls.startsWith('status-')) statusEl.classList.remove(cls);
             });
-        }
+            statusEl.classList.add(`status-${update.status.toLowerCase()}`);
+        });
+    });
+}
+
+// Subscribe to server-pushed score updates instead of reloading the page
+function subscribeToUpdates() {
+    if (!window.EventSource) return;
+    const source = new EventSource('/events');
+    source.addEventListener('scores', event => {
+        const payload = JSON.parse(event.data);
+        payload.matches.forEach(applyMatchUpdate);
+    });
+    // A refused stream (server at its stream limit) is not retried by the
+    // browser, so try again later
+    source.addEventListener('error', () => {
+        if (source.readyState === EventSource.CLOSED) setTimeout(subscribeToUpdates, 60000);
+    });
+}
+
+// Reorder a standings table by a column's precomputed row order (data-order),
+// reversing it on a second click. Rows are moved, never re-parsed.
+function sortStandings(th) {
+    const table = th.closest('table');
+    const tbody = table.tBodies[0];
+    // Rows in their original (position) order, captured on the first sort
+    if (!tbody.originalRows) tbody.originalRows = Array.from(tbody.rows);
+
+    const reverse = th.classList.contains('asc');
+    table.querySelectorAll('th.sort').forEach(el => el.classList.remove('asc', 'desc'));
+    th.classList.add(reverse ? 'desc' : 'asc');
+
+    const order = th.dataset.order.split(' ');
+    if (reverse) order.reverse();
+    const rows = document.createDocumentFragment();
+    order.forEach(i => rows.appendChild(tbody.originalRows[i]));
+    tbody.appendChild(rows);
+}
+
+// Show only the standings rows whose team name contains the filter text
+function filterStandings(input) {
+    const query = input.value.trim().toLowerCase();
+    document.querySelectorAll(`#${input.dataset.filter} tbody tr`).forEach(row => {
+        row.hidden = !row.dataset.name.includes(query);
     });
+}
 
-    // 3. Render AI Summary Markdown
-    const summaryTextEl = document.querySelector('.summary-text');
-    if (summaryTextEl) {
-        // Get raw markdown content
-        const rawMarkdown = summaryTextEl.textContent.trim();
-        // Parse and render HTML
-        if (rawMarkdown) {
-            summaryTextEl.innerHTML = marked.parse(rawMarkdown);
+// Ask the server for an AI summary; generation runs in the background, so
+// poll until a summary for different results is stored (the button stays
+// disabled meanwhile). Summaries are told apart by their digest, the hash of
+// the results they cover.
+const SUMMARY_POLL_MS = 2000;
+const SUMMARY_MAX_POLLS = 60;
+
+// Show the server's current summary if it is not the one on the page
+function showSummary(state) {
+    const card = document.getElementById('summary');
+    if (!state.digest || state.digest === card.dataset.digest) return false;
+    card.dataset.digest = state.digest;
+    card.querySelector('.summary-text').innerHTML = state.html || '';
+    return true;
+}
+
+async function requestSummary(button) {
+    const label = button.textContent;
+    button.disabled = true;
+    button.textContent = 'Generating...';
+    try {
+        const response = await fetch('/summary', { method: 'POST' });
+        const result = await response.json();
+        if (response.status === 202) {
+            for (let i = 0; i < SUMMARY_MAX_POLLS; i++) {
+                await new Promise(resolve => setTimeout(resolve, SUMMARY_POLL_MS));
+                const state = await (await fetch('/summary')).json();
+                if (showSummary(state)) break;
+                // Another worker may be generating (result 'busy'): keep waiting for its summary
+                if (!state.generating && result.status === 'started') {
+                    if (state.error) throw new Error(state.error);
+                    break;
+                }
+            }
+        } else if (response.ok) {
+            // Already up to date, possibly with a summary newer than this page
+            showSummary(await (await fetch('/summary')).json());
+        } else {
+            throw new Error(result.error);
         }
+        button.textContent = 'Up to date';
+    } catch (error) {
+        console.error('Summary generation failed:', error);
+        button.textContent = label;
+        button.disabled = false;
     }
+}
+
+// One delegated listener each, so nothing is set up per table at load
+document.addEventListener('click', event => {
+    const th = event.target.closest('th.sort[data-order]');
+    if (th) sortStandings(th);
+    const summaryButton = event.target.closest('.js-summary-btn');
+    if (summaryButton && !summaryButton.disabled) requestSummary(summaryButton);
+});
+document.addEventListener('input', event => {
+    if (event.target.dataset.filter) filterStandings(event.target);
+});
+
+document.addEventListener('DOMContentLoaded', () => {
+
+    // 2. Standings sorting and filtering and the summary button use the delegated
+    //    listeners above; the AI summary arrives as server-rendered HTML
+
+    // 3. Live score updates
+    subscribeToUpdates();
+
+    // Page scripts have finished setting up (read by benchmarks.page_tti)
+    performance.mark('app-interactive');
 });
@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+import os
+
+# config.py refuses to import without an API key; tests never call the real API
+os.environ.setdefault('FOOTBALL_API_KEY', 'test')
@@ -0,0 +1,91 @@
+"""Tests for when SummaryService calls the model."""
+
+import threading
+
+import pytest
+
+from ai_summary import FakeSummaryClient, SummaryService, build_digest, digest_hash
+from db_manager import DatabaseManager
+from models import Match, Team
+
+
+def _match(match_id, status, home_score=None, away_score=None):
+    return Match(
+        match_id, status,
+        Team.get(1, 'Arsenal FC', ''), Team.get(2, 'Chelsea FC', ''),
+        home_score, away_score, '2025-01-04T15:00:00Z', 'PL', 'Premier League'
+    )
+
+
+FINISHED = {'matches': {'PL': [_match(1, 'FINISHED', 2, 1)]}}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # DatabaseManager opens its file in the working directory
+    monkeypatch.chdir(tmp_path)
+    return DatabaseManager()
+
+
+def _service(db, client, snapshot=FINISHED):
+    return SummaryService(db, client, lambda: snapshot)
+
+
+def _wait(*services):
+    for service in services:
+        if service._thread:
+            service._thread.join(timeout=5)
+
+
+def test_unchanged_digest_makes_no_call(db):
+    client = FakeSummaryClient()
+    db.save_summary("**Earlier**", digest_hash(build_digest(FINISHED['matches'])))
+
+    assert _service(db, client).request() == 'unchanged'
+    assert client.calls == []
+
+
+def test_digest_stored_while_waiting_for_the_lease_makes_no_call(db, monkeypatch):
+    client = FakeSummaryClient()
+    db.save_summary("**Earlier**", digest_hash(build_digest(FINISHED['matches'])))
+    # The first read predates another process storing the summary
+    stale_reads = [None]
+    get_summary_digest = db.get_summary_digest
+    monkeypatch.setattr(
+        db, 'get_summary_digest', lambda: stale_reads.pop() if stale_reads else get_summary_digest()
+    )
+
+    assert _service(db, client).request() == 'unchanged'
+    assert client.calls == []
+    # The lease was handed back
+    assert db.acquire_lease(SummaryService.LEASE_NAME, 'other', 60, 0)
+
+
+def test_concurrent_requests_make_one_call(db):
+    client = FakeSummaryClient(delay=0.3)
+    # Two services stand in for two processes sharing the database
+    services = [_service(db, client), _service(db, client)]
+    results = []
+
+    def ask(service):
+        results.append(service.request())
+
+    threads = [threading.Thread(target=ask, args=(services[i % 2],)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    _wait(*services)
+
+    assert sorted(results) == ['busy'] * 5 + ['started']
+    assert len(client.calls) == 1
+    assert services[0].request() == 'unchanged'
+    assert len(client.calls) == 1
+
+
+def test_no_finished_results_makes_no_call(db):
+    client = FakeSummaryClient()
+    service = _service(db, client, {'matches': {'PL': [_match(1, 'SCHEDULED')]}})
+
+    assert service.request() == 'empty'
+    assert client.calls == []
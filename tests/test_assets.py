@@ -0,0 +1,25 @@
+"""Tests for asset bundling and minification."""
+
+from assets import build_assets, minify_css
+
+
+def test_minify_css_keeps_descendant_pseudo_class_space():
+    css = "a :hover { color: red; }\n.nav > li , p:first-child { margin : 0 auto ; }"
+    assert minify_css(css) == "a :hover{color:red}.nav>li,p:first-child{margin :0 auto}"
+
+
+def test_build_removes_stale_bundles(tmp_path):
+    static = tmp_path / 'static'
+    static.mkdir()
+    (static / 'styles.css').write_text("body { margin: 0; }")
+    (static / 'script.js').write_text("console.log('one');")
+    dist = static / 'dist'
+    dist.mkdir()
+    (dist / 'app.000000000000.css').write_text("old")
+    (dist / 'app.000000000000.css.gz').write_bytes(b"old")
+    (dist / 'README.txt').write_text("not a build")
+
+    assets = build_assets(str(static))
+    expected = {a.filename for a in assets.values()}
+    expected |= {f"{name}.gz" for name in expected} | {'README.txt'}
+    assert {p.name for p in dist.iterdir()} - {f"{a.filename}.br" for a in assets.values()} == expected
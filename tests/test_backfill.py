@@ -0,0 +1,72 @@
+"""Tests for the season backfill."""
+
+from datetime import date, datetime
+
+from backfill import SeasonBackfill, season_windows
+from benchmarks.synthetic import synthetic_raw_matches
+from db_manager import DatabaseManager
+
+
+def test_season_windows_cover_the_season_once():
+    windows = list(season_windows(2023, chunk_days=30))
+    assert windows[0] == (date(2023, 7, 1), date(2023, 7, 30))
+    assert windows[-1][1] == date(2024, 6, 30)
+    for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+        assert (start - previous_end).days == 1
+
+
+def test_season_windows_resume_and_stop_at_today():
+    windows = list(season_windows(2023, chunk_days=10, after=date(2023, 7, 20), today=date(2023, 8, 5)))
+    assert windows == [
+        (date(2023, 7, 21), date(2023, 7, 30)),
+        (date(2023, 7, 31), date(2023, 8, 5)),
+    ]
+    assert list(season_windows(2023, after=date(2024, 6, 30))) == []
+
+
+class FlakyClient:
+    """Serves synthetic matches by date window, failing once at a chosen window."""
+
+    def __init__(self, matches, fail_from=None):
+        self.matches = matches
+        self.fail_from = fail_from
+        self.windows = []
+
+    def fetch_competition_matches(self, competition_code, params=None):
+        self.windows.append(params['dateFrom'])
+        if params['dateFrom'] == self.fail_from:
+            self.fail_from = None
+            return None
+        return {
+            'competition': {'code': competition_code, 'name': 'Premier League'},
+            'matches': [
+                m for m in self.matches
+                if params['dateFrom'] <= m['utcDate'][:10] <= params['dateTo']
+            ]
+        }
+
+
+def stored_matches(db):
+    with db.get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+
+def test_failed_window_resumes_from_the_checkpoint(tmp_path):
+    # Eight matches a day from July 1 to 25
+    matches = synthetic_raw_matches('PL', 200, start=datetime(2024, 7, 1))
+    client = FlakyClient(matches, fail_from='2024-07-16')
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+    backfill = SeasonBackfill(client, db, chunk_days=5, batch_windows=2)
+    today = date(2024, 7, 31)
+
+    assert backfill.run('PL', 2024, today=today) is None
+    # Windows fetched before the failure are committed, even mid-batch
+    assert db.get_backfill_checkpoint('PL', 2024) == '2024-07-15'
+    assert stored_matches(db) == 15 * 8
+
+    client.windows.clear()
+    assert backfill.run('PL', 2024, today=today) == 10 * 8
+    assert client.windows == ['2024-07-16', '2024-07-21', '2024-07-26', '2024-07-31']
+    assert db.get_backfill_checkpoint('PL', 2024) == '2024-07-31'
+    assert stored_matches(db) == 200
+    db.close()
@@ -0,0 +1,42 @@
+"""Tests that the app serves health checks before any data has loaded."""
+
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.cold_start import APP_PATH, first_byte, free_port
+
+# Generous for a slow CI machine; the app answers in about a second
+STARTUP_SECONDS = 15
+
+
+def test_health_answers_while_api_is_unreachable(tmp_path):
+    port = free_port()
+    env = dict(
+        os.environ,
+        FOOTBALL_API_KEY='test',
+        FOOTBALL_API_BASE_URL=f"http://127.0.0.1:{free_port()}/v4",
+        ANTHROPIC_API_KEY='',
+        PORT=str(port),
+        LOG_LEVEL='WARNING'
+    )
+    base = f"http://127.0.0.1:{port}"
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, APP_PATH],
+        cwd=tmp_path,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = started + STARTUP_SECONDS
+        assert first_byte(f"{base}/health", started, deadline, 200) is not None
+        # No data can ever load, so the app never reports ready
+        assert first_byte(f"{base}/ready", started, deadline, 503) is not None
+        assert first_byte(f"{base}/ready", started, time.perf_counter() + 2, 200) is None
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
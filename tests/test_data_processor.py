@@ -0,0 +1,39 @@
+"""Tests for match normalization."""
+
+from operator import attrgetter
+
+from benchmarks.synthetic import synthetic_raw_matches
+from data_processor import normalize_match, normalize_matches
+
+
+def test_batch_matches_per_item_normalization():
+    raw = synthetic_raw_matches('PL', 40)
+    # Shapes seen before a knockout draw, before kickoff and after a bad write
+    raw[0].update(homeTeam=None, awayTeam=None)
+    raw[1].update(score=None, status='TIMED')
+    raw[2]['score'] = {'fullTime': {'home': None, 'away': None}}
+    raw[3]['utcDate'] = None
+    del raw[4]['status']
+    response = {'competition': {'code': 'PL', 'name': 'Premier League'}, 'matches': raw}
+
+    batch = normalize_matches(response, 'PL', 'Premier League')
+    single = sorted(
+        (normalize_match(m, 'PL', 'Premier League') for m in raw),
+        key=attrgetter('utc_kickoff'), reverse=True
+    )
+    assert batch == single
+    assert [m.utc_kickoff for m in batch].count('') == 1
+
+
+def test_competition_taken_from_response_or_match():
+    raw = synthetic_raw_matches('PL', 2)
+    from_response = normalize_matches({'competition': {'code': 'PL', 'name': 'Premier League'}, 'matches': raw})
+    assert {(m.competition_code, m.competition_name) for m in from_response} == {('PL', 'Premier League')}
+
+    for match in raw:
+        match['competition'] = {'code': 'CL', 'name': 'Champions League'}
+    from_matches = normalize_matches({'matches': raw})
+    assert {(m.competition_code, m.competition_name) for m in from_matches} == {('CL', 'Champions League')}
+    assert from_matches == sorted(
+        (normalize_match(m) for m in raw), key=attrgetter('utc_kickoff'), reverse=True
+    )
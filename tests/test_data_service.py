@@ -0,0 +1,58 @@
+"""Tests for MatchDataService snapshots."""
+
+from data_service import MatchDataService
+from db_manager import DatabaseManager
+
+
+def test_snapshot_reads_one_transaction(tmp_path, monkeypatch):
+    # The service opens its database in the working directory
+    monkeypatch.chdir(tmp_path)
+    service = MatchDataService(api_key='test', base_url='http://127.0.0.1:9/v4')
+    writer = DatabaseManager()
+
+    # A refresh commits between the snapshot's first and last reads
+    get_crests = service.db.get_crests
+
+    def commit_then_get_crests():
+        writer.save_summary("**New summary**")
+        return get_crests()
+
+    monkeypatch.setattr(service.db, 'get_crests', commit_then_get_crests)
+    snapshot = service.get_snapshot()
+    assert snapshot['version'] == 0
+    assert snapshot['summary_html'] is None
+
+    # The commit bumped the data version, so the next snapshot is reloaded
+    monkeypatch.setattr(service.db, 'get_crests', get_crests)
+    snapshot = service.get_snapshot()
+    assert snapshot['version'] == 1
+    assert 'New summary' in snapshot['summary_html']
+
+
+def _scorer(player_id, name, goals):
+    return {
+        'player': {'id': player_id, 'name': name},
+        'team': {'id': 1, 'name': 'Arsenal FC'},
+        'goals': goals,
+    }
+
+
+def test_failed_dataset_is_rolled_back_alone(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    service = MatchDataService(api_key='test', base_url='http://127.0.0.1:9/v4')
+    assert service._store_responses([('scorers', 'PL', {'scorers': [_scorer(1, 'Saka', 9)]})]) == (1, 1)
+    version, stored_hash = service.data_version, service._payload_hashes[('scorers', 'PL')]
+
+    # The scorers writer deletes the old rows, then fails on a row it cannot bind
+    broken = {'scorers': [_scorer(2, 'Havertz', {'total': 7})]}
+    standings = {'standings': [{'type': 'TOTAL', 'table': [
+        {'position': 1, 'team': {'id': 1, 'name': 'Arsenal FC'}, 'points': 30}
+    ]}]}
+    stored, changed = service._store_responses([('scorers', 'PL', broken), ('standings', 'PL', standings)])
+
+    assert (stored, changed) == (1, 1)
+    assert [s['player']['name'] for s in service.db.get_scorers('PL')] == ['Saka']
+    assert service.db.get_standings('PL')
+    assert service.data_version == version + 1
+    # The failed payload is not remembered, so the next fetch retries it
+    assert service._payload_hashes[('scorers', 'PL')] == stored_hash
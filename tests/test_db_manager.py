@@ -0,0 +1,161 @@
+"""Tests for DatabaseManager schema setup and migrations."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_manager import DatabaseManager
+
+LEGACY_MATCH = {
+    'status': 'FINISHED',
+    'score': {'full_time': {'home': 2, 'away': 1}},
+    'home_team': {'name': 'Arsenal FC', 'crest': ''},
+    'away_team': {'name': 'Chelsea FC', 'crest': ''},
+    'utc_kickoff': '2025-11-01T15:00:00Z',
+    'competition_code': 'PL',
+    'competition_name': 'Premier League',
+}
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """A database in the original one-blob-per-competition schema."""
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    for table in DatabaseManager.LEGACY_TABLES:
+        conn.execute(
+            f"CREATE TABLE {table} (competition_code TEXT PRIMARY KEY, data_json TEXT, updated_at TIMESTAMP)"
+        )
+    conn.execute("INSERT INTO matches VALUES ('PL', ?, NULL)", (json.dumps([LEGACY_MATCH]),))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def table_names(path):
+    conn = sqlite3.connect(path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    return names
+
+
+def test_legacy_migration(legacy_db):
+    db = DatabaseManager(db_path=legacy_db)
+    assert [m.home_team.name for m in db.get_all_matches()['PL']] == ['Arsenal FC']
+    assert not {name for name in table_names(legacy_db) if name.startswith('legacy_')}
+    db.close()
+
+
+def test_failed_migration_leaves_database_untouched(legacy_db):
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("INSERT INTO matches VALUES ('PD', '[{not json', NULL)")
+    conn.commit()
+    conn.close()
+
+    DatabaseManager(db_path=legacy_db).close()
+    names = table_names(legacy_db)
+    assert 'legacy_matches' not in names
+    assert 'teams' not in names
+
+    # Fixed data is migrated on the next start
+    conn = sqlite3.connect(legacy_db)
+    conn.execute("DELETE FROM matches WHERE competition_code = 'PD'")
+    conn.commit()
+    conn.close()
+    db = DatabaseManager(db_path=legacy_db)
+    assert len(db.get_all_matches()['PL']) == 1
+    db.close()
+
+
+def test_interrupted_migration_is_resumed(legacy_db):
+    # Renamed but never migrated, as by a migration that was not transactional
+    conn = sqlite3.connect(legacy_db)
+    for table in DatabaseManager.LEGACY_TABLES:
+        conn.execute(f"ALTER TABLE {table} RENAME TO legacy_{table}")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(db_path=legacy_db)
+    assert len(db.get_all_matches()['PL']) == 1
+    assert not {name for name in table_names(legacy_db) if name.startswith('legacy_')}
+    db.close()
+
+
+def played_games(db, code):
+    return sum(row['playedGames'] for row in db.get_all_standings()[code])
+
+
+@pytest.fixture
+def settled_stub():
+    """A one-competition stub API whose last finished match ended well before now."""
+    from benchmarks.stub_api import KICKOFF_SPACING, StubFootballAPI
+
+    stub = StubFootballAPI(matches_per_competition=60, competitions=['PL'])
+    # Synthetic seasons end with a match kicking off right now; move every
+    # kickoff back one slot so that match is long over and the next starts now
+    for match in stub.seasons['PL']:
+        kickoff = datetime.strptime(match['utcDate'], '%Y-%m-%dT%H:%M:%SZ') - KICKOFF_SPACING
+        match['utcDate'] = f"{kickoff:%Y-%m-%dT%H:%M:%SZ}"
+    return stub
+
+
+def save_table(db, stub):
+    standings = stub.route('/v4/competitions/PL/standings', {})
+    with db.refresh_session() as session:
+        session.save_standings(
+            'PL', standings['standings'][0]['table'],
+            season=(standings['season']['startDate'], standings['season']['endDate'])
+        )
+
+
+def save_season(db, stub):
+    from data_processor import normalize_matches
+
+    with db.refresh_session() as session:
+        session.save_matches('PL', normalize_matches(stub.route('/v4/competitions/PL/matches', {})))
+        session.update_standings('PL')
+
+
+def test_results_stored_after_the_table_are_not_counted_twice(tmp_path, settled_stub):
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+    save_table(db, settled_stub)
+    official = played_games(db, 'PL')
+    assert official > 0
+
+    # The whole season is stored after the table, twice (as by a backfill and a rerun)
+    for _ in range(2):
+        save_season(db, settled_stub)
+        assert played_games(db, 'PL') == official
+    db.close()
+
+
+def test_match_in_play_when_the_table_was_fetched_is_applied(tmp_path, settled_stub):
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+    upcoming = next(m for m in settled_stub.seasons['PL'] if m['status'] != 'FINISHED')
+    kickoff = datetime.utcnow() - timedelta(minutes=30)
+    upcoming.update(utcDate=f"{kickoff:%Y-%m-%dT%H:%M:%SZ}", status='IN_PLAY')
+    save_table(db, settled_stub)
+    official = played_games(db, 'PL')
+
+    # It finishes after the fetch, so the table does not count it yet
+    upcoming.update(status='FINISHED', score={'fullTime': {'home': 1, 'away': 0}})
+    save_season(db, settled_stub)
+    assert played_games(db, 'PL') == official + 2
+    db.close()
+
+
+def test_summary_html_read_does_not_write(tmp_path):
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+    db.save_summary("**City's** big night")
+    assert '<strong>City&#x27;s</strong>' in db.get_summary_html()
+
+    # HTML from an older renderer is rendered again in memory, not written back
+    db._save_metadata('ai_summary_html_version', 'old')
+    db._save_metadata('ai_summary_html', 'stale')
+    version = db.get_data_version()
+    assert '<strong>' in db.get_summary_html()
+    assert db._get_metadata('ai_summary_html') == 'stale'
+    assert db.get_data_version() == version
+    db.close()
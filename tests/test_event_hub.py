@@ -0,0 +1,17 @@
+"""Tests for the Server-Sent Events hub."""
+
+from event_hub import EventHub
+
+
+def test_subscribers_are_capped_and_slots_freed_on_disconnect():
+    hub = EventHub(max_subscribers=2)
+    first, second = hub.subscribe(), hub.subscribe()
+    assert first is not None and second is not None
+    assert hub.subscribe() is None
+
+    # Closing a stream frees its slot
+    stream = hub.stream(first)
+    next(stream)
+    stream.close()
+    assert hub.subscriber_count == 1
+    assert hub.subscribe() is not None
@@ -0,0 +1,37 @@
+"""Tests for the Football-Data.org client against the local stub API."""
+
+import pytest
+
+from benchmarks.stub_api import StubFootballAPI
+from football_api import FootballAPIClient
+
+
+@pytest.fixture
+def stub():
+    stub = StubFootballAPI(matches_per_competition=40).start()
+    yield stub
+    stub.stop()
+
+
+def test_pooled_session_reuses_connections(stub):
+    client = FootballAPIClient('test', base_url=stub.base_url)
+    for code in stub.seasons:
+        assert client.fetch_standings(code) is not None
+        assert client.fetch_top_scorers(code) is not None
+    client.close()
+
+    assert stub.requests == 2 * len(stub.seasons)
+    assert stub.connections < stub.requests
+    assert stub.connections == 1
+
+
+def test_conditional_cache_keeps_latest_query_per_endpoint(stub):
+    client = FootballAPIClient('test', base_url=stub.base_url)
+    for limit in (5, 10, 15):
+        client.fetch_top_scorers('PL', limit=limit)
+    assert len(client._conditional) == 1
+
+    client.reset_stats()
+    client.fetch_top_scorers('PL', limit=15)
+    assert client.reset_stats()['not_modified'] == 1
+    client.close()
@@ -0,0 +1,60 @@
+"""Tests for refresher leader election."""
+
+import pytest
+
+from db_manager import DatabaseManager
+from leader_lease import LeaderLease
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def leases(tmp_path):
+    """Two candidates, standing in for two processes sharing one database."""
+    clock = FakeClock()
+    db = DatabaseManager(db_path=str(tmp_path / 'test.db'))
+    yield clock, LeaderLease(db, ttl_seconds=90, clock=clock), LeaderLease(db, ttl_seconds=90, clock=clock)
+    db.close()
+
+
+def test_only_one_holder_at_a_time(leases):
+    _, first, second = leases
+    assert first.renew()
+    assert not second.renew()
+    assert first.is_leader and not second.is_leader
+
+
+def test_holder_keeps_the_lease_by_renewing(leases):
+    clock, first, second = leases
+    first.renew()
+    # Heartbeats well within the TTL carry the lease far past it
+    for _ in range(10):
+        clock.now += first.heartbeat_seconds
+        assert first.renew()
+        assert not second.renew()
+
+
+def test_expired_lease_is_taken_over(leases):
+    clock, first, second = leases
+    first.renew()
+    clock.now += 89
+    assert not second.renew()
+
+    # The holder stopped renewing, so the lease lapses
+    clock.now += 2
+    assert second.renew()
+    assert not first.renew()
+    assert not first.is_leader
+
+
+def test_release_hands_over_immediately(leases):
+    _, first, second = leases
+    first.renew()
+    first.release()
+    assert second.renew()
@@ -0,0 +1,42 @@
+"""Tests for the AI summary Markdown renderer."""
+
+from markdown_render import render_inline, render_markdown
+
+ANCHOR = '<a href="{}" rel="nofollow noopener" target="_blank">{}</a>'
+
+
+def test_html_is_escaped():
+    assert render_markdown('<script>alert(1)</script>') == '<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>'
+
+
+def test_only_http_links_are_rendered():
+    assert render_inline('[x](javascript:alert(1))') == '[x](javascript:alert(1))'
+    assert render_inline('[x](https://example.com)') == ANCHOR.format('https://example.com', 'x')
+
+
+def test_quotes_cannot_break_out_of_href():
+    rendered = render_inline('[x](https://example.com/"onmouseover="alert(1))')
+    assert rendered.startswith('<a href="https://example.com/&quot;onmouseover=&quot;alert(1"')
+
+
+def test_emphasis_next_to_links():
+    assert render_inline('[a](https://example.com) and _more_') == (
+        ANCHOR.format('https://example.com', 'a') + ' and <em>more</em>'
+    )
+    assert render_inline('**[b](https://example.com/a_b)** _x_') == (
+        '<strong>' + ANCHOR.format('https://example.com/a_b', 'b') + '</strong> <em>x</em>'
+    )
+
+
+def test_code_spans_are_not_formatted():
+    assert render_inline('`_a_` **b**') == '<code>_a_</code> <strong>b</strong>'
+
+
+def test_lists_and_rules():
+    source = "- one\n- **two**\n\n1. first\n2. second\n\n---\n\n## Next"
+    assert render_markdown(source) == (
+        '<ul><li>one</li><li><strong>two</strong></li></ul>\n'
+        '<ol><li>first</li><li>second</li></ol>\n'
+        '<hr>\n'
+        '<h2>Next</h2>'
+    )
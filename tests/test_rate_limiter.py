@@ -0,0 +1,79 @@
+"""Tests for the API quota token bucket."""
+
+import pytest
+
+from rate_limiter import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock and sleep that only move when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_then_paced_at_the_refill_rate(clock):
+    bucket = TokenBucket(per_minute=10, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(10)] == [0.0] * 10
+
+    # Past the burst, one token arrives every 6 seconds
+    assert bucket.acquire() == pytest.approx(6.0)
+    assert bucket.acquire() == pytest.approx(6.0)
+    assert clock.now == pytest.approx(12.0)
+
+
+def test_idle_time_refills_up_to_capacity(clock):
+    bucket = TokenBucket(per_minute=10, clock=clock, sleep=clock.sleep)
+    for _ in range(10):
+        bucket.acquire()
+    clock.now += 600
+    assert [bucket.acquire() for _ in range(10)] == [0.0] * 10
+    assert bucket.acquire() > 0
+
+
+def test_exhausted_quota_header_blocks_until_reset(clock):
+    bucket = TokenBucket(per_minute=10, clock=clock, sleep=clock.sleep)
+    bucket.update_from_headers({
+        TokenBucket.AVAILABLE_HEADER: '0', TokenBucket.RESET_HEADER: '42'
+    })
+
+    assert bucket.acquire() == pytest.approx(42.0)
+    # The reset brings back the full minute's budget
+    assert [bucket.acquire() for _ in range(9)] == [0.0] * 9
+
+
+def test_reserve_is_left_for_other_processes(clock):
+    bucket = TokenBucket(per_minute=10, reserve=4, clock=clock, sleep=clock.sleep)
+    bucket.update_from_headers({
+        TokenBucket.AVAILABLE_HEADER: '4', TokenBucket.RESET_HEADER: '20'
+    })
+    assert bucket.acquire() == pytest.approx(20.0)
+
+
+def test_header_lowers_tokens_without_blocking(clock):
+    bucket = TokenBucket(per_minute=10, clock=clock, sleep=clock.sleep)
+    bucket.update_from_headers({
+        TokenBucket.AVAILABLE_HEADER: '2', TokenBucket.RESET_HEADER: '30'
+    })
+    assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(6.0)
+
+
+def test_missing_or_garbled_headers_are_ignored(clock):
+    bucket = TokenBucket(per_minute=10, clock=clock, sleep=clock.sleep)
+    bucket.update_from_headers({})
+    bucket.update_from_headers({TokenBucket.AVAILABLE_HEADER: 'lots'})
+    assert bucket.tokens == 10
@@ -0,0 +1,63 @@
+"""Tests for fixture-driven refresh planning."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from refresh_plan import (
+    FULL_TIME, HOT_INTERVAL, IDLE_INTERVAL, MATCHDAY_INTERVAL,
+    matches_interval, plan_refreshes, result_driven_due
+)
+
+NOW = datetime(2025, 1, 4, 12, 0)
+MAX_AGE = timedelta(hours=24)
+
+
+@pytest.mark.parametrize('fixtures, interval', [
+    ({'live': 1}, HOT_INTERVAL),
+    ({'next_kickoff': NOW + timedelta(minutes=20)}, HOT_INTERVAL),
+    ({'last_kickoff': NOW - timedelta(hours=2)}, HOT_INTERVAL),
+    ({'next_kickoff': NOW + timedelta(hours=5)}, MATCHDAY_INTERVAL),
+    ({'last_kickoff': NOW - timedelta(hours=8)}, MATCHDAY_INTERVAL),
+    ({'next_kickoff': NOW + timedelta(days=3), 'last_kickoff': NOW - timedelta(days=2)}, IDLE_INTERVAL),
+    ({}, IDLE_INTERVAL),
+])
+def test_matches_interval_follows_the_fixtures(fixtures, interval):
+    assert matches_interval(fixtures, NOW) == interval
+
+
+def test_result_driven_due_after_full_time():
+    kickoff = NOW - timedelta(hours=1)
+    fetched_at = NOW - timedelta(hours=3)
+    assert result_driven_due({'last_finished_kickoff': kickoff}, fetched_at, MAX_AGE) == kickoff + FULL_TIME
+
+
+def test_result_driven_waits_while_a_match_is_live():
+    fetched_at = NOW - timedelta(hours=3)
+    fixtures = {'live': 1, 'last_finished_kickoff': NOW - timedelta(hours=1)}
+    assert result_driven_due(fixtures, fetched_at, MAX_AGE) == fetched_at + MAX_AGE
+
+
+def test_result_driven_not_due_again_once_fetched_after_full_time():
+    kickoff = NOW - timedelta(hours=4)
+    fetched_at = kickoff + FULL_TIME + timedelta(minutes=5)
+    assert result_driven_due({'last_finished_kickoff': kickoff}, fetched_at, MAX_AGE) == fetched_at + MAX_AGE
+
+
+def test_plan_orders_pairs_by_due_time():
+    calendar = {
+        'PL': {'live': 1},
+        'SA': {'next_kickoff': NOW + timedelta(days=3)},
+    }
+    fetched = {
+        ('matches', 'PL'): NOW - timedelta(minutes=5),
+        ('matches', 'SA'): NOW - timedelta(hours=1),
+        ('standings', 'PL'): NOW - timedelta(hours=1),
+    }
+    plan = plan_refreshes(['PL', 'SA'], ['matches', 'standings'], calendar, fetched, NOW, MAX_AGE)
+    assert plan == [
+        (datetime.min, 'standings', 'SA'),
+        (NOW + timedelta(minutes=5), 'matches', 'PL'),
+        (NOW + timedelta(hours=5), 'matches', 'SA'),
+        (NOW + timedelta(hours=23), 'standings', 'PL'),
+    ]